@@ -2,8 +2,46 @@
 various classes and utility funtions."""
 
 from .logger import logger
-from .repos import get_strava_repo, get_users_repo, get_challenges_repo
+from .repos import (
+    get_strava_repo,
+    get_users_repo,
+    get_challenges_repo,
+    get_webhook_events_repo,
+    get_checkpoints_repo,
+    get_onchain_challenges_repo,
+)
 from .event_loop import get_event_loop
 from .http_client import get_client_session
-from .clients import get_strava_client, get_ethereum_client
-from .services import get_challenge_validation_service, get_challenge_manager_service
+from .metrics import get_metrics
+from .concurrency import (
+    get_concurrency_limits,
+    get_token_refreshes,
+    get_signature_executor,
+)
+from .caches import (
+    get_received_webhook_events_cache,
+    get_activity_cache,
+    get_onchain_challenge_cache,
+)
+from .clients import (
+    get_strava_client,
+    get_ethereum_client,
+    get_strava_rate_limiter,
+    get_strava_circuit_breaker,
+)
+from .services import (
+    get_challenge_validation_service,
+    get_challenge_manager_service,
+    get_webhook_manager_service,
+    get_token_manager_service,
+    get_backfill_manager_service,
+    get_challenge_indexer_service,
+)
+from .workers import (
+    get_webhook_worker_pool,
+    get_token_refresher,
+    get_challenge_indexer_worker,
+    get_open_challenges_listener,
+    create_backfill_manager_service,
+    create_challenge_manager_service,
+)
@@ -0,0 +1,34 @@
+from app.dependencies.metrics import metrics
+from app.infrastructure.db.statements import STATEMENTS
+from app.libraries.cache import LRUCache
+from app.settings import settings
+
+received_webhook_events = LRUCache(maxsize=settings.webhook_dedupe_cache_size)
+activities = LRUCache(
+    maxsize=settings.activity_cache_size, ttl=settings.activity_cache_ttl
+)
+onchain_challenges = LRUCache(maxsize=settings.onchain_challenge_cache_size)
+
+metrics.register_cache("received_webhook_events", received_webhook_events)
+metrics.register_cache("activities", activities)
+metrics.register_cache("statements", STATEMENTS.cache)
+
+
+async def get_received_webhook_events_cache() -> LRUCache:
+    """Returns the process-wide cache of recently received webhook event identities."""
+
+    return received_webhook_events
+
+
+async def get_activity_cache() -> LRUCache:
+    """Returns the process-wide cache of Strava activity summaries, keyed by
+    (athlete_id, activity_id)."""
+
+    return activities
+
+
+async def get_onchain_challenge_cache() -> LRUCache:
+    """Returns the process-wide cache of on-chain challenges, keyed by
+    challenge_id."""
+
+    return onchain_challenges
@@ -1,30 +1,92 @@
 import base64
 import json
+from typing import Optional
 
 import aiohttp
 from fastapi import Depends
 
-from app.dependencies import get_client_session
+from app.dependencies import get_client_session, get_onchain_challenge_cache
+from app.dependencies.metrics import metrics
 from app.infrastructure.clients.ethereum import EthereumClient
+from app.infrastructure.clients.rate_limiter import StravaRateLimiter
 from app.infrastructure.clients.strava import StravaClient
+from app.libraries.cache import LRUCache
+from app.libraries.circuit_breaker import CircuitBreaker
 from app.settings import settings
 from app.usecases.interfaces.clients.ethereum import IEthereumClient
 from app.usecases.interfaces.clients.strava import IStravaClient
 
+strava_rate_limiter = StravaRateLimiter(
+    short_term_limit=settings.strava_short_term_rate_limit,
+    daily_limit=settings.strava_daily_rate_limit,
+    utilization=settings.strava_rate_limit_utilization,
+    max_wait=settings.strava_rate_limit_max_wait,
+    metrics=metrics,
+)
+
+strava_circuit_breaker = CircuitBreaker(
+    error_rate=settings.strava_breaker_error_rate,
+    window=settings.strava_breaker_window,
+    minimum_calls=settings.strava_breaker_minimum_calls,
+    reset_timeout=settings.strava_breaker_reset_timeout,
+)
+
+metrics.register_circuit_breaker("strava", strava_circuit_breaker)
+
+ethereum_client: Optional[IEthereumClient] = None
+
+
+async def get_strava_rate_limiter() -> StravaRateLimiter:
+    """Returns the process-wide Strava rate limiter. Every Strava client shares
+    it, since the quota belongs to the application rather than a request."""
+
+    return strava_rate_limiter
+
+
+async def get_strava_circuit_breaker() -> CircuitBreaker:
+    """Returns the process-wide circuit breaker guarding calls to Strava."""
+
+    return strava_circuit_breaker
+
 
 async def get_strava_client(
     client_session: aiohttp.client.ClientSession = Depends(get_client_session),
+    rate_limiter: StravaRateLimiter = Depends(get_strava_rate_limiter),
+    circuit_breaker: CircuitBreaker = Depends(get_strava_circuit_breaker),
 ) -> IStravaClient:
     """Instantiate and return Strava client."""
 
     return StravaClient(
-        client_session=client_session, base_url=settings.strava_base_url
+        client_session=client_session,
+        base_url=settings.strava_base_url,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        request_timeout=settings.strava_request_timeout,
+        max_retries=settings.strava_max_retries,
+        retry_backoff=settings.strava_retry_backoff,
+        retry_backoff_max=settings.strava_retry_backoff_max,
     )
 
 
-async def get_ethereum_client() -> IEthereumClient:
-    """Instantiate and return Ethereum client."""
+async def get_ethereum_client(
+    client_session: aiohttp.client.ClientSession = Depends(get_client_session),
+    challenge_cache: LRUCache = Depends(get_onchain_challenge_cache),
+) -> IEthereumClient:
+    """Returns the process-wide Ethereum client, so the ABI is decoded and the
+    contract built once rather than on every request."""
 
-    return EthereumClient(
-        abi=json.loads(base64.b64decode(settings.abi)), rpc_url=settings.rpc_url
-    )
+    global ethereum_client  # pylint: disable = global-statement
+    if ethereum_client is None:
+        ethereum_client = EthereumClient(
+            client_session=client_session,
+            abi=json.loads(base64.b64decode(settings.abi)),
+            rpc_url=settings.rpc_url,
+            contract_address=settings.contract_address,
+            request_timeout=settings.ethereum_request_timeout,
+            batch_size=settings.ethereum_batch_size,
+            challenge_cache=challenge_cache,
+            block_time=settings.ethereum_block_time,
+            finality_depth=settings.ethereum_finality_depth,
+            metrics=metrics,
+        )
+    return ethereum_client
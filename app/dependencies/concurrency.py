@@ -0,0 +1,40 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.libraries.concurrency import ConcurrencyLimits
+from app.libraries.single_flight import SingleFlight
+from app.settings import settings
+
+concurrency_limits: Optional[ConcurrencyLimits] = None
+token_refreshes = SingleFlight()
+signature_executor: Optional[ProcessPoolExecutor] = None
+
+
+async def get_concurrency_limits() -> ConcurrencyLimits:
+    """Returns the process-wide concurrency limits. They are created lazily so
+    that the semaphores belong to the running event loop."""
+
+    global concurrency_limits  # pylint: disable = global-statement
+    if concurrency_limits is None:
+        concurrency_limits = ConcurrencyLimits(
+            strava=settings.strava_concurrency,
+            email=settings.email_concurrency,
+        )
+    return concurrency_limits
+
+
+async def get_token_refreshes() -> SingleFlight:
+    """Returns the process-wide coalescer of Strava token refreshes."""
+
+    return token_refreshes
+
+
+async def get_signature_executor() -> ProcessPoolExecutor:
+    """Returns the process-wide pool that signs claim messages off the event
+    loop. Signing is CPU bound and holds the GIL, so it needs processes rather
+    than threads."""
+
+    global signature_executor  # pylint: disable = global-statement
+    if signature_executor is None:
+        signature_executor = ProcessPoolExecutor(max_workers=settings.signature_workers)
+    return signature_executor
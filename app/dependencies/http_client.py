@@ -1,12 +1,30 @@
+import ssl
 from typing import Optional
 
 from aiohttp import ClientSession
 
+from app.dependencies.metrics import metrics
+from app.libraries.http_pool import create_client_session
+from app.settings import settings
+
 client_session: Optional[ClientSession] = None
+ssl_context = ssl.create_default_context()
 
 
 async def get_client_session():
+    """Returns the process-wide client session. Its connection pool is shared by
+    every outbound client: Strava, SendGrid and the Ethereum RPC node."""
+
     global client_session  # pylint: disable = global-statement
     if client_session is None:
-        client_session = ClientSession()
+        client_session = create_client_session(
+            name="pool",
+            limit=settings.http_pool_limit,
+            limit_per_host=settings.http_pool_limit_per_host,
+            keepalive_timeout=settings.http_keepalive_timeout,
+            dns_cache_ttl=settings.http_dns_cache_ttl,
+            timeout=settings.http_timeout,
+            ssl_context=ssl_context,
+            metrics=metrics,
+        )
     return client_session
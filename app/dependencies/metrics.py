@@ -0,0 +1,9 @@
+from app.libraries.metrics import MetricsRegistry
+
+metrics = MetricsRegistry()
+
+
+async def get_metrics() -> MetricsRegistry:
+    """Returns the process-wide metrics registry."""
+
+    return metrics
@@ -1,10 +1,16 @@
 from app.infrastructure.db.core import get_or_create_database
 from app.infrastructure.db.repos.challenges import ChallengesRepo
+from app.infrastructure.db.repos.checkpoints import CheckpointsRepo
+from app.infrastructure.db.repos.onchain_challenges import OnchainChallengesRepo
 from app.infrastructure.db.repos.strava import StravaRepo
 from app.infrastructure.db.repos.users import UsersRepo
+from app.infrastructure.db.repos.webhook_events import WebhookEventsRepo
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
 from app.usecases.interfaces.repos.strava import IStravaRepo
 from app.usecases.interfaces.repos.users import IUsersRepo
+from app.usecases.interfaces.repos.webhook_events import IWebhookEventsRepo
 
 
 async def get_strava_repo() -> IStravaRepo:
@@ -17,3 +23,15 @@ async def get_challenges_repo() -> IChallengesRepo:
 
 async def get_users_repo() -> IUsersRepo:
     return UsersRepo(db=await get_or_create_database())
+
+
+async def get_webhook_events_repo() -> IWebhookEventsRepo:
+    return WebhookEventsRepo(db=await get_or_create_database())
+
+
+async def get_checkpoints_repo() -> ICheckpointsRepo:
+    return CheckpointsRepo(db=await get_or_create_database())
+
+
+async def get_onchain_challenges_repo() -> IOnchainChallengesRepo:
+    return OnchainChallengesRepo(db=await get_or_create_database())
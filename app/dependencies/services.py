@@ -1,32 +1,61 @@
+from concurrent.futures import Executor
+
+import aiohttp
 from fastapi import Depends
 
 from app.dependencies import (
+    get_activity_cache,
     get_challenges_repo,
+    get_checkpoints_repo,
+    get_client_session,
+    get_concurrency_limits,
     get_ethereum_client,
+    get_onchain_challenges_repo,
+    get_received_webhook_events_cache,
+    get_signature_executor,
     get_strava_client,
     get_strava_repo,
+    get_token_refreshes,
+    get_webhook_events_repo,
 )
 from app.dependencies.repos import get_users_repo
+from app.libraries.cache import LRUCache
+from app.libraries.concurrency import ConcurrencyLimits
+from app.libraries.single_flight import SingleFlight
+from app.settings import settings
 from app.usecases.interfaces.clients.ethereum import IEthereumClient
 from app.usecases.interfaces.clients.strava import IStravaClient
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
 from app.usecases.interfaces.repos.strava import IStravaRepo
 from app.usecases.interfaces.repos.users import IUsersRepo
+from app.usecases.interfaces.repos.webhook_events import IWebhookEventsRepo
+from app.usecases.interfaces.services.backfill_manager import IBackfillManager
 from app.usecases.interfaces.services.challange_validation import IChallengeValidation
+from app.usecases.interfaces.services.challenge_indexer import IChallengeIndexer
 from app.usecases.interfaces.services.conversion_manager import IConversionManager
 from app.usecases.interfaces.services.email_manager import IEmailManager
 from app.usecases.interfaces.services.signature_manager import ISignatureManager
+from app.usecases.interfaces.services.token_manager import ITokenManager
+from app.usecases.interfaces.services.webhook_manager import IWebhookManager
+from app.usecases.services.backfill_manager import BackfillManager
+from app.usecases.services.challenge_indexer import ChallengeIndexer
 from app.usecases.services.challenge_manager import ChallengeManager
 from app.usecases.services.challenge_validation import ChallengeValidation
 from app.usecases.services.conversion_manager import ConversionManager
 from app.usecases.services.email_manager import EmailManager
 from app.usecases.services.signature_manager import SignatureManager
+from app.usecases.services.token_manager import TokenManager
+from app.usecases.services.webhook_manager import WebhookManager
 
 
-async def get_signature_manager_service() -> ISignatureManager:
+async def get_signature_manager_service(
+    executor: Executor = Depends(get_signature_executor),
+) -> ISignatureManager:
     """Instantiates and returns the Signature Manger Service."""
 
-    return SignatureManager()
+    return SignatureManager(executor=executor, chunk_size=settings.signature_chunk_size)
 
 
 async def get_conversion_manager_service() -> IConversionManager:
@@ -37,10 +66,30 @@ async def get_conversion_manager_service() -> IConversionManager:
 
 async def get_email_manager_service(
     strava_repo: IStravaRepo = Depends(get_strava_repo),
+    client_session: aiohttp.ClientSession = Depends(get_client_session),
 ) -> IEmailManager:
     """Instantiates and returns the Email Manger Service."""
 
-    return EmailManager(strava_repo=strava_repo)
+    return EmailManager(strava_repo=strava_repo, client_session=client_session)
+
+
+async def get_token_manager_service(
+    strava_client: IStravaClient = Depends(get_strava_client),
+    strava_repo: IStravaRepo = Depends(get_strava_repo),
+    checkpoints_repo: ICheckpointsRepo = Depends(get_checkpoints_repo),
+    single_flight: SingleFlight = Depends(get_token_refreshes),
+    concurrency_limits: ConcurrencyLimits = Depends(get_concurrency_limits),
+) -> ITokenManager:
+    """Instantiates and returns the Token Manager Service."""
+
+    return TokenManager(
+        strava_client=strava_client,
+        strava_repo=strava_repo,
+        checkpoints_repo=checkpoints_repo,
+        single_flight=single_flight,
+        concurrency_limits=concurrency_limits,
+        refresh_margin=settings.strava_token_refresh_margin,
+    )
 
 
 async def get_challenge_validation_service(
@@ -50,6 +99,10 @@ async def get_challenge_validation_service(
     challenges_repo: IChallengesRepo = Depends(get_challenges_repo),
     email_manager: IEmailManager = Depends(get_email_manager_service),
     conversion_manager: IConversionManager = Depends(get_conversion_manager_service),
+    token_manager: ITokenManager = Depends(get_token_manager_service),
+    signature_manager: ISignatureManager = Depends(get_signature_manager_service),
+    activity_cache: LRUCache = Depends(get_activity_cache),
+    concurrency_limits: ConcurrencyLimits = Depends(get_concurrency_limits),
 ) -> IChallengeValidation:
     """Instantiates and returns the Challenge Validation Service."""
 
@@ -60,6 +113,10 @@ async def get_challenge_validation_service(
         challenges_repo=challenges_repo,
         email_manager=email_manager,
         conversion_manager=conversion_manager,
+        token_manager=token_manager,
+        signature_manager=signature_manager,
+        activity_cache=activity_cache,
+        concurrency_limits=concurrency_limits,
     )
 
 
@@ -67,6 +124,9 @@ async def get_challenge_manager_service(
     ethereum_client: IEthereumClient = Depends(get_ethereum_client),
     users_repo: IUsersRepo = Depends(get_users_repo),
     challenges_repo: IChallengesRepo = Depends(get_challenges_repo),
+    onchain_challenges_repo: IOnchainChallengesRepo = Depends(
+        get_onchain_challenges_repo
+    ),
     signature_manager: ISignatureManager = Depends(get_signature_manager_service),
     email_manager: IEmailManager = Depends(get_email_manager_service),
     conversion_manager: IConversionManager = Depends(get_conversion_manager_service),
@@ -76,8 +136,74 @@ async def get_challenge_manager_service(
     return ChallengeManager(
         ethereum_client=ethereum_client,
         challenges_repo=challenges_repo,
+        onchain_challenges_repo=onchain_challenges_repo,
         users_repo=users_repo,
         signature_manager=signature_manager,
         email_manager=email_manager,
         conversion_manager=conversion_manager,
+        confirmation_timeout=settings.onchain_confirmation_timeout,
+        payment_confirmation_timeout=settings.onchain_payment_confirmation_timeout,
+        confirmation_backoff=settings.onchain_confirmation_backoff,
+        confirmation_backoff_max=settings.onchain_confirmation_backoff_max,
+    )
+
+
+async def get_webhook_manager_service(
+    webhook_events_repo: IWebhookEventsRepo = Depends(get_webhook_events_repo),
+    strava_repo: IStravaRepo = Depends(get_strava_repo),
+    challenge_validation: IChallengeValidation = Depends(
+        get_challenge_validation_service
+    ),
+    received_events: LRUCache = Depends(get_received_webhook_events_cache),
+    activity_cache: LRUCache = Depends(get_activity_cache),
+) -> IWebhookManager:
+    """Instantiates and returns the Webhook Manager Service."""
+
+    return WebhookManager(
+        webhook_events_repo=webhook_events_repo,
+        strava_repo=strava_repo,
+        challenge_validation=challenge_validation,
+        received_events=received_events,
+        activity_cache=activity_cache,
+        visibility_timeout=settings.webhook_visibility_timeout,
+        max_attempts=settings.webhook_max_attempts,
+        retry_delay=settings.webhook_retry_delay,
+    )
+
+
+async def get_backfill_manager_service(
+    strava_repo: IStravaRepo = Depends(get_strava_repo),
+    checkpoints_repo: ICheckpointsRepo = Depends(get_checkpoints_repo),
+    challenge_validation: IChallengeValidation = Depends(
+        get_challenge_validation_service
+    ),
+) -> IBackfillManager:
+    """Instantiates and returns the Backfill Manager Service."""
+
+    return BackfillManager(
+        strava_repo=strava_repo,
+        checkpoints_repo=checkpoints_repo,
+        challenge_validation=challenge_validation,
+        concurrency=settings.backfill_concurrency,
+        batch_size=settings.backfill_batch_size,
+        per_page=settings.backfill_page_size,
+    )
+
+
+async def get_challenge_indexer_service(
+    ethereum_client: IEthereumClient = Depends(get_ethereum_client),
+    onchain_challenges_repo: IOnchainChallengesRepo = Depends(
+        get_onchain_challenges_repo
+    ),
+    checkpoints_repo: ICheckpointsRepo = Depends(get_checkpoints_repo),
+) -> IChallengeIndexer:
+    """Instantiates and returns the Challenge Indexer Service."""
+
+    return ChallengeIndexer(
+        ethereum_client=ethereum_client,
+        onchain_challenges_repo=onchain_challenges_repo,
+        checkpoints_repo=checkpoints_repo,
+        start_block=settings.indexer_start_block,
+        block_range=settings.indexer_block_range,
+        finality_depth=settings.ethereum_finality_depth,
     )
@@ -0,0 +1,201 @@
+from typing import Optional
+
+from app.dependencies.caches import (
+    get_activity_cache,
+    get_onchain_challenge_cache,
+    get_received_webhook_events_cache,
+)
+from app.dependencies.clients import (
+    get_ethereum_client,
+    get_strava_circuit_breaker,
+    get_strava_client,
+    get_strava_rate_limiter,
+)
+from app.dependencies.concurrency import (
+    get_concurrency_limits,
+    get_signature_executor,
+    get_token_refreshes,
+)
+from app.dependencies.http_client import get_client_session
+from app.dependencies.repos import (
+    get_challenges_repo,
+    get_checkpoints_repo,
+    get_onchain_challenges_repo,
+    get_strava_repo,
+    get_users_repo,
+    get_webhook_events_repo,
+)
+from app.dependencies.services import (
+    get_backfill_manager_service,
+    get_challenge_indexer_service,
+    get_challenge_manager_service,
+    get_challenge_validation_service,
+    get_conversion_manager_service,
+    get_email_manager_service,
+    get_signature_manager_service,
+    get_token_manager_service,
+    get_webhook_manager_service,
+)
+from app.infrastructure.db.repos.challenges import OPEN_CHALLENGES_INDEX
+from app.infrastructure.workers.challenge_indexer import ChallengeIndexerWorker
+from app.infrastructure.workers.open_challenges import OpenChallengesListener
+from app.infrastructure.workers.strava_tokens import TokenRefresher
+from app.infrastructure.workers.webhooks import WebhookWorkerPool
+from app.settings import settings
+from app.usecases.interfaces.clients.strava import IStravaClient
+from app.usecases.interfaces.services.backfill_manager import IBackfillManager
+from app.usecases.interfaces.services.challange_manager import IChallengeManager
+from app.usecases.interfaces.services.challange_validation import IChallengeValidation
+from app.usecases.interfaces.services.token_manager import ITokenManager
+
+webhook_worker_pool: Optional[WebhookWorkerPool] = None
+token_refresher: Optional[TokenRefresher] = None
+challenge_indexer_worker: Optional[ChallengeIndexerWorker] = None
+open_challenges_listener: Optional[OpenChallengesListener] = None
+
+
+async def create_strava_client() -> IStravaClient:
+    """Resolves the Strava client's dependency graph outside of a request."""
+
+    return await get_strava_client(
+        client_session=await get_client_session(),
+        rate_limiter=await get_strava_rate_limiter(),
+        circuit_breaker=await get_strava_circuit_breaker(),
+    )
+
+
+async def create_token_manager_service() -> ITokenManager:
+    """Resolves the token manager's dependency graph outside of a request."""
+
+    return await get_token_manager_service(
+        strava_client=await create_strava_client(),
+        strava_repo=await get_strava_repo(),
+        checkpoints_repo=await get_checkpoints_repo(),
+        single_flight=await get_token_refreshes(),
+        concurrency_limits=await get_concurrency_limits(),
+    )
+
+
+async def create_challenge_validation_service() -> IChallengeValidation:
+    """Resolves the challenge validation service's dependency graph outside of
+    a request."""
+
+    strava_repo = await get_strava_repo()
+
+    return await get_challenge_validation_service(
+        strava_client=await create_strava_client(),
+        strava_repo=strava_repo,
+        users_repo=await get_users_repo(),
+        challenges_repo=await get_challenges_repo(),
+        email_manager=await get_email_manager_service(
+            strava_repo=strava_repo, client_session=await get_client_session()
+        ),
+        conversion_manager=await get_conversion_manager_service(),
+        token_manager=await create_token_manager_service(),
+        signature_manager=await get_signature_manager_service(
+            executor=await get_signature_executor()
+        ),
+        activity_cache=await get_activity_cache(),
+        concurrency_limits=await get_concurrency_limits(),
+    )
+
+
+async def create_backfill_manager_service() -> IBackfillManager:
+    """Resolves the backfill manager's dependency graph outside of a request."""
+
+    return await get_backfill_manager_service(
+        strava_repo=await get_strava_repo(),
+        checkpoints_repo=await get_checkpoints_repo(),
+        challenge_validation=await create_challenge_validation_service(),
+    )
+
+
+async def create_challenge_manager_service() -> IChallengeManager:
+    """Resolves the challenge manager's dependency graph outside of a request."""
+
+    strava_repo = await get_strava_repo()
+
+    return await get_challenge_manager_service(
+        ethereum_client=await get_ethereum_client(
+            client_session=await get_client_session(),
+            challenge_cache=await get_onchain_challenge_cache(),
+        ),
+        users_repo=await get_users_repo(),
+        challenges_repo=await get_challenges_repo(),
+        onchain_challenges_repo=await get_onchain_challenges_repo(),
+        signature_manager=await get_signature_manager_service(
+            executor=await get_signature_executor()
+        ),
+        email_manager=await get_email_manager_service(
+            strava_repo=strava_repo, client_session=await get_client_session()
+        ),
+        conversion_manager=await get_conversion_manager_service(),
+    )
+
+
+async def get_webhook_worker_pool() -> WebhookWorkerPool:
+    """Returns the process-wide webhook worker pool. Workers run outside of a
+    request, so the webhook manager's dependencies are resolved by hand."""
+
+    global webhook_worker_pool  # pylint: disable = global-statement
+    if webhook_worker_pool is None:
+        webhook_worker_pool = WebhookWorkerPool(
+            webhook_manager=await get_webhook_manager_service(
+                webhook_events_repo=await get_webhook_events_repo(),
+                strava_repo=await get_strava_repo(),
+                challenge_validation=await create_challenge_validation_service(),
+                received_events=await get_received_webhook_events_cache(),
+                activity_cache=await get_activity_cache(),
+            ),
+            concurrency=settings.webhook_worker_concurrency,
+            batch_size=settings.webhook_worker_batch_size,
+            poll_interval=settings.webhook_worker_poll_interval,
+        )
+    return webhook_worker_pool
+
+
+async def get_token_refresher() -> TokenRefresher:
+    """Returns the process-wide Strava access token refresher."""
+
+    global token_refresher  # pylint: disable = global-statement
+    if token_refresher is None:
+        token_refresher = TokenRefresher(
+            token_manager=await create_token_manager_service(),
+            interval=settings.strava_token_refresh_interval,
+        )
+    return token_refresher
+
+
+async def get_challenge_indexer_worker() -> ChallengeIndexerWorker:
+    """Returns the process-wide worker that mirrors on-chain challenges into
+    the database."""
+
+    global challenge_indexer_worker  # pylint: disable = global-statement
+    if challenge_indexer_worker is None:
+        challenge_indexer_worker = ChallengeIndexerWorker(
+            challenge_indexer=await get_challenge_indexer_service(
+                ethereum_client=await get_ethereum_client(
+                    client_session=await get_client_session(),
+                    challenge_cache=await get_onchain_challenge_cache(),
+                ),
+                onchain_challenges_repo=await get_onchain_challenges_repo(),
+                checkpoints_repo=await get_checkpoints_repo(),
+            ),
+            interval=settings.indexer_poll_interval,
+        )
+    return challenge_indexer_worker
+
+
+async def get_open_challenges_listener() -> OpenChallengesListener:
+    """Returns the process-wide listener that keeps the open challenges index
+    current."""
+
+    global open_challenges_listener  # pylint: disable = global-statement
+    if open_challenges_listener is None:
+        open_challenges_listener = OpenChallengesListener(
+            db_url=settings.db_url,
+            challenges_repo=await get_challenges_repo(),
+            open_challenges_index=OPEN_CHALLENGES_INDEX,
+            retry_interval=settings.open_challenges_listener_retry_interval,
+        )
+    return open_challenges_listener
@@ -0,0 +1,43 @@
+import asyncio
+
+import click
+
+from app.dependencies import (
+    create_backfill_manager_service,
+    get_client_session,
+    get_event_loop,
+)
+from app.infrastructure.db.core import get_or_create_database
+from app.usecases.schemas.strava import BackfillReport
+
+
+async def backfill(restart: bool) -> BackfillReport:
+    await get_event_loop()
+    await get_or_create_database()
+
+    try:
+        backfill_manager = await create_backfill_manager_service()
+        return await backfill_manager.run(restart=restart)
+    finally:
+        client_session = await get_client_session()
+        await client_session.close()
+        DATABASE = await get_or_create_database()
+        if DATABASE.is_connected:
+            await DATABASE.disconnect()
+
+
+@click.command()
+@click.option("--restart", is_flag=True, help="Ignore the saved checkpoint.")
+def main(restart=False):
+    """Revalidates open challenges against athletes' Strava activities, e.g.
+    after webhooks were missed during an outage. Resumes from its checkpoint."""
+
+    report = asyncio.run(backfill(restart=restart))
+    click.echo(report.json())
+
+    if not report.finished:
+        raise click.ClickException("Backfill stopped early, rerun it to resume.")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,49 @@
+import asyncio
+
+import click
+
+from app.dependencies import (
+    get_challenge_indexer_worker,
+    get_client_session,
+    get_event_loop,
+)
+from app.infrastructure.db.core import get_or_create_database
+from app.settings import settings
+
+
+async def index_challenges(once: bool) -> int:
+    await get_event_loop()
+    await get_or_create_database()
+
+    try:
+        challenge_indexer_worker = await get_challenge_indexer_worker()
+        if once:
+            return await challenge_indexer_worker.challenge_indexer.index()
+        await challenge_indexer_worker.run()
+        return 0
+    finally:
+        client_session = await get_client_session()
+        await client_session.close()
+        DATABASE = await get_or_create_database()
+        if DATABASE.is_connected:
+            await DATABASE.disconnect()
+
+
+@click.command()
+@click.option("--once", is_flag=True, help="Index up to the head block, then exit.")
+def main(once=False):
+    """Mirrors on-chain challenges into the database, following new blocks
+    until stopped. Resumes from its checkpoint. Runs alongside other indexer
+    processes safely, as only one of them indexes at a time."""
+
+    if settings.indexer_start_block is None:
+        raise click.UsageError(
+            "INDEXER_START_BLOCK must be set to the block the contract was deployed in."
+        )
+
+    indexed = asyncio.run(index_challenges(once=once))
+    click.echo(f"Indexed {indexed} challenges.")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,48 @@
+import asyncio
+
+import click
+
+from app.dependencies import (
+    create_challenge_manager_service,
+    get_client_session,
+    get_event_loop,
+    get_signature_executor,
+)
+from app.infrastructure.db.core import get_or_create_database
+from app.settings import settings
+
+
+async def sign_challenges(batch_size: int) -> int:
+    await get_event_loop()
+    await get_or_create_database()
+
+    try:
+        challenge_manager = await create_challenge_manager_service()
+        return await challenge_manager.sign_completed_challenges(batch_size=batch_size)
+    finally:
+        signature_executor = await get_signature_executor()
+        signature_executor.shutdown()
+        client_session = await get_client_session()
+        await client_session.close()
+        DATABASE = await get_or_create_database()
+        if DATABASE.is_connected:
+            await DATABASE.disconnect()
+
+
+@click.command()
+@click.option(
+    "--batch-size",
+    default=settings.signature_backfill_batch_size,
+    show_default=True,
+    help="Challenges signed per query.",
+)
+def main(batch_size):
+    """Stores claim signatures for completed, unpaid challenges that were
+    completed before signatures were stored along with their payments."""
+
+    signed = asyncio.run(sign_challenges(batch_size=batch_size))
+    click.echo(f"Signed {signed} challenges.")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
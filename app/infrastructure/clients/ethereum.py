@@ -1,31 +1,403 @@
+import asyncio
+import itertools
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import aiohttp
+from eth_abi.exceptions import DecodingError
+from eth_utils import encode_hex, event_abi_to_log_topic, function_abi_to_4byte_selector
+from hexbytes import HexBytes
 from web3 import Web3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.contracts import encode_abi
+from web3._utils.events import get_event_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.exceptions import MismatchedABI
 
-from app.settings import settings
+from app.libraries.cache import LRUCache
+from app.libraries.metrics import MetricsRegistry
 from app.usecases.interfaces.clients.ethereum import IEthereumClient
 from app.usecases.schemas.challenges import ChallengeOnChain
+from app.usecases.schemas.ethereum import EthereumException
+
+CHALLENGE_ID_ARGUMENT = "challengeId"
+
+
+class ContractFunction(NamedTuple):
+    name: str
+    abi: Dict[str, Any]
+    selector: str
+    output_types: List[str]
+
+
+class CachedChallenge(NamedTuple):
+    challenge: ChallengeOnChain
+    block_number: int  # Head block when the challenge was read
+    complete_since: Optional[int]  # Head block when it was first read complete
+    final: bool  # Whether a read made once `complete_since` was final confirmed it
 
 
 class EthereumClient(IEthereumClient):
-    """Faciliates communication with deployed smart contract."""
+    """Faciliates communication with deployed smart contract. Calls are encoded
+    and decoded with web3, but sent as JSON-RPC over the shared, non-blocking
+    client session instead of web3's blocking HTTP provider.
 
-    def __init__(self, abi: list, rpc_url: str):
-        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
-        self.contract = self.web3.eth.contract(
-            address=settings.contract_address, abi=abi
-        )
+    The client is meant to live as long as the process: each contract
+    function's ABI, selector and output types are looked up once, on first
+    use, rather than on every call. Many reads are sent as JSON-RPC batches of
+    at most `batch_size` calls, and the batches are sent concurrently.
+
+    Challenge reads are cached against the head block number, which is looked
+    up at most once every `block_time` seconds. A cached challenge is served
+    while the head has not moved. A complete challenge that is read again, once
+    the block it was first read complete at is `finality_depth` blocks deep,
+    cannot change any more, so it is served for good. Challenges that have not
+    been issued yet are not cached."""
 
-    def get_challenge(self, challenge_id: str) -> ChallengeOnChain:
+    def __init__(
+        self,
+        client_session: aiohttp.client.ClientSession,
+        abi: list,
+        rpc_url: str,
+        contract_address: str,
+        request_timeout: float,
+        batch_size: int,
+        challenge_cache: LRUCache,
+        block_time: float,
+        finality_depth: int,
+        metrics: MetricsRegistry,
+    ):
+        self.client_session = client_session
+        self.rpc_url = rpc_url
+        self.web3 = Web3()
+        self.contract = self.web3.eth.contract(address=contract_address, abi=abi)
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.batch_size = batch_size
+        self.challenge_cache = challenge_cache
+        self.block_time = block_time
+        self.finality_depth = finality_depth
+        self.head: Optional[int] = None
+        self.head_checked_at = 0.0
+        self.metrics = metrics
+        self.request_ids = itertools.count(1)
+        self.functions: Dict[str, ContractFunction] = {}
+        self.events: Optional[Dict[str, Dict[str, Any]]] = None
+
+        metrics.register("ethereum.challenge_cache.size", lambda: len(challenge_cache))
+
+    async def get_challenge(
+        self, challenge_id: str, cached: bool = True
+    ) -> ChallengeOnChain:
         """Retrieves on-chain challenge by challenge_id."""
 
-        response = self.contract.functions.challengeLookup(challenge_id).call()
+        challenges = await self.get_challenges(
+            challenge_ids=[challenge_id], cached=cached
+        )
+        return challenges[0]
+
+    async def get_challenges(
+        self, challenge_ids: List[str], cached: bool = True
+    ) -> List[ChallengeOnChain]:
+        """Retrieves on-chain challenges by challenge_id, in the same order.
+        Challenges that cannot have changed since they were cached are served
+        from the challenge cache, unless `cached` is false; the rest are read
+        with batched eth_calls."""
+
+        head = await self.get_block_number()
+
+        challenges: Dict[str, ChallengeOnChain] = {}
+        for challenge_id in challenge_ids if cached else []:
+            entry = self.challenge_cache.get(challenge_id)
+            if entry and self.__is_current(cached=entry, head=head):
+                challenges[challenge_id] = entry.challenge
+
+        missing = [
+            challenge_id
+            for challenge_id in dict.fromkeys(challenge_ids)
+            if challenge_id not in challenges
+        ]
+        self.metrics.increment("ethereum.challenge_cache.hits", len(challenges))
+        self.metrics.increment("ethereum.challenge_cache.misses", len(missing))
 
-        return ChallengeOnChain(
-            challengeId=response[0],
-            challenger=response[1],
-            challengee=response[2],
-            bounty=response[3],
-            distance=response[4],
-            speed=response[5],
-            issuedAt=response[6],
-            complete=response[7],
+        chunks = [
+            missing[index : index + self.batch_size]
+            for index in range(0, len(missing), self.batch_size)
+        ]
+        responses = await asyncio.gather(
+            *(
+                self.batch_call(
+                    fn_name="challengeLookup",
+                    args=[[challenge_id] for challenge_id in chunk],
+                )
+                for chunk in chunks
+            )
         )
+
+        for challenge_id, response in zip(
+            missing, itertools.chain.from_iterable(responses)
+        ):
+            challenge = ChallengeOnChain(
+                challengeId=response[0],
+                challenger=response[1],
+                challengee=response[2],
+                bounty=response[3],
+                distance=response[4],
+                speed=response[5],
+                issuedAt=response[6],
+                complete=response[7],
+            )
+            if int(challenge.challengee, 0):
+                self.challenge_cache.set(
+                    challenge_id,
+                    self.__cache_entry(
+                        challenge_id=challenge_id, challenge=challenge, head=head
+                    ),
+                )
+            challenges[challenge_id] = challenge
+
+        return [challenges[challenge_id] for challenge_id in challenge_ids]
+
+    async def get_block_number(self) -> int:
+        """Returns the head block number, refreshed at most once a block."""
+
+        now = time.monotonic()
+        if self.head is None or now - self.head_checked_at >= self.block_time:
+            self.head = int(
+                await self.rpc_call(method="eth_blockNumber", params=[]), 16
+            )
+            self.head_checked_at = now
+        return self.head
+
+    async def get_challenge_events(
+        self, from_block: int, to_block: int
+    ) -> Dict[str, int]:
+        """Finds the challenges that contract events in a block range refer to,
+        by their `challengeId` argument. Returns the block of the last event for
+        each challenge."""
+
+        events = self.__challenge_events()
+        if not events:
+            return {}
+
+        logs = await self.rpc_call(
+            method="eth_getLogs",
+            params=[
+                {
+                    "address": self.contract.address,
+                    "fromBlock": hex(from_block),
+                    "toBlock": hex(to_block),
+                    "topics": [list(events)],
+                }
+            ],
+        )
+
+        challenges: Dict[str, int] = {}
+        for log in logs:
+            if log.get("removed"):
+                continue
+            log_entry = {
+                **log,
+                "topics": [HexBytes(topic) for topic in log["topics"]],
+                "blockNumber": int(log["blockNumber"], 16),
+                "logIndex": int(log["logIndex"], 16),
+                "transactionIndex": int(log["transactionIndex"], 16),
+            }
+            try:
+                event = get_event_data(
+                    self.web3.codec, events[log["topics"][0]], log_entry
+                )
+            except (KeyError, MismatchedABI, DecodingError):
+                continue
+            challenge_id = event["args"][CHALLENGE_ID_ARGUMENT]
+            challenges[challenge_id] = max(
+                challenges.get(challenge_id, 0), event["blockNumber"]
+            )
+        return challenges
+
+    def __challenge_events(self) -> Dict[str, Dict[str, Any]]:
+        """Returns, by topic, the contract events with a non-indexed challengeId
+        argument. Indexed strings are only logged as hashes."""
+
+        if self.events is None:
+            self.events = {
+                encode_hex(event_abi_to_log_topic(abi)): abi
+                for abi in self.contract.abi
+                if abi.get("type") == "event"
+                and any(
+                    argument["name"] == CHALLENGE_ID_ARGUMENT
+                    and not argument.get("indexed")
+                    for argument in abi.get("inputs", [])
+                )
+            }
+        return self.events
+
+    def __cache_entry(
+        self, challenge_id: str, challenge: ChallengeOnChain, head: int
+    ) -> CachedChallenge:
+        """Stamps a challenge read at `head`. Every field but `complete` is
+        immutable once mined, and `complete` only ever turns true, so a read
+        that finds a challenge complete as it was first read complete, once that
+        block is final, confirms it for good.
+
+        The head is looked up once a block, so it may lag the block a read was
+        made at by one; a block is taken as final one block late to allow for
+        that."""
+
+        if not challenge.complete:
+            return CachedChallenge(
+                challenge=challenge, block_number=head, complete_since=None, final=False
+            )
+
+        previous = self.challenge_cache.get(challenge_id)
+        complete_since = (
+            previous.complete_since
+            if previous
+            and previous.challenge == challenge
+            and previous.complete_since is not None
+            else head
+        )
+
+        return CachedChallenge(
+            challenge=challenge,
+            block_number=head,
+            complete_since=complete_since,
+            final=head - complete_since > self.finality_depth,
+        )
+
+    @staticmethod
+    def __is_current(cached: CachedChallenge, head: int) -> bool:
+        """Whether a cached challenge still reflects the chain at `head`: for
+        good once it is confirmed final, otherwise until the next block."""
+
+        return cached.final or cached.block_number == head
+
+    async def call(self, fn_name: str, args: List[Any]) -> Any:
+        """Calls a read-only contract function at the latest block and decodes
+        its return values the way web3's `call()` does."""
+
+        function = self.__function(fn_name=fn_name)
+        result = await self.rpc_call(
+            method="eth_call", params=self.__eth_call_params(function, args)
+        )
+        return self.__decode(function, result)
+
+    async def batch_call(self, fn_name: str, args: List[List[Any]]) -> List[Any]:
+        """Calls a read-only contract function once for each list of arguments,
+        in a single JSON-RPC batch request."""
+
+        function = self.__function(fn_name=fn_name)
+        results = await self.rpc_batch(
+            method="eth_call",
+            params=[self.__eth_call_params(function, call_args) for call_args in args],
+        )
+        return [self.__decode(function, result) for result in results]
+
+    def __function(self, fn_name: str) -> ContractFunction:
+        """Looks up a contract function by name, once."""
+
+        function = self.functions.get(fn_name)
+        if function is None:
+            abi = self.contract.get_function_by_name(fn_name).abi
+            function = ContractFunction(
+                name=fn_name,
+                abi=abi,
+                selector=encode_hex(function_abi_to_4byte_selector(abi)),
+                output_types=get_abi_output_types(abi),
+            )
+            self.functions[fn_name] = function
+        return function
+
+    def __eth_call_params(
+        self, function: ContractFunction, args: List[Any]
+    ) -> List[Any]:
+        return [
+            {
+                "to": self.contract.address,
+                "data": encode_abi(
+                    self.web3, function.abi, args, data=function.selector
+                ),
+            },
+            "latest",
+        ]
+
+    def __decode(self, function: ContractFunction, result: str) -> Any:
+        try:
+            decoded = self.web3.codec.decode_abi(
+                function.output_types, HexBytes(result)
+            )
+        except DecodingError as error:
+            raise EthereumException(
+                f"Ethereum Client Error: Undecodable {function.name} result {result}."
+            ) from error
+
+        normalized = map_abi_data(
+            BASE_RETURN_NORMALIZERS, function.output_types, decoded
+        )
+        return normalized[0] if len(normalized) == 1 else normalized
+
+    async def rpc_call(self, method: str, params: List[Any]) -> Any:
+        """Makes a JSON-RPC call to the node and returns its result. Latency is
+        recorded under `ethereum.rpc.<method>.seconds`."""
+
+        body = await self.__post(
+            payload=self.__request(method=method, params=params), name=method
+        )
+        return self.__result(method=method, response=body)
+
+    async def rpc_batch(self, method: str, params: List[List[Any]]) -> List[Any]:
+        """Makes one JSON-RPC call per list of params in a single batch request
+        and returns the results in the same order. Latency is recorded under
+        `ethereum.rpc.batch.seconds`."""
+
+        if len(params) == 1:
+            return [await self.rpc_call(method=method, params=params[0])]
+
+        requests = [
+            self.__request(method=method, params=call_params) for call_params in params
+        ]
+        body = await self.__post(payload=requests, name="batch")
+
+        if not isinstance(body, list):  # The whole batch was rejected
+            return [self.__result(method=method, response=body)]
+
+        responses = {response.get("id"): response for response in body}
+        return [
+            self.__result(method=method, response=responses.get(request["id"], {}))
+            for request in requests
+        ]
+
+    def __request(self, method: str, params: List[Any]) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "id": next(self.request_ids),
+            "method": method,
+            "params": params,
+        }
+
+    async def __post(self, payload: Any, name: str) -> Any:
+        start = time.perf_counter()
+        try:
+            async with self.client_session.post(
+                self.rpc_url, json=payload, timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as error:
+            self.metrics.increment("ethereum.rpc.errors")
+            raise EthereumException(
+                f"Ethereum Client Error: {name} failed with {error!r}"
+            ) from error
+        finally:
+            self.metrics.observe(
+                f"ethereum.rpc.{name}.seconds", time.perf_counter() - start
+            )
+
+    def __result(self, method: str, response: Dict[str, Any]) -> Any:
+        if "result" not in response:
+            self.metrics.increment("ethereum.rpc.errors")
+            raise EthereumException(
+                f"Ethereum Client Error: {method} failed with "
+                f"{response.get('error', 'no response')}"
+            )
+
+        return response["result"]
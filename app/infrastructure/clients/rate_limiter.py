@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Mapping, Optional, Tuple
+
+from app.libraries.metrics import MetricsRegistry
+from app.usecases.schemas.strava import StravaRateLimitException, StravaRequestPriority
+
+SHORT_TERM_WINDOW = 15 * 60  # Seconds, reset on the quarter hour
+DAILY_WINDOW = 24 * 60 * 60  # Seconds, reset at midnight UTC
+
+
+class RateLimitWindow:
+    """Token bucket for one of Strava's quota windows. The bucket refills in
+    full whenever the window rolls over, mirroring how Strava resets usage."""
+
+    def __init__(self, name: str, length: int, limit: int):
+        self.name = name
+        self.length = length
+        self.limit = limit
+        self.usage = 0
+        self.resets_at = self.__next_reset()
+
+    def __next_reset(self) -> float:
+        return (time.time() // self.length + 1) * self.length
+
+    def roll(self) -> None:
+        """Refills the bucket if the window has rolled over."""
+
+        if time.time() >= self.resets_at:
+            self.usage = 0
+            self.resets_at = self.__next_reset()
+
+    def available(self, utilization: float) -> bool:
+        """Whether a request fits in this window without crossing the share of
+        the limit we allow ourselves to use."""
+
+        self.roll()
+        return self.usage < int(self.limit * utilization)
+
+    def consume(self) -> None:
+        self.usage += 1
+
+    def observe(self, limit: int, usage: int) -> None:
+        """Reconciles the bucket with the quota Strava reported. Usage only moves
+        forward within a window: our own count includes requests still in flight,
+        Strava's includes requests made by other processes."""
+
+        self.roll()
+        self.limit = limit
+        self.usage = max(self.usage, usage)
+
+    def exhaust(self) -> None:
+        """Empties the bucket until the window rolls over."""
+
+        self.roll()
+        self.usage = max(self.usage, self.limit)
+
+
+class StravaRateLimiter:
+    """Schedules Strava requests against the short term and daily quotas that
+    Strava reports in the X-RateLimit-Limit and X-RateLimit-Usage headers.
+
+    Requests are let through in priority order while both buckets have
+    capacity. Once either is empty, requests queue until the window rolls over,
+    or fail with StravaRateLimitException after waiting `max_wait` seconds."""
+
+    def __init__(
+        self,
+        short_term_limit: int,
+        daily_limit: int,
+        utilization: float,
+        max_wait: float,
+        metrics: MetricsRegistry,
+    ):
+        self.windows = (
+            RateLimitWindow(
+                name="short_term", length=SHORT_TERM_WINDOW, limit=short_term_limit
+            ),
+            RateLimitWindow(name="daily", length=DAILY_WINDOW, limit=daily_limit),
+        )
+        self.utilization = utilization
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self.sequence = itertools.count()
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.__publish()
+
+    async def acquire(
+        self, priority: StravaRequestPriority = StravaRequestPriority.DEFAULT
+    ) -> None:
+        """Waits for a slot in both quota windows."""
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.sequence), future))
+        self.__dispatch()
+
+        try:
+            await asyncio.wait_for(future, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.metrics.increment("strava.rate_limit.rejected")
+            raise StravaRateLimitException(  # pylint: disable=raise-missing-from
+                f"Strava quota not available within {self.max_wait} seconds."
+            )
+
+    def record(self, status: int, headers: Mapping[str, str]) -> None:
+        """Updates the buckets from a Strava response."""
+
+        self.metrics.increment("strava.requests")
+
+        limits = self.__parse(headers.get("X-RateLimit-Limit"))
+        usages = self.__parse(headers.get("X-RateLimit-Usage"))
+        if limits and usages:
+            for window, limit, usage in zip(self.windows, limits, usages):
+                window.observe(limit=limit, usage=usage)
+
+        if status == 429:
+            self.metrics.increment("strava.rate_limit.throttled")
+            exhausted = [
+                window for window in self.windows if window.usage >= window.limit
+            ]
+            for window in exhausted or self.windows[:1]:
+                window.exhaust()
+
+        self.__dispatch()
+
+    @staticmethod
+    def __parse(header: Optional[str]) -> Optional[List[int]]:
+        """Parses a "<short term>,<daily>" rate limit header."""
+
+        try:
+            return [int(value) for value in header.split(",")]
+        except (AttributeError, ValueError):
+            return None
+
+    def __available(self) -> bool:
+        return all(window.available(self.utilization) for window in self.windows)
+
+    def __dispatch(self) -> None:
+        """Lets queued requests through, highest priority first, while both
+        buckets have capacity. Otherwise wakes up again once they refill."""
+
+        while self.waiters:
+            future = self.waiters[0][2]
+            if future.done():  # Timed out while queued
+                heapq.heappop(self.waiters)
+                continue
+            if not self.__available():
+                break
+            heapq.heappop(self.waiters)
+            for window in self.windows:
+                window.consume()
+            future.set_result(None)
+
+        if self.waiters and self.timer is None:
+            refills_at = max(
+                window.resets_at
+                for window in self.windows
+                if not window.available(self.utilization)
+            )
+            self.timer = asyncio.get_running_loop().call_later(
+                max(refills_at - time.time(), 0), self.__wake
+            )
+
+        self.__publish()
+
+    def __wake(self) -> None:
+        self.timer = None
+        self.__dispatch()
+
+    def __publish(self) -> None:
+        for window in self.windows:
+            self.metrics.set(f"strava.rate_limit.{window.name}.usage", window.usage)
+            self.metrics.set(f"strava.rate_limit.{window.name}.limit", window.limit)
+        self.metrics.set("strava.rate_limit.queued", len(self.waiters))
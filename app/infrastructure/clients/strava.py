@@ -1,22 +1,51 @@
-from typing import Any, Mapping, Optional
+import asyncio
+from typing import Any, List, Mapping, Optional
 
 import aiohttp
+import orjson
 
+from app.infrastructure.clients.rate_limiter import StravaRateLimiter
+from app.libraries.backoff import backoff_delay
+from app.libraries.circuit_breaker import CircuitBreaker
 from app.settings import settings
 from app.usecases.interfaces.clients.strava import IStravaClient
 from app.usecases.schemas.strava import (
+    ActivitySummary,
     RefreshTokenResponse,
     StravaException,
+    StravaRateLimitException,
+    StravaRequestPriority,
+    StravaServerException,
+    StravaUnavailableException,
     TokenExchangeResponse,
 )
 
+MAX_THROTTLED_ATTEMPTS = 2
+RETRYABLE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, StravaServerException)
+
 
 class StravaClient(IStravaClient):
     """Faciliates communication with Strava's API."""
 
-    def __init__(self, client_session: aiohttp.client.ClientSession, base_url: str):
+    def __init__(
+        self,
+        client_session: aiohttp.client.ClientSession,
+        base_url: str,
+        rate_limiter: StravaRateLimiter,
+        circuit_breaker: CircuitBreaker,
+        request_timeout: float,
+        max_retries: int,
+        retry_backoff: float,
+        retry_backoff_max: float,
+    ):
         self.client_session = client_session
         self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
 
     async def api_call(
         self,
@@ -25,24 +54,95 @@ class StravaClient(IStravaClient):
         headers: Optional[Mapping[str, str]] = None,
         params: Optional[Mapping[str, str]] = None,
         json_body: Optional[Mapping[str, Any]] = None,
+        priority: StravaRequestPriority = StravaRequestPriority.DEFAULT,
     ) -> Mapping[str, Any]:
-        """Make API call."""
-
-        async with self.client_session.request(
-            method,
-            self.base_url + endpoint,
-            headers=headers,
-            json=json_body,
-            params=params,
-            verify_ssl=False,
-        ) as response:
+        """Make API call. Idempotent GETs are retried with jittered exponential
+        backoff after timeouts, connection errors and 5xx responses. Calls fail
+        fast with StravaUnavailableException while the circuit breaker is open."""
+
+        attempts = self.max_retries + 1 if method == "GET" else 1
+
+        for attempt in range(1, attempts + 1):
+            if not self.circuit_breaker.allow():
+                raise StravaUnavailableException(
+                    "Strava Client Error: Circuit breaker is open."
+                )
+
             try:
-                return await response.json()
-            except Exception:
-                response_text = await response.text()
-                raise StravaException(  # pylint: disable=raise-missing-from
-                    f"Strava Client Error: Response status: {response.status}, Response Text: {response_text}"
+                return await self.__throttled_call(
+                    method=method,
+                    endpoint=endpoint,
+                    headers=headers,
+                    params=params,
+                    json_body=json_body,
+                    priority=priority,
+                )
+            except RETRYABLE_ERRORS as error:
+                self.circuit_breaker.record_failure()
+                if attempt == attempts:
+                    if isinstance(error, StravaException):
+                        raise
+                    raise StravaException(
+                        f"Strava Client Error: {endpoint} failed with {error!r}"
+                    ) from error
+
+            await asyncio.sleep(
+                backoff_delay(
+                    attempt=attempt,
+                    base=self.retry_backoff,
+                    maximum=self.retry_backoff_max,
+                )
+            )
+
+    async def __throttled_call(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Mapping[str, str]],
+        params: Optional[Mapping[str, str]],
+        json_body: Optional[Mapping[str, Any]],
+        priority: StravaRequestPriority,
+    ) -> Mapping[str, Any]:
+        """Makes a single call once the rate limiter lets it through. A throttled
+        call is queued again behind the refilled quota."""
+
+        for attempt in range(1, MAX_THROTTLED_ATTEMPTS + 1):
+            await self.rate_limiter.acquire(priority=priority)
+
+            async with self.client_session.request(
+                method,
+                self.base_url + endpoint,
+                headers=headers,
+                json=json_body,
+                params=params,
+                timeout=self.timeout,
+            ) as response:
+                self.rate_limiter.record(
+                    status=response.status, headers=response.headers
                 )
+                if response.status == 429:
+                    if attempt < MAX_THROTTLED_ATTEMPTS:
+                        continue
+                    raise StravaRateLimitException(
+                        f"Strava Client Error: Rate limit exceeded for {endpoint}"
+                    )
+
+                if response.status >= 500:
+                    raise StravaServerException(
+                        f"Strava Client Error: Response status: {response.status}, Response Text: {await response.text()}"
+                    )
+
+                self.circuit_breaker.record_success()
+
+                # Activities run to megabytes of JSON, so the body is decoded
+                # straight from bytes, with orjson.
+                try:
+                    return orjson.loads(await response.read())
+                except Exception:
+                    response_text = await response.text()
+                    raise StravaException(  # pylint: disable=raise-missing-from
+                        f"Strava Client Error: Response status: {response.status}, Response Text: {response_text}"
+                    )
 
     async def refresh_token(self, refresh_token: str) -> RefreshTokenResponse:
         """Refreshes a Strava athlete's access token."""
@@ -77,12 +177,69 @@ class StravaClient(IStravaClient):
         return TokenExchangeResponse(**response)
 
     async def get_activity(
-        self, access_token: str, activity_id: int
-    ) -> Mapping[str, Any]:
-        """Retrieves a Strava athlete's activity. Returns a massive JSON response."""
+        self,
+        access_token: str,
+        activity_id: int,
+        priority: StravaRequestPriority = StravaRequestPriority.VALIDATION,
+    ) -> ActivitySummary:
+        """Retrieves a Strava athlete's activity. Strava returns a massive JSON
+        response, so segment efforts are left out and only the fields in
+        ActivitySummary are kept."""
 
-        return await self.api_call(
+        activity = await self.api_call(
             method="GET",
             endpoint=f"/activities/{activity_id}",
             headers={"Authorization": f"Bearer {access_token}"},
+            params={"include_all_efforts": "false"},
+            priority=priority,
+        )
+
+        return self.__summarize(activity=activity)
+
+    async def list_activities(
+        self,
+        access_token: str,
+        after: int,
+        page: int,
+        per_page: int,
+        priority: StravaRequestPriority = StravaRequestPriority.BACKFILL,
+    ) -> List[ActivitySummary]:
+        """Retrieves a page of a Strava athlete's activities that started after
+        `after` (seconds since epoch), oldest first."""
+
+        activities = await self.api_call(
+            method="GET",
+            endpoint="/athlete/activities",
+            headers={"Authorization": f"Bearer {access_token}"},
+            params={"after": str(after), "page": str(page), "per_page": str(per_page)},
+            priority=priority,
         )
+
+        if not isinstance(activities, list):
+            raise StravaException(
+                f"Strava Client Error: Unexpected activities response: {activities}"
+            )
+
+        return [self.__summarize(activity=activity) for activity in activities]
+
+    @staticmethod
+    def __summarize(activity: Mapping[str, Any]) -> ActivitySummary:
+        """Projects a detailed or summary activity onto ActivitySummary. Summary
+        activities only carry the map's summary polyline."""
+
+        try:
+            activity_map = activity.get("map") or {}
+            return ActivitySummary(
+                id=activity["id"],
+                type=activity["type"],
+                start_date=activity["start_date"],
+                distance=activity["distance"],
+                average_speed=activity["average_speed"],
+                manual=activity["manual"],
+                polyline=activity_map.get("polyline")
+                or activity_map.get("summary_polyline"),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise StravaException(  # pylint: disable=raise-missing-from
+                f"Strava Client Error: Unexpected activity response: {activity}"
+            )
@@ -30,6 +30,18 @@ CHALLENGES = sa.Table(
         server_default=sa.func.now(),
         onupdate=sa.func.now(),
     ),
+    # Open challenges for a challengee (webhook path)
+    sa.Index(
+        "ix_challenges_challengee_open",
+        "challengee",
+        postgresql_where=sa.text("NOT complete"),
+    ),
+    # Completed challenges for a challengee (claim path)
+    sa.Index(
+        "ix_challenges_challengee_complete",
+        "challengee",
+        postgresql_where=sa.text("complete"),
+    ),
 )
 
 PAYMENTS = sa.Table(
@@ -41,8 +53,12 @@ PAYMENTS = sa.Table(
         sa.String,
         sa.ForeignKey("challenges.id"),
         index=True,
+        unique=True,
     ),
     sa.Column("complete", sa.Boolean, nullable=False, default=False),
+    # Claim signature, stored once the challenge is complete
+    sa.Column("hashed_message", sa.String, nullable=True),
+    sa.Column("signature", sa.String, nullable=True),
     sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
     sa.Column(
         "updated_at",
@@ -51,4 +67,11 @@ PAYMENTS = sa.Table(
         server_default=sa.func.now(),
         onupdate=sa.func.now(),
     ),
+    # Unpaid payments, covering what the claim path reads
+    sa.Index(
+        "ix_payments_challenge_id_unpaid",
+        "challenge_id",
+        postgresql_include=["id", "hashed_message", "signature"],
+        postgresql_where=sa.text("NOT complete"),
+    ),
 )
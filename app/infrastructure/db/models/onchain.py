@@ -0,0 +1,25 @@
+import sqlalchemy as sa
+
+from app.infrastructure.db.metadata import METADATA
+
+ONCHAIN_CHALLENGES = sa.Table(
+    "onchain_challenges",
+    METADATA,
+    sa.Column("challenge_id", sa.String, primary_key=True),
+    sa.Column("challenger", sa.String, nullable=False),
+    sa.Column("challengee", sa.String, nullable=False),
+    sa.Column("bounty", sa.Numeric(78, 0), nullable=False),  # uint256 wei
+    sa.Column("distance", sa.BigInteger, nullable=False),
+    sa.Column("speed", sa.BigInteger, nullable=False),
+    sa.Column("issued_at", sa.BigInteger, nullable=False),
+    sa.Column("complete", sa.Boolean, nullable=False),
+    sa.Column("block_number", sa.BigInteger, nullable=False, index=True),
+    sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    sa.Column(
+        "updated_at",
+        sa.DateTime,
+        nullable=False,
+        server_default=sa.func.now(),
+        onupdate=sa.func.now(),
+    ),
+)
@@ -15,7 +15,7 @@ STRAVA_ACCESS = sa.Table(
     sa.Column("access_token", sa.String, nullable=False),
     sa.Column("refresh_token", sa.String, nullable=False),
     sa.Column("scope", sa.ARRAY(sa.String), nullable=False),
-    sa.Column("expires_at", sa.Integer, nullable=False),
+    sa.Column("expires_at", sa.Integer, nullable=False, index=True),
     sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
     sa.Column(
         "updated_at",
@@ -17,4 +17,6 @@ USERS = sa.Table(
         server_default=sa.func.now(),
         onupdate=sa.func.now(),
     ),
+    # Address to id, without reading the table (claim path)
+    sa.Index("ix_users_address_id", "address", postgresql_include=["id"]),
 )
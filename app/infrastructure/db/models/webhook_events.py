@@ -0,0 +1,40 @@
+import sqlalchemy as sa
+
+from app.infrastructure.db.metadata import METADATA
+
+WEBHOOK_EVENTS = sa.Table(
+    "webhook_events",
+    METADATA,
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("object_type", sa.String, nullable=False),
+    sa.Column("object_id", sa.BigInteger, nullable=False),
+    sa.Column("aspect_type", sa.String, nullable=False),
+    sa.Column("owner_id", sa.Integer, nullable=False),
+    sa.Column("subscription_id", sa.Integer, nullable=False),
+    sa.Column("event_time", sa.Integer, nullable=False),
+    sa.Column("updates", sa.JSON, nullable=False),
+    sa.Column("status", sa.String, nullable=False, default="pending"),
+    sa.Column("attempts", sa.Integer, nullable=False, default=0),
+    sa.Column(
+        "available_at", sa.DateTime, nullable=False, server_default=sa.func.now()
+    ),
+    sa.Column("locked_until", sa.DateTime, nullable=True),
+    sa.Column("last_error", sa.String, nullable=True),
+    sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    sa.Column(
+        "updated_at",
+        sa.DateTime,
+        nullable=False,
+        server_default=sa.func.now(),
+        onupdate=sa.func.now(),
+    ),
+    sa.Index("ix_webhook_events_status_available_at", "status", "available_at"),
+    # Strava redelivers events, so an event's identity is what Strava sent us
+    sa.UniqueConstraint(
+        "owner_id",
+        "object_id",
+        "aspect_type",
+        "event_time",
+        name="uq_webhook_events_identity",
+    ),
+)
@@ -1,10 +1,24 @@
-from typing import List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional
 
 from databases import Database
-from sqlalchemy import and_, select
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    bindparam,
+    column,
+    exists,
+    false,
+    func,
+    select,
+    true,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
 
 from app.infrastructure.db.models.challenges import CHALLENGES, PAYMENTS
 from app.infrastructure.db.models.users import USERS
+from app.infrastructure.db.statements import STATEMENTS, StatementCache
 from app.libraries.errors import ApplicationErrors
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
 from app.usecases.schemas.challenges import (
@@ -12,38 +26,96 @@ from app.usecases.schemas.challenges import (
     CreateChallengeRepoAdapter,
     RetrieveChallengesAdapter,
 )
+from app.usecases.schemas.ethereum import SignedMessage
+
+
+class OpenChallengesIndex:
+    """In-process count of open challenges per challengee, used to answer
+    "does this user have anything open?" without a query. It is kept current by
+    OpenChallengesListener, from changes Postgres notifies about, whichever
+    process made them. It is only `ready` while the listener is connected; until
+    then, callers must ask Postgres instead."""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.ready = False
+
+    def load(self, counts: Dict[int, int]) -> None:
+        """Replaces the index with a full set of counts, and marks it ready."""
+
+        self.counts = {user_id: count for user_id, count in counts.items() if count}
+        self.ready = True
+
+    def update(self, user_ids: Iterable[int], counts: Dict[int, int]) -> None:
+        """Replaces the counts of `user_ids`; users missing from `counts` have no
+        open challenges left."""
+
+        for user_id in user_ids:
+            count = counts.get(user_id, 0)
+            if count:
+                self.counts[user_id] = count
+            else:
+                self.counts.pop(user_id, None)
+
+    def invalidate(self) -> None:
+        """Marks the index as not ready, as changes may be missed from now on."""
+
+        self.ready = False
+        self.counts = {}
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.counts
+
+
+OPEN_CHALLENGES_INDEX = OpenChallengesIndex()
+
+CHALLENGEES = USERS.alias("challengees")
+CHALLENGERS = USERS.alias("challengers")
+
+# Columns that retrieve_many() filters on by value, by query parameter name
+FILTER_COLUMNS = {
+    "challengee_user_id": CHALLENGES.c.challengee,
+    "challenger_user_id": CHALLENGES.c.challenger,
+    "challengee_address": CHALLENGEES.c.address,
+    "challenger_address": CHALLENGERS.c.address,
+}
 
 
 class ChallengesRepo(IChallengesRepo):
-    def __init__(self, db: Database):
+    def __init__(
+        self,
+        db: Database,
+        open_challenges_index: OpenChallengesIndex = OPEN_CHALLENGES_INDEX,
+        statements: StatementCache = STATEMENTS,
+    ):
         self.db = db
+        self.open_challenges_index = open_challenges_index
+        self.statements = statements
 
     async def create(
         self, new_challenge: CreateChallengeRepoAdapter
-    ) -> ChallengeJoinPaymentAndUsers:
-        """Inserts and returns new challenge (and payment) object."""
+    ) -> Optional[ChallengeJoinPaymentAndUsers]:
+        """Inserts and returns new challenge (and payment) object, or None if a
+        challenge with its id exists already. Both inserts and the joined result
+        are a single statement, so concurrent duplicates cannot both insert."""
 
-        insert_statement = CHALLENGES.insert().values(
+        query = self.statements.get(
+            "challenges.create",
+            self.__insert_joined,
             id=new_challenge.id,
             challenger=new_challenge.challenger,
             challengee=new_challenge.challengee,
             bounty=new_challenge.bounty,
             distance=new_challenge.distance,
             pace=new_challenge.pace,
-            complete=False,
         )
 
-        async with self.db.transaction():
-
-            await self.db.execute(insert_statement)
-
-            insert_statement = PAYMENTS.insert().values(
-                challenge_id=new_challenge.id, complete=False
-            )
+        result = await self.db.fetch_one(query)
 
-            await self.db.execute(insert_statement)
+        if result is None:
+            return None
 
-        return await self.retrieve(id=new_challenge.id)
+        return ChallengeJoinPaymentAndUsers(**result)
 
     async def retrieve(
         self,
@@ -51,19 +123,12 @@ class ChallengesRepo(IChallengesRepo):
     ) -> Optional[ChallengeJoinPaymentAndUsers]:
         """Retreives challenge object with payment information by id."""
 
-        j = CHALLENGES.join(PAYMENTS, CHALLENGES.c.id == PAYMENTS.c.challenge_id).join(
-            USERS, CHALLENGES.c.challengee == USERS.c.id
+        query = self.statements.get(
+            "challenges.retrieve",
+            lambda: self.__select_joined().where(CHALLENGES.c.id == bindparam("id")),
+            id=id,
         )
 
-        columns_to_select = [
-            CHALLENGES,
-            USERS.c.address.label("challengee_address"),
-            PAYMENTS.c.id.label("payment_id"),
-            PAYMENTS.c.complete.label("payment_complete"),
-        ]
-
-        query = select(columns_to_select).select_from(j).where(CHALLENGES.c.id == id)
-
         result = await self.db.fetch_one(query)
 
         return ChallengeJoinPaymentAndUsers(**result) if result else None
@@ -71,68 +136,242 @@ class ChallengesRepo(IChallengesRepo):
     async def retrieve_many(
         self,
         query_params: RetrieveChallengesAdapter,
+        limit: Optional[int] = None,
     ) -> List[ChallengeJoinPaymentAndUsers]:
-        """Retreives challenge objects by specified query parameters."""
+        """Retreives challenge objects by specified query parameters, at most
+        `limit` of them in challenge id order if a limit is given."""
+
+        # Values are bound as parameters. Flags are part of the statement's
+        # shape instead, so that partial indexes on them can be used.
+        params = {
+            name: getattr(query_params, name)
+            for name in FILTER_COLUMNS
+            if getattr(query_params, name)
+        }
+        flags = (
+            query_params.challenge_complete,
+            query_params.payment_complete,
+            query_params.payment_signed,
+        )
 
-        query_conditions = []
+        if not params and flags == (None, None, None):
+            raise Exception(
+                "Please pass a condition parameter to query by to the function, retrieve_many()"
+            )
 
-        if query_params.challengee_user_id:
-            query_conditions.append(
-                CHALLENGES.c.challengee == query_params.challengee_user_id
+        query = self.statements.get(
+            ("challenges.retrieve_many", frozenset(params), flags, limit is not None),
+            lambda: self.__select_many(
+                filters=frozenset(params),
+                challenge_complete=query_params.challenge_complete,
+                payment_complete=query_params.payment_complete,
+                payment_signed=query_params.payment_signed,
+                limited=limit is not None,
+            ),
+            **params,
+            **({} if limit is None else {"limit": limit}),
+        )
+
+        results = await self.db.fetch_all(query)
+
+        return [ChallengeJoinPaymentAndUsers(**result) for result in results]
+
+    @staticmethod
+    def __insert_joined():
+        """Inserts a challenge and its payment, unless a challenge with its id
+        exists already, and selects them joined."""
+
+        inserted_challenge = (
+            insert(CHALLENGES)
+            .values(
+                id=bindparam("id"),
+                challenger=bindparam("challenger"),
+                challengee=bindparam("challengee"),
+                bounty=bindparam("bounty"),
+                distance=bindparam("distance"),
+                pace=bindparam("pace"),
+                complete=false(),
             )
+            .on_conflict_do_nothing(index_elements=[CHALLENGES.c.id])
+            .returning(*CHALLENGES.c)
+            .cte("inserted_challenge")
+        )
 
-        if query_params.challenger_user_id:
-            query_conditions.append(
-                CHALLENGES.c.challenger == query_params.challenger_user_id
+        inserted_payment = (
+            PAYMENTS.insert()
+            .from_select(
+                [PAYMENTS.c.challenge_id, PAYMENTS.c.complete],
+                select([inserted_challenge.c.id, false()]),
             )
+            .returning(*PAYMENTS.c)
+            .cte("inserted_payment")
+        )
 
-        if query_params.challengee_address:
-            query_conditions.append(USERS.c.address == query_params.challengee_address)
+        return ChallengesRepo.__select_joined(
+            challenges=inserted_challenge, payments=inserted_payment
+        )
 
-        if query_params.challenger_address:
-            query_conditions.append(USERS.c.address == query_params.challenger_address)
+    @staticmethod
+    def __select_many(
+        filters: FrozenSet[str],
+        challenge_complete: Optional[bool],
+        payment_complete: Optional[bool],
+        payment_signed: Optional[bool],
+        limited: bool,
+    ):
+        """Selects joined challenges by the values of `filters`, bound by name,
+        and by flags."""
+
+        query_conditions = [
+            FILTER_COLUMNS[name] == bindparam(name) for name in sorted(filters)
+        ]
 
-        if query_params.challenge_complete is not None:
-            query_conditions.append(
-                CHALLENGES.c.complete == query_params.challenge_complete
-            )
+        if challenge_complete is not None:
+            query_conditions.append(CHALLENGES.c.complete == challenge_complete)
+
+        if payment_complete is not None:
+            query_conditions.append(PAYMENTS.c.complete == payment_complete)
 
-        if query_params.payment_complete is not None:
+        if payment_signed is not None:
             query_conditions.append(
-                PAYMENTS.c.complete == query_params.payment_complete
+                PAYMENTS.c.signature.isnot(None)
+                if payment_signed
+                else PAYMENTS.c.signature.is_(None)
             )
 
-        if len(query_conditions) == 0:
-            raise Exception(
-                "Please pass a condition parameter to query by to the function, retrieve_many()"
+        query = ChallengesRepo.__select_joined().where(and_(*query_conditions))
+
+        if limited:
+            query = query.order_by(CHALLENGES.c.id).limit(
+                bindparam("limit", type_=Integer)
             )
 
-        j = CHALLENGES.join(PAYMENTS, CHALLENGES.c.id == PAYMENTS.c.challenge_id).join(
-            USERS, CHALLENGES.c.challengee == USERS.c.id
+        return query
+
+    @staticmethod
+    def __select_joined(challenges=CHALLENGES, payments=PAYMENTS):
+        """Selects challenges with their payment and both participants'
+        addresses, in a single query. Challenges and payments may be CTEs
+        returning freshly written rows."""
+
+        j = (
+            challenges.join(payments, challenges.c.id == payments.c.challenge_id)
+            .join(CHALLENGEES, challenges.c.challengee == CHALLENGEES.c.id)
+            .outerjoin(CHALLENGERS, challenges.c.challenger == CHALLENGERS.c.id)
         )
 
         columns_to_select = [
-            CHALLENGES,
-            USERS.c.address.label("challengee_address"),
-            PAYMENTS.c.id.label("payment_id"),
-            PAYMENTS.c.complete.label("payment_complete"),
+            challenges,
+            CHALLENGEES.c.address.label("challengee_address"),
+            CHALLENGERS.c.address.label("challenger_address"),
+            payments.c.id.label("payment_id"),
+            payments.c.complete.label("payment_complete"),
+            payments.c.hashed_message,
+            payments.c.signature,
         ]
 
-        query = select(columns_to_select).select_from(j).where(and_(*query_conditions))
+        return select(columns_to_select).select_from(j)
 
-        results = await self.db.fetch_all(query)
+    async def complete_challenge(
+        self, id: str, signed_message: SignedMessage
+    ) -> Optional[ChallengeJoinPaymentAndUsers]:
+        """Marks an open challenge as complete and stores its claim signature on
+        its payment, in a single statement. Returns None, and writes nothing, if
+        the challenge was not open, e.g. as another call completed it first."""
+
+        query = self.statements.get(
+            "challenges.complete_challenge",
+            self.__complete_and_sign,
+            id=id,
+            hashed_message=signed_message.hashed_message,
+            signature=signed_message.signature,
+        )
 
-        return [ChallengeJoinPaymentAndUsers(**result) for result in results]
+        result = await self.db.fetch_one(query)
 
-    async def update_challenge(self, id: int) -> ChallengeJoinPaymentAndUsers:
-        """Marks a challenge as complete."""
+        if result is None:
+            return None
 
-        update_statement = (
-            CHALLENGES.update().values(complete=True).where(CHALLENGES.c.id == id)
+        return ChallengeJoinPaymentAndUsers(**result)
+
+    @staticmethod
+    def __complete_and_sign():
+        """Marks a challenge as complete unless it is already, stores the claim
+        signature on its payment if so, and selects them joined."""
+
+        completed_challenge = (
+            CHALLENGES.update()
+            .values(complete=true())
+            .where(
+                and_(
+                    CHALLENGES.c.id == bindparam("id"), CHALLENGES.c.complete == false()
+                )
+            )
+            .returning(*CHALLENGES.c)
+            .cte("completed_challenge")
         )
 
-        await self.db.execute(update_statement)
-        return await self.retrieve(id=id)
+        signed_payment = (
+            PAYMENTS.update()
+            .values(
+                hashed_message=bindparam("hashed_message"),
+                signature=bindparam("signature"),
+            )
+            .where(PAYMENTS.c.challenge_id == completed_challenge.c.id)
+            .returning(*PAYMENTS.c)
+            .cte("signed_payment")
+        )
+
+        return ChallengesRepo.__select_joined(
+            challenges=completed_challenge, payments=signed_payment
+        )
+
+    async def has_open_challenges(self, user_id: int) -> bool:
+        """Whether a user has been issued a challenge they have not completed.
+        Answered from the open challenges index while it is ready, and looked up
+        otherwise."""
+
+        if self.open_challenges_index.ready:
+            return user_id in self.open_challenges_index
+
+        query = self.statements.get(
+            "challenges.has_open_challenges",
+            lambda: select(
+                [
+                    exists()
+                    .where(
+                        and_(
+                            CHALLENGES.c.challengee == bindparam("user_id"),
+                            CHALLENGES.c.complete == false(),
+                        )
+                    )
+                    .label("has_open_challenges")
+                ]
+            ),
+            user_id=user_id,
+        )
+
+        return await self.db.fetch_val(query)
+
+    async def count_open_challenges(
+        self, user_ids: Optional[Iterable[int]] = None
+    ) -> Dict[int, int]:
+        """Counts open challenges per challengee, of `user_ids` or of everyone.
+        Challengees without open challenges are left out."""
+
+        conditions = [CHALLENGES.c.complete == false()]
+        if user_ids is not None:
+            conditions.append(CHALLENGES.c.challengee.in_(list(user_ids)))
+
+        query = (
+            select([CHALLENGES.c.challengee, func.count().label("open_challenges")])
+            .where(and_(*conditions))
+            .group_by(CHALLENGES.c.challengee)
+        )
+
+        results = await self.db.fetch_all(query)
+
+        return {result["challengee"]: result["open_challenges"] for result in results}
 
     async def update_payment(self, id: int) -> None:
         """Marks a payment as complete."""
@@ -142,3 +381,32 @@ class ChallengesRepo(IChallengesRepo):
         )
 
         await self.db.execute(update_statement)
+
+    async def save_signatures(self, signatures: Dict[str, SignedMessage]) -> None:
+        """Stores claim signatures, keyed by challenge id, on their payments in
+        a single statement."""
+
+        if not signatures:
+            return
+
+        signed = values(
+            column("challenge_id", String),
+            column("hashed_message", String),
+            column("signature", String),
+            name="signed",
+        ).data(
+            [
+                (challenge_id, signed_message.hashed_message, signed_message.signature)
+                for challenge_id, signed_message in signatures.items()
+            ]
+        )
+
+        update_statement = (
+            PAYMENTS.update()
+            .values(
+                hashed_message=signed.c.hashed_message, signature=signed.c.signature
+            )
+            .where(PAYMENTS.c.challenge_id == signed.c.challenge_id)
+        )
+
+        await self.db.execute(update_statement)
@@ -0,0 +1,59 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from databases import Database
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructure.db.models.checkpoints import CHECKPOINTS
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+
+
+class CheckpointsRepo(ICheckpointsRepo):
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def retrieve(self, name: str) -> Optional[int]:
+        """Retrieves the position a named job last checkpointed."""
+
+        query = select(CHECKPOINTS.c.position).where(CHECKPOINTS.c.name == name)
+
+        return await self.db.fetch_val(query)
+
+    async def save(self, name: str, position: int) -> None:
+        """Records the position a named job has reached."""
+
+        upsert_statement = (
+            insert(CHECKPOINTS)
+            .values(name=name, position=position)
+            .on_conflict_do_update(
+                index_elements=[CHECKPOINTS.c.name],
+                set_=dict(position=position, updated_at=func.now()),
+            )
+        )
+
+        await self.db.execute(upsert_statement)
+
+    async def delete(self, name: str) -> None:
+        """Forgets a named job's progress."""
+
+        await self.db.execute(CHECKPOINTS.delete().where(CHECKPOINTS.c.name == name))
+
+    @asynccontextmanager
+    async def lock(self, name: str) -> AsyncIterator[bool]:
+        """Holds a session-level advisory lock on a named job while the context
+        is open. Does not wait for it: the context yields whether it was taken.
+        The connection is held until then, so queries made within the context
+        run on it too."""
+
+        async with self.db.connection() as connection:
+            locked = await connection.fetch_val(
+                select([func.pg_try_advisory_lock(func.hashtext(name))])
+            )
+            try:
+                yield locked
+            finally:
+                if locked:
+                    await connection.fetch_val(
+                        select([func.pg_advisory_unlock(func.hashtext(name))])
+                    )
@@ -0,0 +1,100 @@
+from typing import List, Optional
+
+from databases import Database
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructure.db.models.onchain import ONCHAIN_CHALLENGES
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
+from app.usecases.schemas.challenges import IndexedChallenge
+
+
+class OnchainChallengesRepo(IOnchainChallengesRepo):
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def upsert_many(self, challenges: List[IndexedChallenge]) -> None:
+        """Inserts or updates indexed on-chain challenges in one statement."""
+
+        if not challenges:
+            return
+
+        insert_statement = insert(ONCHAIN_CHALLENGES).values(
+            [
+                dict(
+                    challenge_id=challenge.challengeId,
+                    challenger=challenge.challenger,
+                    challengee=challenge.challengee,
+                    bounty=challenge.bounty,
+                    distance=challenge.distance,
+                    speed=challenge.speed,
+                    issued_at=challenge.issuedAt,
+                    complete=challenge.complete,
+                    block_number=challenge.block_number,
+                )
+                for challenge in challenges
+            ]
+        )
+
+        upsert_statement = insert_statement.on_conflict_do_update(
+            index_elements=[ONCHAIN_CHALLENGES.c.challenge_id],
+            set_=dict(
+                challenger=insert_statement.excluded.challenger,
+                challengee=insert_statement.excluded.challengee,
+                bounty=insert_statement.excluded.bounty,
+                distance=insert_statement.excluded.distance,
+                speed=insert_statement.excluded.speed,
+                issued_at=insert_statement.excluded.issued_at,
+                complete=insert_statement.excluded.complete,
+                block_number=insert_statement.excluded.block_number,
+                updated_at=func.now(),
+            ),
+        )
+
+        await self.db.execute(upsert_statement)
+
+    async def delete_many(self, challenge_ids: List[str]) -> None:
+        """Deletes indexed on-chain challenges."""
+
+        if not challenge_ids:
+            return
+
+        await self.db.execute(
+            ONCHAIN_CHALLENGES.delete().where(
+                ONCHAIN_CHALLENGES.c.challenge_id.in_(challenge_ids)
+            )
+        )
+
+    async def retrieve(self, challenge_id: str) -> Optional[IndexedChallenge]:
+        """Retrieves an indexed on-chain challenge."""
+
+        query = self.__select().where(ONCHAIN_CHALLENGES.c.challenge_id == challenge_id)
+
+        result = await self.db.fetch_one(query)
+
+        return IndexedChallenge(**result) if result else None
+
+    async def retrieve_since(self, block_number: int) -> List[IndexedChallenge]:
+        """Retrieves challenges whose last event is in a later block."""
+
+        query = self.__select().where(ONCHAIN_CHALLENGES.c.block_number > block_number)
+
+        results = await self.db.fetch_all(query)
+
+        return [IndexedChallenge(**result) for result in results]
+
+    @staticmethod
+    def __select():
+        return select(
+            [
+                ONCHAIN_CHALLENGES.c.challenge_id.label("challengeId"),
+                ONCHAIN_CHALLENGES.c.challenger,
+                ONCHAIN_CHALLENGES.c.challengee,
+                ONCHAIN_CHALLENGES.c.bounty,
+                ONCHAIN_CHALLENGES.c.distance,
+                ONCHAIN_CHALLENGES.c.speed,
+                ONCHAIN_CHALLENGES.c.issued_at.label("issuedAt"),
+                ONCHAIN_CHALLENGES.c.complete,
+                ONCHAIN_CHALLENGES.c.block_number,
+            ]
+        )
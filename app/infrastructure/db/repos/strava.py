@@ -1,10 +1,12 @@
-from typing import Optional
+from typing import List, Optional
 
 from databases import Database
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam, exists, func
 from sqlalchemy.dialects.postgresql import insert
 
+from app.infrastructure.db.models.challenges import CHALLENGES
 from app.infrastructure.db.models.strava import STRAVA_ACCESS
+from app.infrastructure.db.statements import STATEMENTS, StatementCache
 from app.usecases.interfaces.repos.strava import IStravaRepo
 from app.usecases.schemas.strava import (
     CreateStravaAccessAdapter,
@@ -14,8 +16,9 @@ from app.usecases.schemas.strava import (
 
 
 class StravaRepo(IStravaRepo):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, statements: StatementCache = STATEMENTS):
         self.db = db
+        self.statements = statements
 
     async def upsert(self, new_access: CreateStravaAccessAdapter) -> StravaAccessInDb:
         """Inserts or updates a Strava access object."""
@@ -39,36 +42,93 @@ class StravaRepo(IStravaRepo):
                 scope=new_access.scope,
                 expires_at=new_access.expires_at,
             ),
-        )
+        ).returning(*STRAVA_ACCESS.c)
 
-        await self.db.execute(upsert_statment)
+        result = await self.db.fetch_one(upsert_statment)
 
-        return await self.retrieve(athlete_id=new_access.athlete_id)
+        return StravaAccessInDb(**result)
 
     async def retrieve(
         self, athlete_id: Optional[int] = None, user_id: Optional[int] = None
     ) -> Optional[StravaAccessInDb]:
         """Retreives and returns an access object by id."""
 
-        query_conditions = []
-
-        if athlete_id:
-            query_conditions.append(STRAVA_ACCESS.c.athlete_id == athlete_id)
+        params = {
+            name: value
+            for name, value in dict(athlete_id=athlete_id, user_id=user_id).items()
+            if value
+        }
 
-        if user_id:
-            query_conditions.append(STRAVA_ACCESS.c.user_id == user_id)
-
-        if len(query_conditions) == 0:
+        if len(params) == 0:
             raise Exception(
                 "Please pass a condition parameter to query by to the function, retrieve()"
             )
 
-        query = STRAVA_ACCESS.select().where(and_(*query_conditions))
+        query = self.statements.get(
+            ("strava.retrieve", frozenset(params)),
+            lambda: STRAVA_ACCESS.select().where(
+                and_(
+                    *(
+                        STRAVA_ACCESS.c[name] == bindparam(name)
+                        for name in sorted(params)
+                    )
+                )
+            ),
+            **params,
+        )
 
         result = await self.db.fetch_one(query)
 
         return StravaAccessInDb(**result) if result else None
 
+    async def retrieve_expiring(self, expires_before: float) -> List[StravaAccessInDb]:
+        """Retreives access objects, that have not been revoked, which expire
+        before the given time (seconds since epoch)."""
+
+        query = (
+            STRAVA_ACCESS.select()
+            .where(
+                and_(
+                    STRAVA_ACCESS.c.expires_at < int(expires_before),
+                    func.cardinality(STRAVA_ACCESS.c.scope) > 0,
+                )
+            )
+            .order_by(STRAVA_ACCESS.c.expires_at)
+        )
+
+        results = await self.db.fetch_all(query)
+
+        return [StravaAccessInDb(**result) for result in results]
+
+    async def retrieve_with_open_challenges(
+        self, after_athlete_id: int, limit: int
+    ) -> List[StravaAccessInDb]:
+        """Retreives access objects, that have not been revoked, of athletes who
+        have open challenges. Pages by athlete id: pass the last id of the
+        previous page as `after_athlete_id`."""
+
+        query = (
+            STRAVA_ACCESS.select()
+            .where(
+                and_(
+                    STRAVA_ACCESS.c.athlete_id > after_athlete_id,
+                    func.cardinality(STRAVA_ACCESS.c.scope) > 0,
+                    exists().where(
+                        and_(
+                            CHALLENGES.c.challengee == STRAVA_ACCESS.c.user_id,
+                            CHALLENGES.c.complete == False,
+                        )
+                    ),
+                )
+            )
+            .order_by(STRAVA_ACCESS.c.athlete_id)
+            .limit(limit)
+        )
+
+        results = await self.db.fetch_all(query)
+
+        return [StravaAccessInDb(**result) for result in results]
+
     async def update(
         self, athlete_id: int, updated_access: StravaAccessUpdateAdapter
     ) -> StravaAccessInDb:
@@ -82,10 +142,12 @@ class StravaRepo(IStravaRepo):
             if value is not None:
                 updated_access_dict[key] = value
 
-        update_statement = query_prefix.values(updated_access_dict).where(
-            STRAVA_ACCESS.c.athlete_id == athlete_id
+        update_statement = (
+            query_prefix.values(updated_access_dict)
+            .where(STRAVA_ACCESS.c.athlete_id == athlete_id)
+            .returning(*STRAVA_ACCESS.c)
         )
 
-        await self.db.execute(update_statement)
+        result = await self.db.fetch_one(update_statement)
 
-        return await self.retrieve(athlete_id=athlete_id)
+        return StravaAccessInDb(**result) if result else None
@@ -1,27 +1,64 @@
-from typing import Optional
+from typing import List, Optional
 
 from databases import Database
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam
+from sqlalchemy.dialects.postgresql import insert
 
 from app.infrastructure.db.models.users import USERS
+from app.infrastructure.db.statements import STATEMENTS, StatementCache
 from app.usecases.interfaces.repos.users import IUsersRepo
 from app.usecases.schemas.users import UserBase, UserInDb
 
 
 class UsersRepo(IUsersRepo):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, statements: StatementCache = STATEMENTS):
         self.db = db
+        self.statements = statements
 
     async def create(self, new_user: UserBase) -> UserInDb:
         """Inserts and returns new user object."""
 
-        insert_statement = USERS.insert().values(
-            email=new_user.email, address=new_user.address, name=new_user.name
+        insert_statement = (
+            USERS.insert()
+            .values(email=new_user.email, address=new_user.address, name=new_user.name)
+            .returning(*USERS.c)
         )
 
-        id = await self.db.execute(insert_statement)
+        result = await self.db.fetch_one(insert_statement)
 
-        return await self.retrieve(id=id)
+        return UserInDb(**result)
+
+    async def upsert_many(self, new_users: List[UserBase]) -> List[UserInDb]:
+        """Inserts users that do not exist yet, by email, and returns every user
+        in the order given, in a single statement. Existing users are returned
+        as they are."""
+
+        unique_users = {}
+        for new_user in new_users:
+            unique_users.setdefault(new_user.email, new_user)
+
+        # Rows are locked in the order they are given, so they are sorted by
+        # email, or concurrent upserts of the same users in another order (A
+        # issuing B a challenge while B issues A one) could deadlock.
+        insert_statement = insert(USERS).values(
+            [
+                dict(email=new_user.email, address=new_user.address, name=new_user.name)
+                for _, new_user in sorted(unique_users.items())
+            ]
+        )
+
+        # A no-op update rather than DO NOTHING, so that existing rows are
+        # returned too.
+        upsert_statement = insert_statement.on_conflict_do_update(
+            index_elements=[USERS.c.email],
+            set_=dict(email=insert_statement.excluded.email),
+        ).returning(*USERS.c)
+
+        results = await self.db.fetch_all(upsert_statement)
+
+        users = {result["email"]: UserInDb(**result) for result in results}
+
+        return [users[new_user.email] for new_user in new_users]
 
     async def retrieve(
         self,
@@ -31,23 +68,24 @@ class UsersRepo(IUsersRepo):
     ) -> Optional[UserInDb]:
         """Retreives and returns a user object."""
 
-        query_conditions = []
-
-        if id:
-            query_conditions.append(USERS.c.id == id)
-
-        if email:
-            query_conditions.append(USERS.c.email == email)
+        params = {
+            name: value
+            for name, value in dict(id=id, email=email, address=address).items()
+            if value
+        }
 
-        if address:
-            query_conditions.append(USERS.c.address == address)
-
-        if len(query_conditions) == 0:
+        if len(params) == 0:
             raise Exception(
                 "Please pass a condition parameter to query by to the function, retrieve()"
             )
 
-        query = USERS.select().where(and_(*query_conditions))
+        query = self.statements.get(
+            ("users.retrieve", frozenset(params)),
+            lambda: USERS.select().where(
+                and_(*(USERS.c[name] == bindparam(name) for name in sorted(params)))
+            ),
+            **params,
+        )
 
         result = await self.db.fetch_one(query)
         return UserInDb(**result) if result else None
@@ -56,9 +94,12 @@ class UsersRepo(IUsersRepo):
         """Retroactively updates user object to include address."""
 
         update_statement = (
-            USERS.update().values(address=address).where(USERS.c.id == id)
+            USERS.update()
+            .values(address=address)
+            .where(USERS.c.id == id)
+            .returning(*USERS.c)
         )
 
-        await self.db.execute(update_statement)
+        result = await self.db.fetch_one(update_statement)
 
-        return await self.retrieve(id=id)
+        return UserInDb(**result) if result else None
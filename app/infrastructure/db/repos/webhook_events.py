@@ -0,0 +1,165 @@
+from datetime import timedelta
+from typing import List, Optional
+
+from databases import Database
+from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructure.db.models.webhook_events import WEBHOOK_EVENTS
+from app.usecases.interfaces.repos.webhook_events import IWebhookEventsRepo
+from app.usecases.schemas.strava import (
+    WebhookEvent,
+    WebhookEventInDb,
+    WebhookEventStatus,
+)
+
+
+class WebhookEventsRepo(IWebhookEventsRepo):
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def enqueue(self, event: WebhookEvent) -> Optional[WebhookEventInDb]:
+        """Inserts a webhook event into the queue. Returns None if the event
+        was already received."""
+
+        insert_statement = (
+            insert(WEBHOOK_EVENTS)
+            .values(
+                object_type=event.object_type,
+                object_id=event.object_id,
+                aspect_type=event.aspect_type,
+                owner_id=event.owner_id,
+                subscription_id=event.subscription_id,
+                event_time=event.event_time,
+                updates=dict(event.updates),
+                status=WebhookEventStatus.PENDING,
+                attempts=0,
+            )
+            .on_conflict_do_nothing(constraint="uq_webhook_events_identity")
+            .returning(*WEBHOOK_EVENTS.c)
+        )
+
+        result = await self.db.fetch_one(insert_statement)
+
+        return WebhookEventInDb(**result) if result else None
+
+    async def claim(
+        self, limit: int, visibility_timeout: int
+    ) -> List[WebhookEventInDb]:
+        """Claims up to `limit` queued events. Claimed events stay invisible to
+        other workers for `visibility_timeout` seconds, after which they are
+        handed out again if they were never completed."""
+
+        claimable_events = (
+            select(WEBHOOK_EVENTS.c.id)
+            .where(
+                or_(
+                    and_(
+                        WEBHOOK_EVENTS.c.status == WebhookEventStatus.PENDING,
+                        WEBHOOK_EVENTS.c.available_at <= func.now(),
+                    ),
+                    and_(
+                        WEBHOOK_EVENTS.c.status == WebhookEventStatus.PROCESSING,
+                        WEBHOOK_EVENTS.c.locked_until <= func.now(),
+                    ),
+                )
+            )
+            .order_by(WEBHOOK_EVENTS.c.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        update_statement = (
+            WEBHOOK_EVENTS.update()
+            .values(
+                status=WebhookEventStatus.PROCESSING,
+                attempts=WEBHOOK_EVENTS.c.attempts + 1,
+                locked_until=func.now() + timedelta(seconds=visibility_timeout),
+            )
+            .where(WEBHOOK_EVENTS.c.id.in_(claimable_events))
+            .returning(*WEBHOOK_EVENTS.c)
+        )
+
+        results = await self.db.fetch_all(update_statement)
+
+        return [WebhookEventInDb(**result) for result in results]
+
+    async def superseded(self, event: WebhookEventInDb) -> bool:
+        """Whether a newer event of the same aspect type, or a deletion, was
+        already processed for the same object."""
+
+        query = select(
+            exists().where(
+                and_(
+                    WEBHOOK_EVENTS.c.owner_id == event.owner_id,
+                    WEBHOOK_EVENTS.c.object_id == event.object_id,
+                    WEBHOOK_EVENTS.c.object_type == event.object_type,
+                    or_(
+                        WEBHOOK_EVENTS.c.aspect_type == event.aspect_type,
+                        WEBHOOK_EVENTS.c.aspect_type == "delete",
+                    ),
+                    WEBHOOK_EVENTS.c.event_time > event.event_time,
+                    WEBHOOK_EVENTS.c.status == WebhookEventStatus.COMPLETE,
+                )
+            )
+        )
+
+        return await self.db.fetch_val(query)
+
+    async def complete(self, id: int) -> None:
+        """Marks an event as processed."""
+
+        update_statement = (
+            WEBHOOK_EVENTS.update()
+            .values(status=WebhookEventStatus.COMPLETE, locked_until=None)
+            .where(WEBHOOK_EVENTS.c.id == id)
+        )
+
+        await self.db.execute(update_statement)
+
+    async def retry(self, id: int, error: str, delay: int) -> None:
+        """Returns an event to the queue, to be claimed again in `delay` seconds."""
+
+        update_statement = (
+            WEBHOOK_EVENTS.update()
+            .values(
+                status=WebhookEventStatus.PENDING,
+                available_at=func.now() + timedelta(seconds=delay),
+                locked_until=None,
+                last_error=error,
+            )
+            .where(WEBHOOK_EVENTS.c.id == id)
+        )
+
+        await self.db.execute(update_statement)
+
+    async def defer(self, id: int, error: str, delay: int) -> None:
+        """Returns an event to the queue without counting the attempt against it,
+        to be claimed again in `delay` seconds."""
+
+        update_statement = (
+            WEBHOOK_EVENTS.update()
+            .values(
+                status=WebhookEventStatus.PENDING,
+                attempts=WEBHOOK_EVENTS.c.attempts - 1,
+                available_at=func.now() + timedelta(seconds=delay),
+                locked_until=None,
+                last_error=error,
+            )
+            .where(WEBHOOK_EVENTS.c.id == id)
+        )
+
+        await self.db.execute(update_statement)
+
+    async def fail(self, id: int, error: str) -> None:
+        """Marks an event as permanently failed."""
+
+        update_statement = (
+            WEBHOOK_EVENTS.update()
+            .values(
+                status=WebhookEventStatus.FAILED, locked_until=None, last_error=error
+            )
+            .where(WEBHOOK_EVENTS.c.id == id)
+        )
+
+        await self.db.execute(update_statement)
@@ -0,0 +1,66 @@
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import bindparam, column, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.selectable import TextualSelect
+
+from app.libraries.cache import LRUCache
+from app.settings import settings
+
+DIALECT = postgresql.dialect(paramstyle="named")
+
+
+class StatementCache:
+    """Compiled queries, keyed by query shape, e.g. by the set of filter
+    conditions used. A shape is built with bindparam() placeholders for its
+    values and compiled once, into SQL text with typed parameters and result
+    columns, so executing it again only binds the values.
+
+    The SQL text of a shape never changes, so asyncpg's per-connection cache of
+    server-side prepared statements is hit as well. Values that partial indexes
+    depend on, such as `complete` flags, belong in the shape rather than in
+    parameters, or generic plans could not use those indexes."""
+
+    def __init__(self, cache: LRUCache):
+        self.cache = cache
+
+    def get(
+        self, key: Hashable, build: Callable[[], Select], **params: Any
+    ) -> TextualSelect:
+        """Returns the statement for a shape with `params` bound, building and
+        compiling the shape on a miss."""
+
+        statement = self.cache.get(key)
+
+        if statement is None:
+            statement = self.compile(query=build())
+            self.cache.set(key, statement)
+
+        return statement.bindparams(**params)
+
+    @staticmethod
+    def compile(query: Select) -> TextualSelect:
+        """Compiles a query into SQL text, keeping its parameter and result
+        column types."""
+
+        compiled = query.compile(dialect=DIALECT)
+
+        return (
+            text(compiled.string)
+            .bindparams(
+                *(
+                    bindparam(name, type_=bind.type)
+                    for name, bind in compiled.binds.items()
+                )
+            )
+            .columns(
+                *(
+                    column(selected_column.name, selected_column.type)
+                    for selected_column in query.selected_columns
+                )
+            )
+        )
+
+
+STATEMENTS = StatementCache(cache=LRUCache(maxsize=settings.statement_cache_size))
@@ -0,0 +1,14 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+
+from app.dependencies import get_metrics
+from app.libraries.metrics import MetricsRegistry
+
+stats_router = APIRouter(tags=["Metrics"])
+
+
+@stats_router.get("", response_model=Dict[str, float])
+async def stats(metrics: MetricsRegistry = Depends(get_metrics)):
+
+    return metrics.snapshot()
@@ -3,20 +3,19 @@ from fastapi.responses import HTMLResponse
 from pydantic import conint, constr
 
 from app.dependencies import (
-    get_challenge_validation_service,
     get_strava_client,
     get_strava_repo,
     get_users_repo,
+    get_webhook_manager_service,
 )
 from app.libraries.errors import ApplicationErrors
 from app.settings import settings
 from app.usecases.interfaces.clients.strava import IStravaClient
 from app.usecases.interfaces.repos.strava import IStravaRepo
 from app.usecases.interfaces.repos.users import IUsersRepo
-from app.usecases.interfaces.services.challange_validation import IChallengeValidation
+from app.usecases.interfaces.services.webhook_manager import IWebhookManager
 from app.usecases.schemas.strava import (
     CreateStravaAccessAdapter,
-    StravaAccessUpdateAdapter,
     WebhookEvent,
     WebhookVerificationResponse,
 )
@@ -31,22 +30,12 @@ strava_router = APIRouter(tags=["Strava"])
 )
 async def receive_webhook(
     body: WebhookEvent = Body(...),
-    challenge_validation_service: IChallengeValidation = Depends(
-        get_challenge_validation_service
-    ),
-    strava_repo: IStravaRepo = Depends(get_strava_repo),
+    webhook_manager_service: IWebhookManager = Depends(get_webhook_manager_service),
 ) -> None:
-    """Receives Strava webhook event."""
-
-    if body.aspect_type == "create" and body.object_type == "activity":
-        # The event is a newly submitted activity, so validate it against a challenge
-        await challenge_validation_service.validate(event=body)
+    """Receives Strava webhook event. The event is queued and acknowledged
+    immediately; webhook workers act upon it asynchronously."""
 
-    elif body.aspect_type == "update" and body.updates.get("authorized") == "false":
-        # The user revoked access to this application
-        await strava_repo.update(
-            athlete_id=body.owner_id, updated_access=StravaAccessUpdateAdapter(scope=[])
-        )
+    await webhook_manager_service.enqueue(event=body)
 
 
 @strava_router.get(
@@ -3,9 +3,16 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.dependencies import get_client_session, get_event_loop
+from app.dependencies import (
+    get_client_session,
+    get_event_loop,
+    get_open_challenges_listener,
+    get_signature_executor,
+    get_token_refresher,
+    get_webhook_worker_pool,
+)
 from app.infrastructure.db.core import get_or_create_database
-from app.infrastructure.web.endpoints.metrics import health
+from app.infrastructure.web.endpoints.metrics import health, stats
 from app.infrastructure.web.endpoints.public import challenges
 from app.infrastructure.web.endpoints.vendors import strava
 from app.settings import settings
@@ -18,6 +25,7 @@ def setup_app():
         openapi_url=settings.openapi_url,
     )
     app.include_router(health.health_router, prefix="/metrics/health")
+    app.include_router(stats.stats_router, prefix="/metrics/stats")
     app.include_router(strava.strava_router, prefix="/vendors/strava")
     app.include_router(challenges.challenges_router, prefix="/public/challenges")
 
@@ -42,10 +50,25 @@ async def startup_event():
     await get_event_loop()
     await get_client_session()
     await get_or_create_database()
+    open_challenges_listener = await get_open_challenges_listener()
+    await open_challenges_listener.start()
+    webhook_worker_pool = await get_webhook_worker_pool()
+    await webhook_worker_pool.start()
+    token_refresher = await get_token_refresher()
+    await token_refresher.start()
 
 
 @fastapi_app.on_event("shutdown")
 async def shutdown_event():
+    # Stop background workers before their dependencies are torn down
+    webhook_worker_pool = await get_webhook_worker_pool()
+    await webhook_worker_pool.stop()
+    token_refresher = await get_token_refresher()
+    await token_refresher.stop()
+    open_challenges_listener = await get_open_challenges_listener()
+    await open_challenges_listener.stop()
+    signature_executor = await get_signature_executor()
+    signature_executor.shutdown()
     # Close client session
     client_session = await get_client_session()
     await client_session.close()
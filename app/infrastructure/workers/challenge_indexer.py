@@ -0,0 +1,44 @@
+import asyncio
+from typing import Optional
+
+from app.dependencies import logger
+from app.usecases.interfaces.services.challenge_indexer import IChallengeIndexer
+
+
+class ChallengeIndexerWorker:
+    """Keeps the on-chain challenge mirror up to date: catches up in bulk on
+    the first run, then follows new blocks every `interval` seconds. It runs in
+    its own process, see app.infrastructure.cli.index_challenges."""
+
+    def __init__(self, challenge_indexer: IChallengeIndexer, interval: float):
+        self.challenge_indexer = challenge_indexer
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Starts the indexing loop."""
+
+        self.task = asyncio.create_task(self.run(), name="challenge-indexer")
+
+    async def stop(self) -> None:
+        """Cancels the indexing loop."""
+
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def run(self) -> None:
+        """Indexes every `interval` seconds, until cancelled."""
+
+        while True:
+            try:
+                indexed = await self.challenge_indexer.index()
+                if indexed:
+                    logger.info("[ChallengeIndexer]: Indexed %s challenges.", indexed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception(error)
+
+            await asyncio.sleep(self.interval)
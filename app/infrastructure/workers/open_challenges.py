@@ -0,0 +1,101 @@
+import asyncio
+from typing import Optional
+
+import asyncpg
+
+from app.dependencies import logger
+from app.infrastructure.db.repos.challenges import OpenChallengesIndex
+from app.usecases.interfaces.repos.challenges import IChallengesRepo
+
+CHANNEL = "open_challenges"
+
+
+class OpenChallengesListener:
+    """Keeps the process's open challenges index current. Listens on a
+    dedicated connection for the challengees Postgres notifies as changed, see
+    migration 0009, and recounts their open challenges. The index is loaded in
+    full once listening, and marked not ready whenever the connection is lost,
+    until it is back."""
+
+    def __init__(
+        self,
+        db_url: str,
+        challenges_repo: IChallengesRepo,
+        open_challenges_index: OpenChallengesIndex,
+        retry_interval: float,
+    ):
+        self.db_url = db_url
+        self.challenges_repo = challenges_repo
+        self.open_challenges_index = open_challenges_index
+        self.retry_interval = retry_interval
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Starts listening."""
+
+        self.task = asyncio.create_task(self.run(), name="open-challenges-listener")
+
+    async def stop(self) -> None:
+        """Stops listening."""
+
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def run(self) -> None:
+        """Listens until cancelled, reconnecting every `retry_interval` seconds
+        after the connection is lost."""
+
+        while True:
+            try:
+                await self.__listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception(error)
+
+            await asyncio.sleep(self.retry_interval)
+
+    async def __listen(self) -> None:
+        connection = await asyncpg.connect(self.db_url)
+        # Payloads are challengee ids; None once the connection is lost
+        changes: asyncio.Queue = asyncio.Queue()
+
+        try:
+            connection.add_termination_listener(lambda _: changes.put_nowait(None))
+            await connection.add_listener(
+                CHANNEL, lambda *args: changes.put_nowait(args[-1])
+            )
+
+            # 1. Load once listening, so that no change is missed in between.
+            self.open_challenges_index.load(
+                counts=await self.challenges_repo.count_open_challenges()
+            )
+            logger.info("[OpenChallengesListener]: Loaded open challenges.")
+
+            while True:
+                # 2. Recount every challengee notified since the last recount.
+                payloads = {await changes.get()}
+                while not changes.empty():
+                    payloads.add(changes.get_nowait())
+
+                if None in payloads:
+                    raise ConnectionError("Open challenges listener disconnected.")
+
+                if "" in payloads:
+                    self.open_challenges_index.load(
+                        counts=await self.challenges_repo.count_open_challenges()
+                    )
+                    continue
+
+                user_ids = [int(payload) for payload in payloads]
+                self.open_challenges_index.update(
+                    user_ids=user_ids,
+                    counts=await self.challenges_repo.count_open_challenges(
+                        user_ids=user_ids
+                    ),
+                )
+        finally:
+            self.open_challenges_index.invalidate()
+            await connection.close()
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Optional
+
+from app.dependencies import logger
+from app.usecases.interfaces.services.token_manager import ITokenManager
+
+
+class TokenRefresher:
+    """Periodically refreshes Strava access tokens shortly before they expire,
+    so that webhook processing rarely pays for a refresh."""
+
+    def __init__(self, token_manager: ITokenManager, interval: float):
+        self.token_manager = token_manager
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Starts the refresh loop."""
+
+        self.task = asyncio.create_task(self.__run(), name="strava-token-refresher")
+
+    async def stop(self) -> None:
+        """Cancels the refresh loop."""
+
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def __run(self) -> None:
+
+        while True:
+            try:
+                refreshed = await self.token_manager.refresh_expiring()
+                if refreshed:
+                    logger.info(
+                        "[TokenRefresher]: Refreshed %s access tokens.", refreshed
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception(error)
+
+            await asyncio.sleep(self.interval)
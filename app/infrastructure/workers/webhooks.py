@@ -0,0 +1,57 @@
+import asyncio
+from typing import List, Optional
+
+from app.dependencies import logger
+from app.usecases.interfaces.services.webhook_manager import IWebhookManager
+
+
+class WebhookWorkerPool:
+    """Runs a fixed number of async workers that drain the webhook event queue."""
+
+    def __init__(
+        self,
+        webhook_manager: IWebhookManager,
+        concurrency: int,
+        batch_size: int,
+        poll_interval: float,
+    ):
+        self.webhook_manager = webhook_manager
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Spawns the workers."""
+
+        for number in range(self.concurrency):
+            self.workers.append(
+                asyncio.create_task(self.__work(), name=f"webhook-worker-{number}")
+            )
+        logger.info("[WebhookWorkerPool]: Started %s workers.", self.concurrency)
+
+    async def stop(self) -> None:
+        """Cancels the workers. Events they held become visible again once
+        their visibility timeout lapses."""
+
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def __work(self) -> None:
+        """Claims batches until the queue is empty, then polls."""
+
+        while True:
+            claimed: Optional[int] = None
+            try:
+                claimed = await self.webhook_manager.process_batch(
+                    batch_size=self.batch_size
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception(error)
+
+            if not claimed:
+                await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,8 @@
+import random
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Exponential backoff with full jitter: a random delay of up to
+    `base * 2 ** (attempt - 1)` seconds, capped at `maximum`."""
+
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
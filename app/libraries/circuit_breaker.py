@@ -0,0 +1,71 @@
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Deque
+
+
+class CircuitState(IntEnum):
+    """Circuit breaker states, exported as gauge values."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:
+    """Tracks the outcome of the last `window` calls to a dependency. Once at
+    least `minimum_calls` were made and the share of failures reaches
+    `error_rate`, the circuit opens and calls should fail fast. After
+    `reset_timeout` seconds it half opens to let calls probe the dependency:
+    the next success closes the circuit, the next failure opens it again."""
+
+    def __init__(
+        self, error_rate: float, window: int, minimum_calls: int, reset_timeout: float
+    ):
+        self.error_rate = error_rate
+        self.minimum_calls = minimum_calls
+        self.reset_timeout = reset_timeout
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.opened = 0
+        self.rejected = 0
+        self.__state = CircuitState.CLOSED
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self.__state == CircuitState.OPEN
+            and time.monotonic() - self.opened_at >= self.reset_timeout
+        ):
+            self.__state = CircuitState.HALF_OPEN
+        return self.__state
+
+    def allow(self) -> bool:
+        """Whether a call may be made. Counts the calls that were refused."""
+
+        if self.state == CircuitState.OPEN:
+            self.rejected += 1
+            return False
+        return True
+
+    def record_success(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self.outcomes.clear()
+            self.__state = CircuitState.CLOSED
+        self.outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+
+        if self.state == CircuitState.HALF_OPEN or (
+            len(self.outcomes) >= self.minimum_calls
+            and self.outcomes.count(False) / len(self.outcomes) >= self.error_rate
+        ):
+            self.__open()
+
+    def __open(self) -> None:
+        if self.__state != CircuitState.OPEN:
+            self.opened += 1
+        self.__state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
@@ -0,0 +1,10 @@
+import asyncio
+
+
+class ConcurrencyLimits:
+    """Semaphores that bound how many calls may be in flight to each
+    downstream dependency at once."""
+
+    def __init__(self, strava: int, email: int):
+        self.strava = asyncio.Semaphore(strava)
+        self.email = asyncio.Semaphore(email)
@@ -0,0 +1,97 @@
+import ssl
+import time
+from types import SimpleNamespace
+
+import aiohttp
+
+from app.libraries.metrics import MetricsRegistry
+
+
+class PoolInstrumentation:
+    """Exports connection pool usage under `http.<name>`: requests in flight,
+    requests waiting for a free connection and how long they waited, and how
+    often a kept-alive connection was reused instead of opening a new one."""
+
+    def __init__(self, name: str, limit: int, metrics: MetricsRegistry):
+        self.prefix = f"http.{name}"
+        self.metrics = metrics
+        self.in_flight = 0
+        self.waiting = 0
+        self.created = 0
+        self.reused = 0
+
+        metrics.register(f"{self.prefix}.limit", lambda: limit)
+        metrics.register(f"{self.prefix}.in_flight", lambda: self.in_flight)
+        metrics.register(f"{self.prefix}.waiting", lambda: self.waiting)
+        metrics.register(f"{self.prefix}.saturation", lambda: self.in_flight / limit)
+        metrics.register(f"{self.prefix}.connections.created", lambda: self.created)
+        metrics.register(f"{self.prefix}.connections.reused", lambda: self.reused)
+        metrics.register(f"{self.prefix}.connections.reuse_ratio", self.reuse_ratio)
+
+    def reuse_ratio(self) -> float:
+        connections = self.created + self.reused
+        return self.reused / connections if connections else 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self.__on_request_start)
+        trace_config.on_request_end.append(self.__on_request_end)
+        trace_config.on_request_exception.append(self.__on_request_end)
+        trace_config.on_connection_queued_start.append(self.__on_queued_start)
+        trace_config.on_connection_queued_end.append(self.__on_queued_end)
+        trace_config.on_connection_create_end.append(self.__on_connection_created)
+        trace_config.on_connection_reuseconn.append(self.__on_connection_reused)
+        return trace_config
+
+    async def __on_request_start(self, session, context: SimpleNamespace, params):
+        self.in_flight += 1
+
+    async def __on_request_end(self, session, context: SimpleNamespace, params):
+        self.in_flight -= 1
+
+    async def __on_queued_start(self, session, context: SimpleNamespace, params):
+        self.waiting += 1
+        context.queued_at = time.perf_counter()
+
+    async def __on_queued_end(self, session, context: SimpleNamespace, params):
+        self.waiting -= 1
+        self.metrics.observe(
+            f"{self.prefix}.wait_seconds", time.perf_counter() - context.queued_at
+        )
+
+    async def __on_connection_created(self, session, context, params):
+        self.created += 1
+
+    async def __on_connection_reused(self, session, context, params):
+        self.reused += 1
+
+
+def create_client_session(
+    name: str,
+    limit: int,
+    limit_per_host: int,
+    keepalive_timeout: float,
+    dns_cache_ttl: int,
+    timeout: float,
+    ssl_context: ssl.SSLContext,
+    metrics: MetricsRegistry,
+) -> aiohttp.ClientSession:
+    """Creates a client session whose connection pool is bounded in total and
+    per host, keeps idle connections alive for reuse, caches DNS lookups and
+    verifies certificates with a single, shared SSL context."""
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl,
+        ssl=ssl_context,
+    )
+
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        trace_configs=[
+            PoolInstrumentation(name=name, limit=limit, metrics=metrics).trace_config()
+        ],
+    )
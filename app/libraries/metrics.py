@@ -0,0 +1,62 @@
+from collections import defaultdict
+from typing import Callable, Dict
+
+from app.libraries.cache import LRUCache
+from app.libraries.circuit_breaker import CircuitBreaker
+
+
+class MetricsRegistry:
+    """In-process counters and gauges, keyed by dotted metric name. Counters
+    only ever grow; gauges hold the last value that was set, or are read from a
+    registered callback whenever a snapshot is taken."""
+
+    def __init__(self):
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.gauges: Dict[str, float] = {}
+        self.callbacks: Dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Adds `value` to a counter."""
+
+        self.counters[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        """Sets a gauge."""
+
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Records a sample, such as a latency, as `name.count`, `name.sum` and
+        `name.max`."""
+
+        self.counters[f"{name}.count"] += 1
+        self.counters[f"{name}.sum"] += value
+        self.gauges[f"{name}.max"] = max(self.gauges.get(f"{name}.max", 0), value)
+
+    def register(self, name: str, callback: Callable[[], float]) -> None:
+        """Reads a gauge from `callback` on every snapshot."""
+
+        self.callbacks[name] = callback
+
+    def register_cache(self, name: str, cache: LRUCache) -> None:
+        """Exports an LRUCache's size and hit, miss and eviction counts."""
+
+        self.register(f"cache.{name}.size", lambda: len(cache))
+        self.register(f"cache.{name}.hits", lambda: cache.hits)
+        self.register(f"cache.{name}.misses", lambda: cache.misses)
+        self.register(f"cache.{name}.evictions", lambda: cache.evictions)
+
+    def register_circuit_breaker(self, name: str, breaker: CircuitBreaker) -> None:
+        """Exports a circuit breaker's state (0 closed, 1 half open, 2 open) and
+        how often it opened and refused calls."""
+
+        self.register(f"circuit_breaker.{name}.state", lambda: breaker.state)
+        self.register(f"circuit_breaker.{name}.opened", lambda: breaker.opened)
+        self.register(f"circuit_breaker.{name}.rejected", lambda: breaker.rejected)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns every counter and gauge, sorted by name."""
+
+        computed = {name: callback() for name, callback in self.callbacks.items()}
+
+        return dict(sorted({**self.counters, **self.gauges, **computed}.items()))
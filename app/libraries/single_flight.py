@@ -0,0 +1,24 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into a single in-flight call.
+    Callers that arrive while a call is in flight await its result instead of
+    starting their own."""
+
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs `function`, unless a call for `key` is already in flight."""
+
+        call = self.calls.get(key)
+
+        if call is None:
+            call = asyncio.ensure_future(function())
+            self.calls[key] = call
+            call.add_done_callback(lambda _: self.calls.pop(key, None))
+
+        # Shielded so that one cancelled caller does not cancel the call for all
+        return await asyncio.shield(call)
@@ -1,4 +1,5 @@
 from os import path
+from typing import Optional
 
 from pydantic import BaseSettings
 
@@ -20,21 +21,82 @@ class Settings(BaseSettings):
 
     # Database Settings
     db_url: str
+    open_challenges_listener_retry_interval: float = 5  # Seconds between reconnects
+    statement_cache_size: int = 256  # Compiled query shapes kept in memory
+
+    # Outbound HTTP Connection Pool Settings
+    http_pool_limit: int = 100  # Open connections across all hosts
+    http_pool_limit_per_host: int = 30
+    http_keepalive_timeout: float = 30  # Seconds an idle connection is kept
+    http_dns_cache_ttl: int = 300  # Seconds
+    http_timeout: float = 30  # Seconds, unless a client sets its own
 
     # Strava Settings
     verify_token: str
     client_id: str
     client_secret: str
     strava_base_url: str = "https://www.strava.com/api/v3"
+    strava_token_refresh_margin: int = 1800  # Refresh tokens expiring this soon (s)
+    strava_token_refresh_interval: int = 300  # Seconds between refresh sweeps
+    strava_short_term_rate_limit: int = 100  # Requests per 15 minutes
+    strava_daily_rate_limit: int = 1000  # Requests per day
+    strava_rate_limit_utilization: float = 0.95  # Share of each quota we may use
+    strava_rate_limit_max_wait: float = 60  # Seconds a request may queue for quota
+    strava_request_timeout: float = 10  # Seconds per attempt
+    strava_max_retries: int = 3  # Retries of idempotent GETs
+    strava_retry_backoff: float = 0.5  # Seconds, doubled on every retry
+    strava_retry_backoff_max: float = 8  # Seconds
+    strava_breaker_error_rate: float = 0.5  # Share of failed calls that opens it
+    strava_breaker_window: int = 20  # Most recent calls considered
+    strava_breaker_minimum_calls: int = 10
+    strava_breaker_reset_timeout: float = 30  # Seconds before probing Strava again
+    activity_cache_size: int = 1000  # Activity summaries kept in memory
+    activity_cache_ttl: int = 3600  # Seconds
 
     # Ethereum Settings
     signer_private_key: str
     abi: str
     rpc_url: str
     contract_address: str
+    ethereum_request_timeout: float = 10  # Seconds per JSON-RPC call
+    ethereum_batch_size: int = 100  # Calls per JSON-RPC batch request
+    ethereum_block_time: float = 12  # Seconds between blocks
+    ethereum_finality_depth: int = 64  # Blocks after which a read cannot reorg
+    onchain_challenge_cache_size: int = 10000  # On-chain challenges in memory
+    onchain_confirmation_timeout: float = 30  # Seconds to wait for a transaction
+    onchain_payment_confirmation_timeout: float = 3  # Seconds, for bounty payments
+    onchain_confirmation_backoff: float = 0.25  # Seconds, doubled on every poll
+    onchain_confirmation_backoff_max: float = 4  # Seconds
+    signature_workers: int = 2  # Processes signing claim messages
+    signature_chunk_size: int = 100  # Messages signed per process task
+    signature_backfill_batch_size: int = 1000  # Challenges signed per query
+
+    # Challenge Indexer Settings
+    indexer_start_block: Optional[int] = None  # Deployment block, required to index
+    indexer_block_range: int = 2000  # Blocks per eth_getLogs request
+    indexer_poll_interval: float = 12  # Seconds between runs
+
+    # Webhook Queue Settings
+    webhook_worker_concurrency: int = 4
+    webhook_worker_batch_size: int = 10
+    webhook_worker_poll_interval: float = 1.0  # Seconds
+    webhook_visibility_timeout: int = 300  # Seconds
+    webhook_max_attempts: int = 5
+    webhook_retry_delay: int = 30  # Seconds, doubled on every attempt
+    webhook_dedupe_cache_size: int = 10000  # Recently received event identities
+
+    # Activity Backfill Settings
+    backfill_concurrency: int = 8  # Athletes revalidated at once
+    backfill_batch_size: int = 100  # Athletes per checkpoint
+    backfill_page_size: int = 200  # Activities per Strava page (at most 200)
+
+    # Downstream Concurrency Limits (per process)
+    strava_concurrency: int = 10
+    email_concurrency: int = 10
 
     # Sendgrid Settings
     sendgrid_api_key: str
+    sendgrid_base_url: str = "https://api.sendgrid.com/v3"
 
     # Miscellaneous Settings
     sender_email_address: str
@@ -1,9 +1,30 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List
 
 from app.usecases.schemas.challenges import ChallengeOnChain
 
 
 class IEthereumClient(ABC):
     @abstractmethod
-    def get_challenge(self, challenge_id: str) -> ChallengeOnChain:
-        """Retrieves on-chain challenge by challenge_id."""
+    async def get_challenge(
+        self, challenge_id: str, cached: bool = True
+    ) -> ChallengeOnChain:
+        """Retrieves on-chain challenge by challenge_id. Pass `cached=False` to
+        read it from the chain even if a cached read is still current."""
+
+    @abstractmethod
+    async def get_challenges(
+        self, challenge_ids: List[str], cached: bool = True
+    ) -> List[ChallengeOnChain]:
+        """Retrieves on-chain challenges by challenge_id, in the same order."""
+
+    @abstractmethod
+    async def get_block_number(self) -> int:
+        """Returns the head block number."""
+
+    @abstractmethod
+    async def get_challenge_events(
+        self, from_block: int, to_block: int
+    ) -> Dict[str, int]:
+        """Finds the challenges that contract events in a block range refer to.
+        Returns the block of the last event for each challenge."""
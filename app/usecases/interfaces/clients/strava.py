@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Any, Mapping, Optional
+from typing import Any, List, Mapping, Optional
 
-from app.usecases.schemas.strava import RefreshTokenResponse, TokenExchangeResponse
+from app.usecases.schemas.strava import (
+    ActivitySummary,
+    RefreshTokenResponse,
+    StravaRequestPriority,
+    TokenExchangeResponse,
+)
 
 
 class IStravaClient(ABC):
@@ -13,6 +18,7 @@ class IStravaClient(ABC):
         headers: Optional[Mapping[str, str]] = None,
         params: Optional[Mapping[str, str]] = None,
         json_body: Optional[Mapping[str, Any]] = None,
+        priority: StravaRequestPriority = StravaRequestPriority.DEFAULT,
     ) -> Mapping[str, Any]:
         """Makes API call."""
 
@@ -22,10 +28,24 @@ class IStravaClient(ABC):
 
     @abstractmethod
     async def get_activity(
-        self, access_token: str, activity_id: int
-    ) -> Mapping[str, Any]:
+        self,
+        access_token: str,
+        activity_id: int,
+        priority: StravaRequestPriority = StravaRequestPriority.VALIDATION,
+    ) -> ActivitySummary:
         """Retrieves an activity."""
 
+    @abstractmethod
+    async def list_activities(
+        self,
+        access_token: str,
+        after: int,
+        page: int,
+        per_page: int,
+        priority: StravaRequestPriority = StravaRequestPriority.BACKFILL,
+    ) -> List[ActivitySummary]:
+        """Retrieves a page of an athlete's activities started after a time."""
+
     @abstractmethod
     async def exhange_code_for_token(self, code: str) -> TokenExchangeResponse:
         """Exchanges code recieved from Strava for athlete's access token."""
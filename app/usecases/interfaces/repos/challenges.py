@@ -1,19 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from app.usecases.schemas.challenges import (
     ChallengeJoinPaymentAndUsers,
     CreateChallengeRepoAdapter,
     RetrieveChallengesAdapter,
 )
+from app.usecases.schemas.ethereum import SignedMessage
 
 
 class IChallengesRepo(ABC):
     @abstractmethod
     async def create(
         self, new_challenge: CreateChallengeRepoAdapter
-    ) -> ChallengeJoinPaymentAndUsers:
-        """Inserts and returns new challenge (and payment) object."""
+    ) -> Optional[ChallengeJoinPaymentAndUsers]:
+        """Inserts and returns new challenge (and payment) object, or None if a
+        challenge with its id exists already."""
 
     @abstractmethod
     async def retrieve(
@@ -26,13 +28,32 @@ class IChallengesRepo(ABC):
     async def retrieve_many(
         self,
         query_params: RetrieveChallengesAdapter,
+        limit: Optional[int] = None,
     ) -> List[ChallengeJoinPaymentAndUsers]:
         """Retreives challenge objects by specified query parameters."""
 
     @abstractmethod
-    async def update_challenge(self, id: int) -> ChallengeJoinPaymentAndUsers:
-        """Updates a challenge."""
+    async def complete_challenge(
+        self, id: str, signed_message: SignedMessage
+    ) -> Optional[ChallengeJoinPaymentAndUsers]:
+        """Marks an open challenge as complete and stores its claim signature,
+        atomically. Returns None, and writes nothing, if the challenge was not
+        open."""
+
+    @abstractmethod
+    async def has_open_challenges(self, user_id: int) -> bool:
+        """Whether a user has been issued a challenge they have not completed."""
+
+    @abstractmethod
+    async def count_open_challenges(
+        self, user_ids: Optional[Iterable[int]] = None
+    ) -> Dict[int, int]:
+        """Counts open challenges per challengee, of `user_ids` or of everyone."""
 
     @abstractmethod
     async def update_payment(self, id: int) -> None:
         """Marks a payment as complete."""
+
+    @abstractmethod
+    async def save_signatures(self, signatures: Dict[str, SignedMessage]) -> None:
+        """Stores claim signatures, keyed by challenge id, on their payments."""
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager, Optional
+
+
+class ICheckpointsRepo(ABC):
+    @abstractmethod
+    async def retrieve(self, name: str) -> Optional[int]:
+        """Retrieves the position a named job last checkpointed."""
+
+    @abstractmethod
+    async def save(self, name: str, position: int) -> None:
+        """Records the position a named job has reached."""
+
+    @abstractmethod
+    async def delete(self, name: str) -> None:
+        """Forgets a named job's progress."""
+
+    @abstractmethod
+    def lock(self, name: str) -> AsyncContextManager[bool]:
+        """Holds a lock on a named job, across processes, while the context is
+        open. Does not wait for it: the context yields whether it was taken."""
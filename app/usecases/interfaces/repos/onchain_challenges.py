@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from app.usecases.schemas.challenges import IndexedChallenge
+
+
+class IOnchainChallengesRepo(ABC):
+    @abstractmethod
+    async def upsert_many(self, challenges: List[IndexedChallenge]) -> None:
+        """Inserts or updates indexed on-chain challenges."""
+
+    @abstractmethod
+    async def delete_many(self, challenge_ids: List[str]) -> None:
+        """Deletes indexed on-chain challenges."""
+
+    @abstractmethod
+    async def retrieve(self, challenge_id: str) -> Optional[IndexedChallenge]:
+        """Retrieves an indexed on-chain challenge."""
+
+    @abstractmethod
+    async def retrieve_since(self, block_number: int) -> List[IndexedChallenge]:
+        """Retrieves challenges whose last event is in a later block."""
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
 from app.usecases.schemas.strava import (
     CreateStravaAccessAdapter,
@@ -19,6 +19,16 @@ class IStravaRepo(ABC):
     ) -> Optional[StravaAccessInDb]:
         """Retreives and returns an access object by id."""
 
+    @abstractmethod
+    async def retrieve_expiring(self, expires_before: float) -> List[StravaAccessInDb]:
+        """Retreives access objects which expire before the given time."""
+
+    @abstractmethod
+    async def retrieve_with_open_challenges(
+        self, after_athlete_id: int, limit: int
+    ) -> List[StravaAccessInDb]:
+        """Retreives access objects of athletes who have open challenges."""
+
     @abstractmethod
     async def update(
         self, athlete_id: int, updated_access: StravaAccessUpdateAdapter
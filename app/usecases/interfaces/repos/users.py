@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
 from app.usecases.schemas.users import UserBase, UserInDb
 
@@ -9,6 +9,10 @@ class IUsersRepo(ABC):
     async def create(self, new_user: UserBase) -> UserInDb:
         """Inserts user object."""
 
+    @abstractmethod
+    async def upsert_many(self, new_users: List[UserBase]) -> List[UserInDb]:
+        """Inserts users that do not exist yet, by email, and returns every user."""
+
     @abstractmethod
     async def retrieve(
         self,
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from app.usecases.schemas.strava import WebhookEvent, WebhookEventInDb
+
+
+class IWebhookEventsRepo(ABC):
+    @abstractmethod
+    async def enqueue(self, event: WebhookEvent) -> Optional[WebhookEventInDb]:
+        """Inserts a webhook event into the queue. Returns None if the event
+        was already received."""
+
+    @abstractmethod
+    async def claim(
+        self, limit: int, visibility_timeout: int
+    ) -> List[WebhookEventInDb]:
+        """Claims queued events that no other worker is processing."""
+
+    @abstractmethod
+    async def superseded(self, event: WebhookEventInDb) -> bool:
+        """Whether a newer event for the same object was already processed."""
+
+    @abstractmethod
+    async def complete(self, id: int) -> None:
+        """Marks an event as processed."""
+
+    @abstractmethod
+    async def retry(self, id: int, error: str, delay: int) -> None:
+        """Returns an event to the queue after a failed attempt."""
+
+    @abstractmethod
+    async def defer(self, id: int, error: str, delay: int) -> None:
+        """Returns an event to the queue without counting the attempt."""
+
+    @abstractmethod
+    async def fail(self, id: int, error: str) -> None:
+        """Marks an event as permanently failed."""
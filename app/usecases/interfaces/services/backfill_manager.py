@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+
+from app.usecases.schemas.strava import BackfillReport
+
+
+class IBackfillManager(ABC):
+    @abstractmethod
+    async def run(self, restart: bool = False) -> BackfillReport:
+        """Revalidates the open challenges of every athlete who has any."""
@@ -24,6 +24,10 @@ class IChallengeManager(ABC):
     async def claim_bounty(self, address: str) -> List[BountyVerification]:
         """Performs actions necessary for a user to rightly claim a bounty."""
 
+    @abstractmethod
+    async def sign_completed_challenges(self, batch_size: int) -> int:
+        """Stores claim signatures for completed, unpaid challenges without one."""
+
     @abstractmethod
     async def handle_bounty_payment(self, challenge_id: str) -> None:
         """Checks and updates challenge payment completion."""
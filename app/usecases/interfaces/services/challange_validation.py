@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
 
-from app.usecases.schemas.strava import WebhookEvent
+from app.usecases.schemas.strava import StravaAccessInDb, WebhookEvent
 
 
 class IChallengeValidation(ABC):
     @abstractmethod
     async def validate(self, event: WebhookEvent) -> None:
         """Validates Challenge."""
+
+    @abstractmethod
+    async def revalidate(self, athlete_access: StravaAccessInDb, per_page: int) -> int:
+        """Validates an athlete's open challenges against all their activities."""
@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+
+class IChallengeIndexer(ABC):
+    @abstractmethod
+    async def index(self) -> int:
+        """Mirrors on-chain challenges into the database, up to the head block."""
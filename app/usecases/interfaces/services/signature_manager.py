@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 from app.usecases.schemas.ethereum import SignedMessage
 
@@ -7,3 +8,7 @@ class ISignatureManager(ABC):
     @abstractmethod
     async def sign(self, challenge_id: str) -> SignedMessage:
         """Signs a message."""
+
+    @abstractmethod
+    async def sign_many(self, challenge_ids: List[str]) -> List[SignedMessage]:
+        """Signs a message per challenge id, in order."""
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+from app.usecases.schemas.strava import StravaAccessInDb
+
+
+class ITokenManager(ABC):
+    @abstractmethod
+    async def obtain(self, current_access: StravaAccessInDb) -> StravaAccessInDb:
+        """Returns a usable access object, refreshing it if it is stale."""
+
+    @abstractmethod
+    async def refresh_expiring(self) -> int:
+        """Refreshes access objects that are about to expire."""
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+
+from app.usecases.schemas.strava import WebhookEvent
+
+
+class IWebhookManager(ABC):
+    @abstractmethod
+    async def enqueue(self, event: WebhookEvent) -> None:
+        """Persists a webhook event for asynchronous processing."""
+
+    @abstractmethod
+    async def handle(self, event: WebhookEvent) -> None:
+        """Acts upon a single webhook event."""
+
+    @abstractmethod
+    async def process_batch(self, batch_size: int) -> int:
+        """Claims and handles queued events. Returns the number of events claimed."""
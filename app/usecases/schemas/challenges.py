@@ -102,6 +102,16 @@ class ChallengeJoinPaymentAndUsers(ChallengeInDb):
         description="Challenger's ethereum address.",
         example="0xb794f5ea0ba39494ce839613fffba74279579268",
     )
+    hashed_message: Optional[str] = Field(
+        None,
+        description="The stored claim message hash, once the challenge is complete.",
+        example="0x43bdcd52f31fc1ff9e00b231d89f8e6692d1124c622afac4e5e48df72c86b119",
+    )
+    signature: Optional[str] = Field(
+        None,
+        description="The stored claim signature, once the challenge is complete.",
+        example="0x3b99982e7faf1bc4a328ce993c15af402b9179a18eea2738e87b26936f5c5b4f66488db49d255a57c84a0a72",
+    )
 
 
 class RetrieveChallengesAdapter(BaseModel):
@@ -113,6 +123,7 @@ class RetrieveChallengesAdapter(BaseModel):
     challenger_address: Optional[str]
     challenge_complete: Optional[bool]
     payment_complete: Optional[bool]
+    payment_signed: Optional[bool]
 
 
 ##### On-chain Response #####
@@ -127,6 +138,12 @@ class ChallengeOnChain(BaseModel):
     complete: bool
 
 
+class IndexedChallenge(ChallengeOnChain):
+    """On-chain challenge as mirrored by the challenge indexer."""
+
+    block_number: int  # Block of the last event seen for the challenge
+
+
 ##### Request Models #####
 class IssueChallengeBody(BaseModel):
     """JSON body sent when a challenge is issued."""
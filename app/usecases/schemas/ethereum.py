@@ -1,6 +1,11 @@
 from pydantic import BaseModel
 
 
+##### Exceptions #####
+class EthereumException(Exception):
+    """Generic exception"""
+
+
 class SignedMessage(BaseModel):
 
     hashed_message: str
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum, IntEnum
 from typing import Any, List, Mapping, Optional
 
 from pydantic import BaseModel, Field
@@ -9,6 +10,41 @@ class StravaException(Exception):
     """Generic exception"""
 
 
+class StravaServerException(StravaException):
+    """Raised when Strava responds with a server error."""
+
+
+class StravaUnavailableException(StravaException):
+    """Raised without calling Strava while its error rate keeps the circuit
+    breaker open."""
+
+
+class StravaRateLimitException(StravaException):
+    """Raised when Strava's quota does not free up in time for a request."""
+
+
+class StravaRequestPriority(IntEnum):
+    """Order in which queued Strava requests are let through the rate limiter.
+    Lower values go first."""
+
+    VALIDATION = 0
+    DEFAULT = 1
+    BACKFILL = 2
+
+
+class ActivitySummary(BaseModel):
+    """The fields of a Strava activity that challenge validation reads. Strava's
+    detailed activity is projected onto this as soon as it is decoded."""
+
+    id: int
+    type: str
+    start_date: datetime
+    distance: float  # Meters
+    average_speed: float  # Meters/Second
+    manual: bool
+    polyline: Optional[str]
+
+
 class RefreshTokenResponse(BaseModel):
     """Refresh token response returned from Strava."""
 
@@ -32,6 +68,15 @@ class WebhookEvent(BaseModel):
     updates: Mapping[str, Any]
 
 
+class WebhookEventStatus(str, Enum):
+    """Lifecycle of a queued webhook event."""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+
 ####### Response Models #######
 class WebhookVerificationResponse(BaseModel):
     """Response echoed to Strava to verify webhook subscription."""
@@ -132,3 +177,54 @@ class StravaAccessInDb(CreateStravaAccessAdapter):
         description="The time that the Strava access object was last updated.",
         example="2022-06-17 17:47:44.190912",
     )
+
+
+class WebhookEventInDb(WebhookEvent):
+    """Database Model of a queued webhook event."""
+
+    id: int = Field(
+        ..., description="The unique identifier of a queued event.", example=1
+    )
+    status: WebhookEventStatus = Field(
+        ...,
+        description="The processing status of the event.",
+        example=WebhookEventStatus.PENDING,
+    )
+    attempts: int = Field(
+        ..., description="The number of times the event was claimed.", example=1
+    )
+    available_at: datetime = Field(
+        ...,
+        description="The earliest time the event may be claimed by a worker.",
+        example="2022-06-17 17:47:44.190912",
+    )
+    locked_until: Optional[datetime] = Field(
+        None,
+        description="The time at which a claimed event becomes visible to other workers again.",
+        example="2022-06-17 17:52:44.190912",
+    )
+    last_error: Optional[str] = Field(
+        None,
+        description="The error raised by the most recent failed attempt.",
+        example="Strava Client Error: Response status: 503",
+    )
+    created_at: datetime = Field(
+        ...,
+        description="The time that the event was received.",
+        example="2022-06-17 17:47:44.190912",
+    )
+    updated_at: datetime = Field(
+        ...,
+        description="The time that the event was last updated.",
+        example="2022-06-17 17:47:44.190912",
+    )
+
+
+####### Backfill Models #######
+class BackfillReport(BaseModel):
+    """Outcome of an activity backfill run."""
+
+    athletes: int = 0
+    completed_challenges: int = 0
+    failed_athletes: List[int] = []
+    finished: bool = False  # False if the run stopped early and can be resumed
@@ -0,0 +1,109 @@
+import asyncio
+
+from app.dependencies import logger
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.repos.strava import IStravaRepo
+from app.usecases.interfaces.services.backfill_manager import IBackfillManager
+from app.usecases.interfaces.services.challange_validation import IChallengeValidation
+from app.usecases.schemas.strava import (
+    BackfillReport,
+    StravaAccessInDb,
+    StravaRateLimitException,
+    StravaUnavailableException,
+)
+
+CHECKPOINT = "strava_activity_backfill"
+
+
+class BackfillManager(IBackfillManager):
+    def __init__(
+        self,
+        strava_repo: IStravaRepo,
+        checkpoints_repo: ICheckpointsRepo,
+        challenge_validation: IChallengeValidation,
+        concurrency: int,
+        batch_size: int,
+        per_page: int,
+    ):
+        self.strava_repo = strava_repo
+        self.checkpoints_repo = checkpoints_repo
+        self.challenge_validation = challenge_validation
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.per_page = per_page
+
+    async def run(self, restart: bool = False) -> BackfillReport:
+        """Revalidates the open challenges of every athlete who has any, against
+        all of their activities since the oldest open challenge was created.
+
+        Athletes are processed in batches ordered by athlete id, `concurrency`
+        at a time. The last athlete id of each finished batch is checkpointed,
+        so a run that is stopped, or runs out of Strava quota, resumes where it
+        left off."""
+
+        if restart:
+            await self.checkpoints_repo.delete(name=CHECKPOINT)
+
+        after_athlete_id = await self.checkpoints_repo.retrieve(name=CHECKPOINT) or 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        report = BackfillReport()
+
+        while True:
+            # 1. Get the next batch of athletes with open challenges.
+            batch = await self.strava_repo.retrieve_with_open_challenges(
+                after_athlete_id=after_athlete_id, limit=self.batch_size
+            )
+
+            if not batch:
+                await self.checkpoints_repo.delete(name=CHECKPOINT)
+                report.finished = True
+                return report
+
+            # 2. Revalidate the batch under the concurrency bound.
+            results = await asyncio.gather(
+                *(
+                    self.__revalidate(athlete_access=access, semaphore=semaphore)
+                    for access in batch
+                ),
+                return_exceptions=True,
+            )
+
+            # 3. Stop without checkpointing if Strava is out of quota or down;
+            # the batch is safe to repeat, as completed challenges are not open.
+            stopped = any(
+                isinstance(
+                    result, (StravaRateLimitException, StravaUnavailableException)
+                )
+                for result in results
+            )
+
+            for access, result in zip(batch, results):
+                if isinstance(result, int):
+                    report.athletes += 1
+                    report.completed_challenges += result
+                elif not stopped:
+                    logger.error(
+                        "[BackfillManager]: Athlete %s failed: %r",
+                        access.athlete_id,
+                        result,
+                    )
+                    report.failed_athletes.append(access.athlete_id)
+
+            if stopped:
+                logger.warning(
+                    "[BackfillManager]: Strava is unavailable, stopped after athlete %s.",
+                    after_athlete_id,
+                )
+                return report
+
+            after_athlete_id = batch[-1].athlete_id
+            await self.checkpoints_repo.save(name=CHECKPOINT, position=after_athlete_id)
+
+    async def __revalidate(
+        self, athlete_access: StravaAccessInDb, semaphore: asyncio.Semaphore
+    ) -> int:
+
+        async with semaphore:
+            return await self.challenge_validation.revalidate(
+                athlete_access=athlete_access, per_page=self.per_page
+            )
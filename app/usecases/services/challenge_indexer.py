@@ -0,0 +1,115 @@
+from typing import Dict
+
+from app.usecases.interfaces.clients.ethereum import IEthereumClient
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
+from app.usecases.interfaces.services.challenge_indexer import IChallengeIndexer
+from app.usecases.schemas.challenges import IndexedChallenge
+
+CHECKPOINT = "challenge_indexer"
+
+
+class ChallengeIndexer(IChallengeIndexer):
+    def __init__(
+        self,
+        ethereum_client: IEthereumClient,
+        onchain_challenges_repo: IOnchainChallengesRepo,
+        checkpoints_repo: ICheckpointsRepo,
+        start_block: int,
+        block_range: int,
+        finality_depth: int,
+    ):
+        self.ethereum_client = ethereum_client
+        self.onchain_challenges_repo = onchain_challenges_repo
+        self.checkpoints_repo = checkpoints_repo
+        self.start_block = start_block
+        self.block_range = block_range
+        self.finality_depth = finality_depth
+
+    async def index(self) -> int:
+        """Mirrors on-chain challenges into the database, up to the head block.
+        Returns the number of challenges indexed.
+
+        Contract events are followed `block_range` blocks at a time, and each
+        challenge they refer to is read from the contract in bulk. The last
+        final block indexed is checkpointed, so indexing catches up from
+        `start_block` once and then only follows new blocks.
+
+        Blocks that are not final yet are indexed on every run, along with the
+        challenges indexed from them before, as a reorg may have changed or
+        dropped their events.
+
+        One run indexes at a time, across processes; a run that finds another
+        in progress indexes nothing."""
+
+        async with self.checkpoints_repo.lock(name=CHECKPOINT) as locked:
+            if not locked:
+                return 0
+
+            return await self.__index()
+
+    async def __index(self) -> int:
+        head = await self.ethereum_client.get_block_number()
+        final = head - self.finality_depth
+
+        checkpoint = await self.checkpoints_repo.retrieve(name=CHECKPOINT)
+        from_block = self.start_block if checkpoint is None else checkpoint + 1
+        indexed = 0
+
+        # 1. Catch up on final blocks, checkpointing every range.
+        while from_block <= final:
+            to_block = min(from_block + self.block_range - 1, final)
+            events = await self.ethereum_client.get_challenge_events(
+                from_block=from_block, to_block=to_block
+            )
+            indexed += await self.__index_challenges(events=events)
+            await self.checkpoints_repo.save(name=CHECKPOINT, position=to_block)
+            from_block = to_block + 1
+
+        # 2. Reindex the blocks that are not final yet.
+        events = {
+            challenge.challengeId: challenge.block_number
+            for challenge in await self.onchain_challenges_repo.retrieve_since(
+                block_number=from_block - 1
+            )
+        }
+        while from_block <= head:
+            to_block = min(from_block + self.block_range - 1, head)
+            events.update(
+                await self.ethereum_client.get_challenge_events(
+                    from_block=from_block, to_block=to_block
+                )
+            )
+            from_block = to_block + 1
+
+        return indexed + await self.__index_challenges(events=events)
+
+    async def __index_challenges(self, events: Dict[str, int]) -> int:
+        """Reads the challenges that events referred to from the contract, and
+        upserts them. Challenges the contract does not know (any more) are
+        deleted."""
+
+        if not events:
+            return 0
+
+        challenge_ids = list(events)
+        onchain_challenges = await self.ethereum_client.get_challenges(
+            challenge_ids=challenge_ids
+        )
+
+        found, missing = [], []
+        for challenge_id, challenge in zip(challenge_ids, onchain_challenges):
+            if int(challenge.challengee, 0) and int(challenge.challenger, 0):
+                found.append(
+                    IndexedChallenge(
+                        **{**challenge.dict(), "challengeId": challenge_id},
+                        block_number=events[challenge_id],
+                    )
+                )
+            else:
+                missing.append(challenge_id)
+
+        await self.onchain_challenges_repo.upsert_many(challenges=found)
+        await self.onchain_challenges_repo.delete_many(challenge_ids=missing)
+
+        return len(found)
@@ -1,9 +1,10 @@
-from typing import List, Optional
-
 import asyncio
+from typing import Callable, List, Optional
 
+from app.libraries.backoff import backoff_delay
 from app.usecases.interfaces.clients.ethereum import IEthereumClient
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
 from app.usecases.interfaces.repos.users import IUsersRepo
 from app.usecases.interfaces.services.challange_manager import IChallengeManager
 from app.usecases.interfaces.services.conversion_manager import IConversionManager
@@ -29,39 +30,43 @@ class ChallengeManager(IChallengeManager):
         ethereum_client: IEthereumClient,
         users_repo: IUsersRepo,
         challenges_repo: IChallengesRepo,
+        onchain_challenges_repo: IOnchainChallengesRepo,
         signature_manager: ISignatureManager,
         email_manager: IEmailManager,
         conversion_manager: IConversionManager,
+        confirmation_timeout: float,
+        payment_confirmation_timeout: float,
+        confirmation_backoff: float,
+        confirmation_backoff_max: float,
     ):
         self.ethereum_client = ethereum_client
         self.users_repo = users_repo
         self.challenges_repo = challenges_repo
+        self.onchain_challenges_repo = onchain_challenges_repo
         self.signature_manager = signature_manager
         self.email_manager = email_manager
         self.conversion_manager = conversion_manager
+        self.confirmation_timeout = confirmation_timeout
+        self.payment_confirmation_timeout = payment_confirmation_timeout
+        self.confirmation_backoff = confirmation_backoff
+        self.confirmation_backoff_max = confirmation_backoff_max
 
     async def handle_challenge_issuance(self, payload: IssueChallengeBody) -> None:
         """Handles a newly issued challenge."""
 
-        # 1. Ensure challenge is not already in database.
-        challenge = await self.challenges_repo.retrieve(id=payload.challenge_id)
-
-        if challenge:
-            raise ChallengeException("Invalid challenge_id.")
-
-        # 2. Retrive on-chain challenge.
+        # 1. Retrive on-chain challenge.
         onchain_challenge = await self.__retrieve_onchain_challenge(
-            challenge_id=payload.challenge_id
+            challenge_id=payload.challenge_id, timeout=self.confirmation_timeout
         )
 
-        # 3. See if users already exist. If not, create them.
+        # 2. See if users already exist. If not, create them.
         participants = await self.handle_users(
             payload=payload,
             challenger_address=onchain_challenge.challenger,
             challengee_address=onchain_challenge.challengee,
         )
 
-        # 4. Create challenge.
+        # 3. Create challenge, unless it is in the database already.
         issued_challenge = await self.__create_new_challenge(
             challenge_id=payload.challenge_id,
             participants=participants,
@@ -70,7 +75,10 @@ class ChallengeManager(IChallengeManager):
             pace=onchain_challenge.speed,
         )
 
-        # 5. Unit conversion.
+        if not issued_challenge:
+            raise ChallengeException("Invalid challenge_id.")
+
+        # 4. Unit conversion.
         issued_challenge.distance = self.conversion_manager.cm_to_miles(
             distance=issued_challenge.distance
         )
@@ -81,7 +89,7 @@ class ChallengeManager(IChallengeManager):
         )
         issued_challenge.bounty = issued_challenge.bounty / 1e18
 
-        # 6. Notify participants via email.
+        # 5. Notify participants via email.
         await self.email_manager.challenge_issuance_notification(
             participants=participants, challenge=issued_challenge
         )
@@ -94,25 +102,20 @@ class ChallengeManager(IChallengeManager):
     ) -> Participants:
         """Retrieves or creates users."""
 
-        challenger = await self.users_repo.retrieve(email=payload.challenger_email)
-        if not challenger:
-            challenger = await self.users_repo.create(
-                new_user=UserBase(
+        challenger, challengee = await self.users_repo.upsert_many(
+            new_users=[
+                UserBase(
                     email=payload.challenger_email,
                     address=challenger_address,
                     name=payload.challenger_name,
-                )
-            )
-
-        challengee = await self.users_repo.retrieve(email=payload.challengee_email)
-        if not challengee:
-            challengee = await self.users_repo.create(
-                new_user=UserBase(
+                ),
+                UserBase(
                     email=payload.challengee_email,
                     address=challengee_address,
                     name=payload.challengee_name,
-                )
-            )
+                ),
+            ]
+        )
 
         return Participants(challenger=challenger, challengee=challengee)
 
@@ -123,8 +126,8 @@ class ChallengeManager(IChallengeManager):
         bounty: int,
         distance: float,
         pace: Optional[int],
-    ) -> ChallengeJoinPaymentAndUsers:
-        """Creates challenge."""
+    ) -> Optional[ChallengeJoinPaymentAndUsers]:
+        """Creates challenge, unless one with its id exists already."""
 
         return await self.challenges_repo.create(
             new_challenge=CreateChallengeRepoAdapter(
@@ -140,55 +143,148 @@ class ChallengeManager(IChallengeManager):
     async def claim_bounty(self, address: str) -> List[BountyVerification]:
         """Performs actions necessary for a user to rightly claim a bounty."""
 
-        # 1. See if any challenges have been fulfilled pertaining to this user.
-        completed_challenges = await self.challenges_repo.retrieve_many(
+        # 1. See if any challenges have been fulfilled, but not paid out,
+        # pertaining to this user. Challenger addresses are joined in.
+        unpaid_challenges = await self.challenges_repo.retrieve_many(
             query_params=RetrieveChallengesAdapter(
-                challengee_address=address, challenge_complete=True
+                challengee_address=address,
+                challenge_complete=True,
+                payment_complete=False,
             )
         )
 
-        # If there are multiple, needs to return a list of them
-        bounty_verifications = []
-        for challenge in completed_challenges:
-            if not challenge.payment_complete:
-                signed_message = await self.signature_manager.sign(
-                    challenge_id=challenge.id
-                )
+        # 2. Signatures are stored when challenges complete; sign any that
+        # predate that or have not been backfilled yet.
+        await self.__sign_challenges(
+            challenges=[
+                challenge for challenge in unpaid_challenges if not challenge.signature
+            ]
+        )
 
-                user = await self.users_repo.retrieve(id=challenge.challenger)
-                challenge.challenger_address = user.address
+        return [
+            BountyVerification(
+                hashed_message=challenge.hashed_message,
+                signature=challenge.signature,
+                challenge=challenge,
+            )
+            for challenge in unpaid_challenges
+        ]
+
+    async def sign_completed_challenges(self, batch_size: int) -> int:
+        """Stores claim signatures for completed, unpaid challenges that do not
+        have one yet, `batch_size` at a time. Returns the number signed."""
+
+        signed = 0
+        while True:
+            unsigned_challenges = await self.challenges_repo.retrieve_many(
+                query_params=RetrieveChallengesAdapter(
+                    challenge_complete=True,
+                    payment_complete=False,
+                    payment_signed=False,
+                ),
+                limit=batch_size,
+            )
 
-                bounty_verifications.append(
-                    BountyVerification(**signed_message.dict(), challenge=challenge)
-                )
+            if not unsigned_challenges:
+                return signed
 
-        return bounty_verifications
+            await self.__sign_challenges(challenges=unsigned_challenges)
+            signed += len(unsigned_challenges)
 
     async def handle_bounty_payment(self, challenge_id: str) -> None:
-        """Checks and updates challenge payment completion."""
+        """Checks and updates challenge payment completion. Waits only briefly
+        for the payment to be mined, as a challenge that is not complete is far
+        more likely an unauthorized request than a pending transaction."""
 
-        onchain_challenge = await self.__retrieve_onchain_challenge(challenge_id=challenge_id)
+        onchain_challenge = await self.__retrieve_onchain_challenge(
+            challenge_id=challenge_id,
+            timeout=self.payment_confirmation_timeout,
+            confirmed=lambda challenge: challenge.complete,
+        )
 
         if not onchain_challenge.complete:
             raise ChallengeUnauthorizedAction("On-chain challenge not complete.")
 
         await self.challenges_repo.update_payment(id=challenge_id)
 
-    async def __retrieve_onchain_challenge(self, challenge_id: str) -> ChallengeOnChain:
-        """Retrieves challenge saved on-chain."""
+    async def __sign_challenges(
+        self, challenges: List[ChallengeJoinPaymentAndUsers]
+    ) -> None:
+        """Signs challenges' claim messages in bulk, storing the signatures and
+        setting them on the challenges."""
+
+        if not challenges:
+            return
+
+        signed_messages = await self.signature_manager.sign_many(
+            challenge_ids=[challenge.id for challenge in challenges]
+        )
+
+        await self.challenges_repo.save_signatures(
+            signatures={
+                challenge.id: signed_message
+                for challenge, signed_message in zip(challenges, signed_messages)
+            }
+        )
 
-        # 1. Sleep 3 seconds, before checking for on-chain challenge
-        await asyncio.sleep(3)
+        for challenge, signed_message in zip(challenges, signed_messages):
+            challenge.hashed_message = signed_message.hashed_message
+            challenge.signature = signed_message.signature
 
-        # 2. Get challenge
-        onchain_challenge = self.ethereum_client.get_challenge(
+    async def __retrieve_onchain_challenge(
+        self,
+        challenge_id: str,
+        timeout: float,
+        confirmed: Callable[[ChallengeOnChain], bool] = lambda challenge: True,
+    ) -> ChallengeOnChain:
+        """Retrieves challenge saved on-chain, from the challenge indexer's mirror
+        if it is already `confirmed` there. Otherwise the transaction that
+        created or updated it may not be indexed or mined yet, so the contract is
+        read right away and then polled with exponential backoff until the
+        challenge exists and is `confirmed`, or `timeout` seconds run out."""
+
+        indexed_challenge = await self.onchain_challenges_repo.retrieve(
             challenge_id=challenge_id
         )
+        if indexed_challenge and confirmed(indexed_challenge):
+            return indexed_challenge
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        attempt = 0
+
+        while True:
+            # 1. Get challenge, from the chain itself when polling, as a cached
+            #    read stays current until the next block
+            onchain_challenge = await self.ethereum_client.get_challenge(
+                challenge_id=challenge_id, cached=attempt == 0
+            )
+            exists = int(onchain_challenge.challengee, 0) and int(
+                onchain_challenge.challenger, 0
+            )
+
+            if exists and confirmed(onchain_challenge):
+                return onchain_challenge
+
+            # 2. Give up once the deadline has passed.
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            attempt += 1
+            await asyncio.sleep(
+                min(
+                    remaining,
+                    backoff_delay(
+                        attempt=attempt,
+                        base=self.confirmation_backoff,
+                        maximum=self.confirmation_backoff_max,
+                    ),
+                )
+            )
 
         # 3. Ensure the challenge exists.
-        if not int(onchain_challenge.challengee, 0) or not int(
-            onchain_challenge.challenger, 0
-        ):
+        if not exists:
             raise ChallengeNotFound("On-chain challenge not found.")
 
         return onchain_challenge
@@ -1,7 +1,9 @@
-import time
-
-from dateutil import parser
+import asyncio
+from datetime import datetime
+from typing import List, Tuple
 
+from app.libraries.cache import LRUCache
+from app.libraries.concurrency import ConcurrencyLimits
 from app.usecases.interfaces.clients.strava import IStravaClient
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
 from app.usecases.interfaces.repos.strava import IStravaRepo
@@ -9,17 +11,20 @@ from app.usecases.interfaces.repos.users import IUsersRepo
 from app.usecases.interfaces.services.challange_validation import IChallengeValidation
 from app.usecases.interfaces.services.conversion_manager import IConversionManager
 from app.usecases.interfaces.services.email_manager import IEmailManager
+from app.usecases.interfaces.services.signature_manager import ISignatureManager
+from app.usecases.interfaces.services.token_manager import ITokenManager
 from app.usecases.schemas.challenges import (
     ChallengeJoinPaymentAndUsers,
     CompletedChallenge,
     RetrieveChallengesAdapter,
 )
 from app.usecases.schemas.strava import (
+    ActivitySummary,
     StravaAccessInDb,
-    StravaAccessUpdateAdapter,
+    StravaRequestPriority,
     WebhookEvent,
 )
-from app.usecases.schemas.users import Participants
+from app.usecases.schemas.users import Participants, UserInDb
 
 
 class ChallengeValidation(IChallengeValidation):
@@ -31,6 +36,10 @@ class ChallengeValidation(IChallengeValidation):
         challenges_repo: IChallengesRepo,
         email_manager: IEmailManager,
         conversion_manager: IConversionManager,
+        token_manager: ITokenManager,
+        signature_manager: ISignatureManager,
+        activity_cache: LRUCache,
+        concurrency_limits: ConcurrencyLimits,
     ):
         self.strava_client = strava_client
         self.strava_repo = strava_repo
@@ -38,93 +47,235 @@ class ChallengeValidation(IChallengeValidation):
         self.challenges_repo = challenges_repo
         self.email_manager = email_manager
         self.conversion_manager = conversion_manager
+        self.token_manager = token_manager
+        self.signature_manager = signature_manager
+        self.activity_cache = activity_cache
+        self.concurrency_limits = concurrency_limits
 
     async def validate(self, event: WebhookEvent) -> None:
         """Validates challenge."""
 
         # 1. Get athelete's access object
-        athlete_access = await self.__obtain_access_object(athlete_id=event.owner_id)
+        athlete_access = await self.strava_repo.retrieve(athlete_id=event.owner_id)
+
+        # 2. Skip athletes without open challenges before any Strava I/O
+        if not await self.challenges_repo.has_open_challenges(
+            user_id=athlete_access.user_id
+        ):
+            return
 
-        # 2. Get activity from Strava
-        activity = await self.strava_client.get_activity(
-            access_token=athlete_access.access_token, activity_id=event.object_id
+        # 3. Get activity from Strava while retrieving open challenges
+        activity, open_challenges = await asyncio.gather(
+            self.__retrieve_activity(
+                athlete_access=athlete_access, activity_id=event.object_id
+            ),
+            self.__retrieve_open_challenges(user_id=athlete_access.user_id),
         )
 
-        # 3. Retrieve open challenges
-        open_challenges = await self.challenges_repo.retrieve_many(
-            query_params=RetrieveChallengesAdapter(
-                challengee_user_id=athlete_access.user_id, challenge_complete=False
-            )
+        # 4. Check for completeness, then complete all fulfilled challenges.
+        await self.__complete_challenges(
+            completions=[
+                (challenge, activity)
+                for challenge in open_challenges
+                if self.__is_fulfilled(challenge=challenge, activity=activity)
+            ]
+        )
+
+    async def revalidate(self, athlete_access: StravaAccessInDb, per_page: int) -> int:
+        """Validates an athlete's open challenges against every activity since the
+        oldest of them was created, fetching activities a page at a time rather
+        than one by one. Returns the number of challenges completed."""
+
+        # 1. Get open challenges
+        open_challenges = await self.__retrieve_open_challenges(
+            user_id=athlete_access.user_id
         )
 
-        # 4. Check for completeness. If complete, mark challenge as complete in database.
+        if not open_challenges:
+            return 0
+
+        # 2. Page through all activities since the oldest open challenge
+        activities = await self.__retrieve_activities(
+            athlete_access=athlete_access,
+            after=min(challenge.created_at for challenge in open_challenges),
+            per_page=per_page,
+        )
+
+        # 3. Complete every challenge fulfilled by any of the activities
+        completions = []
         for challenge in open_challenges:
-            challenge_requirements = (
-                activity.get("map").get("polyline"),
-                activity.get("manual") == False,
-                activity.get("distance") >= (challenge.distance / 100),  # Meters
-                activity.get("average_speed")
-                >= (challenge.pace / 100),  # Meters/Second
-                activity.get("type") == "Run" or activity.get("type") == "Walk",
-                parser.parse(activity.get("start_date")).timestamp()
-                > challenge.created_at.timestamp(),
+            activity = next(
+                (
+                    activity
+                    for activity in activities
+                    if self.__is_fulfilled(challenge=challenge, activity=activity)
+                ),
+                None,
             )
+            if activity:
+                completions.append((challenge, activity))
 
-            if all(challenge_requirements):
-                await self.challenges_repo.update_challenge(id=challenge.id)
+        return await self.__complete_challenges(completions=completions)
 
-                # 5. Stored challenge unit conversion.
-                challenge.distance = self.conversion_manager.cm_to_miles(
-                    distance=challenge.distance
-                )
-                challenge.pace = (
-                    self.conversion_manager.cm_per_second_to_minutes_per_mile(
-                        pace=challenge.pace
-                    )
-                )
+    def __is_fulfilled(
+        self, challenge: ChallengeJoinPaymentAndUsers, activity: ActivitySummary
+    ) -> bool:
+        """Checks an activity against a challenge's requirements."""
 
-                # 5. Send challenge completion notification
-                participants = await self.__retrieve_participants(challenge=challenge)
-                await self.email_manager.completed_challenge_notification(
-                    participants=participants,
-                    challenge=challenge,
-                    completed_challenge=CompletedChallenge(
-                        distance=self.conversion_manager.cm_to_miles(
-                            distance=activity.get("distance") * 100
-                        ),
-                        pace=self.conversion_manager.cm_per_second_to_minutes_per_mile(
-                            pace=activity.get("average_speed") * 100
-                        ),
-                    ),
-                )
+        challenge_requirements = (
+            activity.polyline,
+            activity.manual == False,
+            activity.distance >= (challenge.distance / 100),  # Meters
+            activity.average_speed >= (challenge.pace / 100),  # Meters/Second
+            activity.type == "Run" or activity.type == "Walk",
+            activity.start_date.timestamp() > challenge.created_at.timestamp(),
+        )
+
+        return all(challenge_requirements)
 
-    async def __obtain_access_object(self, athlete_id: int) -> StravaAccessInDb:
-        """Returns athlete's access object. Access if refreshed if
-        currently stored access object is stale."""
+    async def __complete_challenges(
+        self, completions: List[Tuple[ChallengeJoinPaymentAndUsers, ActivitySummary]]
+    ) -> int:
+        """Marks challenges as complete, each with the activity that fulfilled
+        it, and notifies their participants. Returns the number of challenges
+        this call completed.
 
-        current_access = await self.strava_repo.retrieve(athlete_id=athlete_id)
+        Database calls are made one after the other, on the caller's database
+        connection. The notification emails are sent concurrently."""
+
+        if not completions:
+            return 0
+
+        # 1. Sign the claim messages the challengees will claim bounties with.
+        signed_messages = await self.signature_manager.sign_many(
+            challenge_ids=[challenge.id for challenge, _ in completions]
+        )
 
-        if current_access.expires_at < time.time():
-            new_access = await self.strava_client.refresh_token(
-                refresh_token=current_access.refresh_token
+        notifications = []
+        for (challenge, activity), signed_message in zip(completions, signed_messages):
+            # 2. Mark challenge as complete in database, along with its
+            # signature. Challenges that another call completed first, e.g. for
+            # a duplicate webhook, are left as is.
+            completed = await self.challenges_repo.complete_challenge(
+                id=challenge.id, signed_message=signed_message
             )
 
-            return await self.strava_repo.update(
-                athlete_id=athlete_id,
-                updated_access=StravaAccessUpdateAdapter(
-                    access_token=new_access.access_token,
-                    refresh_token=new_access.refresh_token,
-                    expires_at=new_access.expires_at,
+            if completed is None:
+                continue
+
+            participants = await self.__retrieve_participants(challenge=challenge)
+            notifications.append((challenge, activity, participants))
+
+        # 3. Send challenge completion notifications
+        await asyncio.gather(
+            *(
+                self.__notify_completion(
+                    challenge=challenge, activity=activity, participants=participants
+                )
+                for challenge, activity, participants in notifications
+            )
+        )
+
+        return len(notifications)
+
+    async def __notify_completion(
+        self,
+        challenge: ChallengeJoinPaymentAndUsers,
+        activity: ActivitySummary,
+        participants: Participants,
+    ) -> None:
+        """Emails a completed challenge's participants."""
+
+        # 1. Stored challenge unit conversion.
+        challenge.distance = self.conversion_manager.cm_to_miles(
+            distance=challenge.distance
+        )
+        challenge.pace = self.conversion_manager.cm_per_second_to_minutes_per_mile(
+            pace=challenge.pace
+        )
+
+        # 2. Send challenge completion notification
+        async with self.concurrency_limits.email:
+            await self.email_manager.completed_challenge_notification(
+                participants=participants,
+                challenge=challenge,
+                completed_challenge=CompletedChallenge(
+                    distance=self.conversion_manager.cm_to_miles(
+                        distance=activity.distance * 100
+                    ),
+                    pace=self.conversion_manager.cm_per_second_to_minutes_per_mile(
+                        pace=activity.average_speed * 100
+                    ),
                 ),
             )
 
-        return current_access
+    async def __retrieve_activity(
+        self, athlete_access: StravaAccessInDb, activity_id: int
+    ) -> ActivitySummary:
+        """Retrieves an activity, from the activity cache if possible. Otherwise
+        it is fetched from Strava, refreshing the access object first if it is
+        stale."""
+
+        key = (athlete_access.athlete_id, activity_id)
+        activity = self.activity_cache.get(key)
+        if activity:
+            return activity
+
+        athlete_access = await self.token_manager.obtain(current_access=athlete_access)
+
+        async with self.concurrency_limits.strava:
+            activity = await self.strava_client.get_activity(
+                access_token=athlete_access.access_token,
+                activity_id=activity_id,
+                priority=StravaRequestPriority.VALIDATION,
+            )
+
+        self.activity_cache.set(key, activity)
+        return activity
+
+    async def __retrieve_activities(
+        self, athlete_access: StravaAccessInDb, after: datetime, per_page: int
+    ) -> List[ActivitySummary]:
+        """Retrieves all of an athlete's activities started after a time."""
+
+        athlete_access = await self.token_manager.obtain(current_access=athlete_access)
+
+        activities: List[ActivitySummary] = []
+        page = 1
+        while True:
+            async with self.concurrency_limits.strava:
+                activities_page = await self.strava_client.list_activities(
+                    access_token=athlete_access.access_token,
+                    after=int(after.timestamp()),
+                    page=page,
+                    per_page=per_page,
+                    priority=StravaRequestPriority.BACKFILL,
+                )
+
+            activities.extend(activities_page)
+            if len(activities_page) < per_page:
+                return activities
+            page += 1
+
+    async def __retrieve_open_challenges(
+        self, user_id: int
+    ) -> List[ChallengeJoinPaymentAndUsers]:
+
+        return await self.challenges_repo.retrieve_many(
+            query_params=RetrieveChallengesAdapter(
+                challengee_user_id=user_id, challenge_complete=False
+            )
+        )
 
     async def __retrieve_participants(
         self, challenge: ChallengeJoinPaymentAndUsers
     ) -> Participants:
 
         return Participants(
-            challenger=await self.users_repo.retrieve(id=challenge.challenger),
-            challengee=await self.users_repo.retrieve(id=challenge.challengee),
+            challenger=await self.__retrieve_user(id=challenge.challenger),
+            challengee=await self.__retrieve_user(id=challenge.challengee),
         )
+
+    async def __retrieve_user(self, id: int) -> UserInDb:
+
+        return await self.users_repo.retrieve(id=id)
@@ -1,5 +1,4 @@
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+import aiohttp
 
 from app.dependencies import logger
 from app.settings import settings
@@ -13,26 +12,35 @@ from app.usecases.schemas.users import Participants
 
 
 class EmailManager(IEmailManager):
-    def __init__(self, strava_repo: IStravaRepo):
+    def __init__(self, strava_repo: IStravaRepo, client_session: aiohttp.ClientSession):
         self.strava_repo = strava_repo
+        self.client_session = client_session
 
     async def send(self, sender: str, recipient: str, subject: str, body: str) -> None:
-        """Sends an email."""
+        """Sends an email through Sendgrid's v3 Mail Send API."""
 
         # 1. Construct Message.
-        message = Mail(
-            from_email=sender,
-            to_emails=recipient,
-            subject=subject,
-            plain_text_content=body,
-        )
-
-        # 2. Instantiate Sendgrid Client.
-        sg = SendGridAPIClient(settings.sendgrid_api_key)
-
-        # 3. Send Message
+        message = {
+            "personalizations": [{"to": [{"email": recipient}]}],
+            "from": {"email": sender},
+            "subject": subject,
+            "content": [{"type": "text/plain", "value": body}],
+        }
+
+        # 2. Send Message
         try:
-            sg.send(message)
+            async with self.client_session.post(
+                settings.sendgrid_base_url + "/mail/send",
+                headers={"Authorization": f"Bearer {settings.sendgrid_api_key}"},
+                json=message,
+            ) as response:
+                if response.status >= 400:
+                    logger.error(
+                        "[EmailManager]: Sendgrid responded %s: %s",
+                        response.status,
+                        await response.text(),
+                    )
+                    return
         except Exception as e:
             logger.exception(e)
         else:
@@ -1,3 +1,7 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import List, Optional
+
 from eth_account.messages import encode_defunct
 from web3.auto import w3 as web3
 
@@ -6,19 +10,51 @@ from app.usecases.interfaces.services.signature_manager import ISignatureManager
 from app.usecases.schemas.ethereum import SignedMessage
 
 
-class SignatureManager(ISignatureManager):
-    def __init__(self):
-        pass
-
-    async def sign(self, challenge_id: str) -> SignedMessage:
-        """Signs a message."""
+def sign_messages(challenge_ids: List[str]) -> List[SignedMessage]:
+    """Signs a message per challenge id. CPU bound, so it is run in an executor
+    rather than on the event loop; module level, so that it can be sent to a
+    process pool."""
 
+    signed_messages = []
+    for challenge_id in challenge_ids:
         message = encode_defunct(text=challenge_id)
         signed_message = web3.eth.account.sign_message(
             message, private_key=settings.signer_private_key
         )
+        signed_messages.append(
+            SignedMessage(
+                hashed_message=signed_message.messageHash.hex(),
+                signature=signed_message.signature.hex(),
+            )
+        )
+
+    return signed_messages
+
 
-        return SignedMessage(
-            hashed_message=signed_message.messageHash.hex(),
-            signature=signed_message.signature.hex(),
+class SignatureManager(ISignatureManager):
+    def __init__(self, executor: Optional[Executor] = None, chunk_size: int = 100):
+        self.executor = executor  # The event loop's default executor if None
+        self.chunk_size = chunk_size
+
+    async def sign(self, challenge_id: str) -> SignedMessage:
+        """Signs a message."""
+
+        return (await self.sign_many(challenge_ids=[challenge_id]))[0]
+
+    async def sign_many(self, challenge_ids: List[str]) -> List[SignedMessage]:
+        """Signs a message per challenge id, in order. The ids are split into
+        chunks of `chunk_size` that are signed in parallel by the executor."""
+
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.executor,
+                    sign_messages,
+                    challenge_ids[start : start + self.chunk_size],
+                )
+                for start in range(0, len(challenge_ids), self.chunk_size)
+            )
         )
+
+        return [signed_message for chunk in chunks for signed_message in chunk]
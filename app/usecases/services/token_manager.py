@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+from app.dependencies import logger
+from app.libraries.concurrency import ConcurrencyLimits
+from app.libraries.single_flight import SingleFlight
+from app.usecases.interfaces.clients.strava import IStravaClient
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.repos.strava import IStravaRepo
+from app.usecases.interfaces.services.token_manager import ITokenManager
+from app.usecases.schemas.strava import StravaAccessInDb, StravaAccessUpdateAdapter
+
+REFRESH_LOCK = "strava_token_refresher"
+
+
+class TokenManager(ITokenManager):
+    def __init__(
+        self,
+        strava_client: IStravaClient,
+        strava_repo: IStravaRepo,
+        checkpoints_repo: ICheckpointsRepo,
+        single_flight: SingleFlight,
+        concurrency_limits: ConcurrencyLimits,
+        refresh_margin: int,
+    ):
+        self.strava_client = strava_client
+        self.strava_repo = strava_repo
+        self.checkpoints_repo = checkpoints_repo
+        self.single_flight = single_flight
+        self.concurrency_limits = concurrency_limits
+        self.refresh_margin = refresh_margin
+
+    async def obtain(self, current_access: StravaAccessInDb) -> StravaAccessInDb:
+        """Returns athlete's access object. Access is refreshed if the
+        currently stored access object is stale. Concurrent refreshes for the
+        same athlete share one call to Strava."""
+
+        now = time.time()
+
+        if current_access.expires_at >= now:
+            return current_access
+
+        return await self.single_flight.do(
+            current_access.athlete_id,
+            lambda: self.__refresh(
+                athlete_id=current_access.athlete_id, refresh_before=now
+            ),
+        )
+
+    async def refresh_expiring(self) -> int:
+        """Refreshes access objects that expire within the refresh margin,
+        so that webhooks rarely have to. Returns the number refreshed.
+
+        One sweep runs at a time, across processes; a sweep that finds another
+        in progress refreshes nothing."""
+
+        async with self.checkpoints_repo.lock(name=REFRESH_LOCK) as locked:
+            if not locked:
+                return 0
+
+            return await self.__refresh_expiring()
+
+    async def __refresh_expiring(self) -> int:
+        refresh_before = time.time() + self.refresh_margin
+
+        expiring_access = await self.strava_repo.retrieve_expiring(
+            expires_before=refresh_before
+        )
+
+        results = await asyncio.gather(
+            *(
+                self.single_flight.do(
+                    access.athlete_id,
+                    lambda access=access: self.__refresh(
+                        athlete_id=access.athlete_id, refresh_before=refresh_before
+                    ),
+                )
+                for access in expiring_access
+            ),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            if isinstance(result, Exception):
+                logger.exception(result)
+
+        return len([result for result in results if not isinstance(result, Exception)])
+
+    async def __refresh(
+        self, athlete_id: int, refresh_before: float
+    ) -> StravaAccessInDb:
+        """Refreshes an access object unless another caller already has."""
+
+        # 1. Re-read, since a previous refresh may have replaced the refresh token.
+        current_access = await self.strava_repo.retrieve(athlete_id=athlete_id)
+
+        if current_access.expires_at >= refresh_before:
+            return current_access
+
+        # 2. Refresh with Strava.
+        async with self.concurrency_limits.strava:
+            new_access = await self.strava_client.refresh_token(
+                refresh_token=current_access.refresh_token
+            )
+
+        # 3. Store refreshed access.
+        return await self.strava_repo.update(
+            athlete_id=athlete_id,
+            updated_access=StravaAccessUpdateAdapter(
+                access_token=new_access.access_token,
+                refresh_token=new_access.refresh_token,
+                expires_at=new_access.expires_at,
+            ),
+        )
@@ -0,0 +1,128 @@
+from app.dependencies import logger
+from app.libraries.cache import LRUCache
+from app.usecases.interfaces.repos.strava import IStravaRepo
+from app.usecases.interfaces.repos.webhook_events import IWebhookEventsRepo
+from app.usecases.interfaces.services.challange_validation import IChallengeValidation
+from app.usecases.interfaces.services.webhook_manager import IWebhookManager
+from app.usecases.schemas.strava import (
+    StravaAccessUpdateAdapter,
+    StravaRateLimitException,
+    StravaUnavailableException,
+    WebhookEvent,
+    WebhookEventInDb,
+)
+
+
+class WebhookManager(IWebhookManager):
+    def __init__(
+        self,
+        webhook_events_repo: IWebhookEventsRepo,
+        strava_repo: IStravaRepo,
+        challenge_validation: IChallengeValidation,
+        received_events: LRUCache,
+        activity_cache: LRUCache,
+        visibility_timeout: int,
+        max_attempts: int,
+        retry_delay: int,
+    ):
+        self.webhook_events_repo = webhook_events_repo
+        self.strava_repo = strava_repo
+        self.challenge_validation = challenge_validation
+        self.received_events = received_events
+        self.activity_cache = activity_cache
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    async def enqueue(self, event: WebhookEvent) -> None:
+        """Persists a webhook event for asynchronous processing. Redelivered
+        events are dropped, first by the in-process cache of recently received
+        events and otherwise by the queue's unique constraint."""
+
+        identity = (
+            event.owner_id,
+            event.object_id,
+            event.aspect_type,
+            event.event_time,
+        )
+
+        if self.received_events.get(identity):
+            return
+
+        if not await self.webhook_events_repo.enqueue(event=event):
+            logger.info("[WebhookManager]: Dropped redelivered event %s.", identity)
+
+        self.received_events.set(identity, True)
+
+    async def handle(self, event: WebhookEvent) -> None:
+        """Acts upon a single webhook event."""
+
+        if event.object_type == "activity" and event.aspect_type in (
+            "update",
+            "delete",
+        ):
+            # Any summary cached for the activity is now stale
+            self.activity_cache.pop((event.owner_id, event.object_id))
+
+        if event.aspect_type == "create" and event.object_type == "activity":
+            # The event is a newly submitted activity, so validate it against a challenge
+            await self.challenge_validation.validate(event=event)
+
+        elif (
+            event.aspect_type == "update" and event.updates.get("authorized") == "false"
+        ):
+            # The user revoked access to this application
+            await self.strava_repo.update(
+                athlete_id=event.owner_id,
+                updated_access=StravaAccessUpdateAdapter(scope=[]),
+            )
+
+    async def process_batch(self, batch_size: int) -> int:
+        """Claims and handles queued events. Returns the number of events claimed."""
+
+        # 1. Claim events that are not being processed by another worker.
+        events = await self.webhook_events_repo.claim(
+            limit=batch_size, visibility_timeout=self.visibility_timeout
+        )
+
+        # 2. Handle each event, returning failed events to the queue.
+        for event in events:
+            await self.__process(event=event)
+
+        return len(events)
+
+    async def __process(self, event: WebhookEventInDb) -> None:
+        """Handles a claimed event and records the outcome."""
+
+        if event.attempts > self.max_attempts:
+            # A worker repeatedly died while holding this event.
+            await self.webhook_events_repo.fail(
+                id=event.id, error=event.last_error or "Visibility timeout exceeded."
+            )
+            return
+
+        if await self.webhook_events_repo.superseded(event=event):
+            # A newer event for the same object was already acted upon.
+            await self.webhook_events_repo.complete(id=event.id)
+            return
+
+        try:
+            await self.handle(event=event)
+        except (StravaUnavailableException, StravaRateLimitException) as error:
+            # Strava is down or out of quota, which is no fault of the event.
+            logger.warning("[WebhookManager]: Deferred event %s: %s", event.id, error)
+            await self.webhook_events_repo.defer(
+                id=event.id, error=str(error), delay=self.retry_delay
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            logger.exception(error)
+            if event.attempts >= self.max_attempts:
+                await self.webhook_events_repo.fail(id=event.id, error=str(error))
+            else:
+                await self.webhook_events_repo.retry(
+                    id=event.id,
+                    error=str(error),
+                    delay=self.retry_delay * 2 ** (event.attempts - 1),
+                )
+        else:
+            await self.webhook_events_repo.complete(id=event.id)
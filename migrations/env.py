@@ -14,8 +14,11 @@ load_dotenv()
 # Import Tables
 from app.infrastructure.db.metadata import METADATA
 from app.infrastructure.db.models.challenges import CHALLENGES, PAYMENTS
+from app.infrastructure.db.models.checkpoints import CHECKPOINTS
+from app.infrastructure.db.models.onchain import ONCHAIN_CHALLENGES
 from app.infrastructure.db.models.strava import STRAVA_ACCESS
 from app.infrastructure.db.models.users import USERS
+from app.infrastructure.db.models.webhook_events import WEBHOOK_EVENTS
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,38 @@
+"""Webhook Event Identity
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the first delivery of events that were received more than once
+    op.execute(
+        """
+        DELETE FROM webhook_events duplicate
+        USING webhook_events original
+        WHERE duplicate.owner_id = original.owner_id
+            AND duplicate.object_id = original.object_id
+            AND duplicate.aspect_type = original.aspect_type
+            AND duplicate.event_time = original.event_time
+            AND duplicate.id > original.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_webhook_events_identity",
+        "webhook_events",
+        ["owner_id", "object_id", "aspect_type", "event_time"],
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_webhook_events_identity", "webhook_events", type_="unique")
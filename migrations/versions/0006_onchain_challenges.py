@@ -0,0 +1,50 @@
+"""On-chain challenges
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "onchain_challenges",
+        sa.Column("challenge_id", sa.String(), nullable=False),
+        sa.Column("challenger", sa.String(), nullable=False),
+        sa.Column("challengee", sa.String(), nullable=False),
+        sa.Column("bounty", sa.Numeric(78, 0), nullable=False),
+        sa.Column("distance", sa.BigInteger(), nullable=False),
+        sa.Column("speed", sa.BigInteger(), nullable=False),
+        sa.Column("issued_at", sa.BigInteger(), nullable=False),
+        sa.Column("complete", sa.Boolean(), nullable=False),
+        sa.Column("block_number", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("challenge_id"),
+    )
+    op.create_index(
+        op.f("ix_onchain_challenges_block_number"),
+        "onchain_challenges",
+        ["block_number"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_onchain_challenges_block_number"), table_name="onchain_challenges"
+    )
+    op.drop_table("onchain_challenges")
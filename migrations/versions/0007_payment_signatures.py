@@ -0,0 +1,25 @@
+"""Payment Signatures
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("payments", sa.Column("hashed_message", sa.String(), nullable=True))
+    op.add_column("payments", sa.Column("signature", sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("payments", "signature")
+    op.drop_column("payments", "hashed_message")
@@ -0,0 +1,103 @@
+"""Challenge Query Indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# NOTE: Indexes are built CONCURRENTLY, so that writes to the live tables are
+# not blocked while they build. That cannot run inside a transaction, hence the
+# autocommit blocks. If a build fails, Postgres leaves an INVALID index behind,
+# which must be dropped before rerunning the migration.
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # Webhook path: open challenges for a challengee
+        op.create_index(
+            "ix_challenges_challengee_open",
+            "challenges",
+            ["challengee"],
+            postgresql_where=sa.text("NOT complete"),
+            postgresql_concurrently=True,
+        )
+        # Claim path: completed challenges for a challengee, their unpaid
+        # payments and the challengee's address
+        op.create_index(
+            "ix_challenges_challengee_complete",
+            "challenges",
+            ["challengee"],
+            postgresql_where=sa.text("complete"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_payments_challenge_id_unpaid",
+            "payments",
+            ["challenge_id"],
+            postgresql_include=["id", "hashed_message", "signature"],
+            postgresql_where=sa.text("NOT complete"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_address_id",
+            "users",
+            ["address"],
+            postgresql_include=["id"],
+            postgresql_concurrently=True,
+        )
+        # A challenge has one payment: build a unique index to replace the
+        # non-unique one, then take over its name.
+        op.create_index(
+            "ix_payments_challenge_id_unique",
+            "payments",
+            ["challenge_id"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_payments_challenge_id",
+            table_name="payments",
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            "ALTER INDEX ix_payments_challenge_id_unique "
+            "RENAME TO ix_payments_challenge_id"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_payments_challenge_id_non_unique",
+            "payments",
+            ["challenge_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_payments_challenge_id",
+            table_name="payments",
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            "ALTER INDEX ix_payments_challenge_id_non_unique "
+            "RENAME TO ix_payments_challenge_id"
+        )
+        for index_name, table_name in (
+            ("ix_users_address_id", "users"),
+            ("ix_payments_challenge_id_unpaid", "payments"),
+            ("ix_challenges_challengee_complete", "challenges"),
+            ("ix_challenges_challengee_open", "challenges"),
+        ):
+            op.drop_index(
+                index_name, table_name=table_name, postgresql_concurrently=True
+            )
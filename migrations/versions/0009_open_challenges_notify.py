@@ -0,0 +1,57 @@
+"""Open Challenges Notify
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# NOTE: Every change to a challengee's open challenges is notified on the
+# open_challenges channel, with the challengee's id as payload, so that each
+# process's open challenges index can recount them. A truncate notifies an empty
+# payload, for a full reload.
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE FUNCTION notify_open_challenges() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                PERFORM pg_notify('open_challenges', '');
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_notify('open_challenges', OLD.challengee::text);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_notify('open_challenges', NEW.challengee::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER challenges_notify_open_challenges "
+        "AFTER INSERT OR DELETE OR UPDATE OF complete, challengee ON challenges "
+        "FOR EACH ROW EXECUTE FUNCTION notify_open_challenges()"
+    )
+    op.execute(
+        "CREATE TRIGGER challenges_notify_open_challenges_truncate "
+        "AFTER TRUNCATE ON challenges "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_open_challenges()"
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER challenges_notify_open_challenges_truncate ON challenges")
+    op.execute("DROP TRIGGER challenges_notify_open_challenges ON challenges")
+    op.execute("DROP FUNCTION notify_open_challenges()")
@@ -0,0 +1,132 @@
+"""Measures ChallengeValidation.validate wall-clock latency per webhook against
+the mocks in tests/mocks, with simulated latency for every dependency.
+
+Usage: python -m tests.benchmarks.bench_challenge_validation
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from app.libraries.cache import LRUCache
+from app.libraries.concurrency import ConcurrencyLimits
+from app.usecases.schemas.challenges import ChallengeJoinPaymentAndUsers
+from app.usecases.schemas.strava import StravaAccessInDb, WebhookEvent
+from app.usecases.schemas.users import UserInDb
+from app.usecases.services.challenge_validation import ChallengeValidation
+from app.usecases.services.conversion_manager import ConversionManager
+from app.usecases.services.signature_manager import SignatureManager
+from tests.constants import CHALLENGE_PASSING_ACTIVITY_ID, TEST_ATHLETE_ID
+from tests.mocks.mock_strava_client import MockStravaClient
+
+DATABASE_LATENCY = 0.002  # Seconds
+STRAVA_LATENCY = 0.080
+EMAIL_LATENCY = 0.050
+OPEN_CHALLENGES = 3
+ITERATIONS = 20
+
+
+def with_latency(latency: float, result=None) -> AsyncMock:
+    async def call(*args, **kwargs):
+        await asyncio.sleep(latency)
+        return result
+
+    return AsyncMock(side_effect=call)
+
+
+class LatentStravaClient(MockStravaClient):
+    async def get_activity(self, *args, **kwargs):
+        await asyncio.sleep(STRAVA_LATENCY)
+        return await super().get_activity(*args, **kwargs)
+
+
+def build_service() -> ChallengeValidation:
+    now = datetime.now()
+
+    async def complete_challenge(id: str, signed_message):
+        await asyncio.sleep(DATABASE_LATENCY)
+        return challenges[int(id)]
+
+    user = UserInDb(id=1, email="user@example.com", created_at=now, updated_at=now)
+    access = StravaAccessInDb(
+        athlete_id=TEST_ATHLETE_ID,
+        user_id=1,
+        access_token="token",
+        refresh_token="refresh",
+        expires_at=int(time.time()) + 3600,
+        scope=["activity:read_all"],
+        created_at=now,
+        updated_at=now,
+    )
+    challenges = [
+        ChallengeJoinPaymentAndUsers(
+            id=str(number),
+            challenger=2,
+            challengee=1,
+            bounty=1000,
+            distance=800000.0,
+            pace=250,
+            complete=False,
+            created_at=now,
+            updated_at=now,
+            payment_complete=False,
+            payment_id=number,
+        )
+        for number in range(OPEN_CHALLENGES)
+    ]
+
+    strava_repo = AsyncMock()
+    strava_repo.retrieve = with_latency(DATABASE_LATENCY, access)
+    challenges_repo = AsyncMock()
+    challenges_repo.has_open_challenges = AsyncMock(return_value=True)
+    challenges_repo.retrieve_many = with_latency(DATABASE_LATENCY, challenges)
+    challenges_repo.complete_challenge = AsyncMock(side_effect=complete_challenge)
+    users_repo = AsyncMock()
+    users_repo.retrieve = with_latency(DATABASE_LATENCY, user)
+    email_manager = AsyncMock()
+    email_manager.completed_challenge_notification = with_latency(EMAIL_LATENCY)
+    token_manager = AsyncMock()
+    token_manager.obtain = AsyncMock(return_value=access)
+
+    return ChallengeValidation(
+        strava_client=LatentStravaClient(),
+        strava_repo=strava_repo,
+        users_repo=users_repo,
+        challenges_repo=challenges_repo,
+        email_manager=email_manager,
+        conversion_manager=ConversionManager(),
+        token_manager=token_manager,
+        signature_manager=SignatureManager(),
+        activity_cache=LRUCache(maxsize=OPEN_CHALLENGES),
+        concurrency_limits=ConcurrencyLimits(strava=10, email=10),
+    )
+
+
+async def main() -> None:
+    event = WebhookEvent(
+        aspect_type="create",
+        event_time=1655410924,
+        object_id=CHALLENGE_PASSING_ACTIVITY_ID,
+        object_type="activity",
+        owner_id=TEST_ATHLETE_ID,
+        subscription_id=218213,
+        updates={},
+    )
+
+    timings = []
+    for _ in range(ITERATIONS):
+        service = build_service()
+        start = time.perf_counter()
+        await service.validate(event=event)
+        timings.append(time.perf_counter() - start)
+
+    print(
+        f"validate() with {OPEN_CHALLENGES} completed challenges: "
+        f"median {statistics.median(timings) * 1000:.1f} ms, "
+        f"max {max(timings) * 1000:.1f} ms over {ITERATIONS} runs"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""Measures the per-request cost of providing an Ethereum client through
+dependency injection, before and after the client became process-wide.
+
+Usage: python -m tests.benchmarks.bench_ethereum_client
+"""
+import asyncio
+import base64
+import json
+import time
+
+from web3 import Web3
+
+from app.dependencies import get_ethereum_client
+from app.libraries.cache import LRUCache
+from app.settings import settings
+from tests.test_infrastructure.test_clients.test_ethereum_client import (
+    ABI,
+    CONTRACT_ADDRESS,
+)
+
+ITERATIONS = 1000
+
+# Pad the ABI with functions like those of the deployed contract, so that
+# parsing it costs about what it does in production
+PADDED_ABI = ABI + [
+    {
+        "name": f"function{number}",
+        "type": "function",
+        "stateMutability": "nonpayable",
+        "inputs": [
+            {"name": "challengeId", "type": "string"},
+            {"name": "account", "type": "address"},
+            {"name": "amount", "type": "uint256"},
+        ],
+        "outputs": [{"name": "", "type": "bool"}],
+    }
+    for number in range(30)
+]
+
+
+def build_per_request() -> None:
+    """What get_ethereum_client did for every request before."""
+
+    web3 = Web3(Web3.HTTPProvider(settings.rpc_url))
+    web3.eth.contract(
+        address=settings.contract_address,
+        abi=json.loads(base64.b64decode(settings.abi)),
+    )
+
+
+async def main() -> None:
+    settings.abi = base64.b64encode(json.dumps(PADDED_ABI).encode()).decode()
+    settings.contract_address = CONTRACT_ADDRESS
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        build_per_request()
+    before = (time.perf_counter() - start) / ITERATIONS
+
+    cache = LRUCache(maxsize=1)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await get_ethereum_client(client_session=None, challenge_cache=cache)
+    after = (time.perf_counter() - start) / ITERATIONS
+
+    print(
+        f"get_ethereum_client() with {len(PADDED_ABI)} ABI entries: "
+        f"{before * 1e6:.1f} us per request before, {after * 1e6:.1f} us after"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""Measures round trips and latency per repo write, for the previous
+write-then-retrieve pattern and for the single statements that return the
+written rows. Runs against the test database in a transaction that is rolled
+back, first over loopback and then with a simulated network round trip per
+statement, as to a database in another availability zone.
+
+Usage: python -m tests.benchmarks.bench_repos
+"""
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+
+from databases import Database
+from sqlalchemy import and_
+
+from app.infrastructure.db.models.challenges import CHALLENGES, PAYMENTS
+from app.infrastructure.db.models.users import USERS
+from app.infrastructure.db.repos.challenges import ChallengesRepo, OpenChallengesIndex
+from app.infrastructure.db.repos.users import UsersRepo
+from app.settings import settings
+from app.usecases.schemas.challenges import CreateChallengeRepoAdapter
+from app.usecases.schemas.ethereum import SignedMessage
+from app.usecases.schemas.users import UserBase
+
+ITERATIONS = 500
+ROUND_TRIPS = (0, 0.0005)  # Seconds of simulated network latency per statement
+
+
+class CountingDatabase:
+    """Counts the statements sent through a Database, including a transaction's
+    BEGIN and COMMIT, and delays each by `round_trip` seconds."""
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.round_trip = 0.0
+        self.statements = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.db, name)
+
+    async def __send(self) -> None:
+        self.statements += 1
+        await asyncio.sleep(self.round_trip)
+
+    @asynccontextmanager
+    async def transaction(self):
+        await self.__send()
+        async with self.db.transaction():
+            yield
+        await self.__send()
+
+    async def execute(self, query):
+        await self.__send()
+        return await self.db.execute(query)
+
+    async def fetch_one(self, query):
+        await self.__send()
+        return await self.db.fetch_one(query)
+
+    async def fetch_all(self, query):
+        await self.__send()
+        return await self.db.fetch_all(query)
+
+    async def fetch_val(self, query):
+        await self.__send()
+        return await self.db.fetch_val(query)
+
+
+def new_user() -> UserBase:
+    return UserBase(email=f"{uuid.uuid4()}@example.com", address=str(uuid.uuid4()))
+
+
+def new_challenge(challenger: int, challengee: int) -> CreateChallengeRepoAdapter:
+    return CreateChallengeRepoAdapter(
+        id=str(uuid.uuid4()),
+        challenger=challenger,
+        challengee=challengee,
+        bounty=1000,
+        distance=800000.0,
+        pace=250,
+    )
+
+
+class PreviousUsersRepo(UsersRepo):
+    """UsersRepo.create as it was: insert, then retrieve."""
+
+    async def create(self, new_user: UserBase):
+        id = await self.db.execute(
+            USERS.insert().values(
+                email=new_user.email, address=new_user.address, name=new_user.name
+            )
+        )
+        return await self.retrieve(id=id)
+
+
+class PreviousChallengesRepo(ChallengesRepo):
+    """ChallengesRepo writes as they were: insert or update, then retrieve."""
+
+    async def create(self, new_challenge: CreateChallengeRepoAdapter):
+        async with self.db.transaction():
+            await self.db.execute(
+                CHALLENGES.insert().values(**new_challenge.dict(), complete=False)
+            )
+            await self.db.execute(
+                PAYMENTS.insert().values(challenge_id=new_challenge.id, complete=False)
+            )
+        return await self.retrieve(id=new_challenge.id)
+
+    async def complete_challenge(self, id: str, signed_message: SignedMessage):
+        async with self.db.transaction():
+            await self.db.fetch_val(
+                CHALLENGES.update()
+                .values(complete=True)
+                .where(and_(CHALLENGES.c.id == id, CHALLENGES.c.complete == False))
+                .returning(CHALLENGES.c.challengee)
+            )
+            await self.db.execute(
+                PAYMENTS.update()
+                .values(
+                    hashed_message=signed_message.hashed_message,
+                    signature=signed_message.signature,
+                )
+                .where(PAYMENTS.c.challenge_id == id)
+            )
+        return await self.retrieve(id=id)
+
+
+async def measure(
+    name: str, db: CountingDatabase, write: Callable[[], Awaitable]
+) -> None:
+    db.statements = 0
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await write()
+    elapsed = (time.perf_counter() - start) / ITERATIONS
+
+    print(
+        f"    {name}: {db.statements / ITERATIONS:.0f} statements, "
+        f"{elapsed * 1e6:.0f} us per write"
+    )
+
+
+async def bench(label: str, db: CountingDatabase, users_repo, challenges_repo) -> None:
+    print(f"  {label}")
+    challenger = await users_repo.create(new_user=new_user())
+    challengee = await users_repo.create(new_user=new_user())
+    challenge_ids = []
+
+    async def create_user():
+        await users_repo.create(new_user=new_user())
+
+    async def create_challenge():
+        challenge = await challenges_repo.create(
+            new_challenge=new_challenge(
+                challenger=challenger.id, challengee=challengee.id
+            )
+        )
+        challenge_ids.append(challenge.id)
+
+    async def complete_challenge():
+        await challenges_repo.complete_challenge(
+            id=challenge_ids.pop(),
+            signed_message=SignedMessage(hashed_message="0x01", signature="0x02"),
+        )
+
+    await measure("UsersRepo.create", db, create_user)
+    await measure("ChallengesRepo.create", db, create_challenge)
+    await measure("ChallengesRepo.complete_challenge", db, complete_challenge)
+
+
+async def main() -> None:
+    database = Database(settings.db_url, force_rollback=True)
+    await database.connect()
+    db = CountingDatabase(database)
+
+    try:
+        index = OpenChallengesIndex()
+        for round_trip in ROUND_TRIPS:
+            db.round_trip = round_trip
+            print(f"{round_trip * 1000:g} ms simulated round trip")
+            await bench(
+                "Write, then retrieve:",
+                db,
+                PreviousUsersRepo(db=db),
+                PreviousChallengesRepo(db=db, open_challenges_index=index),
+            )
+            await bench(
+                "Single statement with RETURNING:",
+                db,
+                UsersRepo(db=db),
+                ChallengesRepo(db=db, open_challenges_index=index),
+            )
+    finally:
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""Measures the webhook validation path end to end against a local fake Strava
+server: the real StravaClient, rate limiter, circuit breaker and pooled client
+session, with detailed activity payloads, long-tailed latency and occasional
+server errors. Database and email dependencies are mocked with fixed latency.
+
+Usage: python -m tests.benchmarks.bench_webhook_path
+"""
+import asyncio
+import ssl
+import statistics
+import time
+
+from app.infrastructure.clients.rate_limiter import StravaRateLimiter
+from app.infrastructure.clients.strava import StravaClient
+from app.libraries.cache import LRUCache
+from app.libraries.circuit_breaker import CircuitBreaker
+from app.libraries.concurrency import ConcurrencyLimits
+from app.libraries.http_pool import create_client_session
+from app.libraries.metrics import MetricsRegistry
+from app.usecases.schemas.strava import WebhookEvent
+from app.usecases.services.challenge_validation import ChallengeValidation
+from app.usecases.services.conversion_manager import ConversionManager
+from tests.benchmarks.bench_challenge_validation import build_service
+from tests.constants import CHALLENGE_FAILING_ACTIVITY_ID, TEST_ATHLETE_ID
+from tests.mocks.fake_strava_server import FakeStravaServer, lognormal
+
+STRAVA_LATENCY = 0.080  # Median seconds
+ERROR_RATE = 0.02
+EFFORTS = 200
+WEBHOOKS = 500
+CONCURRENCY = 50
+
+
+def build_strava_client(base_url: str, metrics: MetricsRegistry) -> StravaClient:
+    return StravaClient(
+        client_session=create_client_session(
+            name="pool",
+            limit=100,
+            limit_per_host=30,
+            keepalive_timeout=30,
+            dns_cache_ttl=300,
+            timeout=30,
+            ssl_context=ssl.create_default_context(),
+            metrics=metrics,
+        ),
+        base_url=base_url,
+        rate_limiter=StravaRateLimiter(
+            short_term_limit=100000,
+            daily_limit=1000000,
+            utilization=0.95,
+            max_wait=60,
+            metrics=metrics,
+        ),
+        circuit_breaker=CircuitBreaker(
+            error_rate=0.5, window=20, minimum_calls=10, reset_timeout=30
+        ),
+        request_timeout=10,
+        max_retries=3,
+        retry_backoff=0.05,
+        retry_backoff_max=1,
+    )
+
+
+def build_validation(strava_client: StravaClient) -> ChallengeValidation:
+    service = build_service()
+
+    return ChallengeValidation(
+        strava_client=strava_client,
+        strava_repo=service.strava_repo,
+        users_repo=service.users_repo,
+        challenges_repo=service.challenges_repo,
+        email_manager=service.email_manager,
+        conversion_manager=ConversionManager(),
+        token_manager=service.token_manager,
+        signature_manager=service.signature_manager,
+        activity_cache=LRUCache(maxsize=WEBHOOKS),
+        concurrency_limits=ConcurrencyLimits(strava=CONCURRENCY, email=CONCURRENCY),
+    )
+
+
+async def main() -> None:
+    server = FakeStravaServer(
+        latency=lognormal(STRAVA_LATENCY), error_rate=ERROR_RATE, efforts=EFFORTS
+    )
+    await server.start()
+    metrics = MetricsRegistry()
+    strava_client = build_strava_client(base_url=server.base_url, metrics=metrics)
+    service = build_validation(strava_client=strava_client)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def validate(activity_id: int) -> float:
+        event = WebhookEvent(
+            aspect_type="create",
+            event_time=1655410924,
+            object_id=activity_id,
+            object_type="activity",
+            owner_id=TEST_ATHLETE_ID,
+            subscription_id=218213,
+            updates={},
+        )
+        async with semaphore:
+            start = time.perf_counter()
+            await service.validate(event=event)
+            return time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        # Every activity falls short of the challenges, so each webhook costs a
+        # Strava fetch and nothing else, and the shared mock challenges stay as is
+        timings = await asyncio.gather(
+            *(
+                validate(activity_id=CHALLENGE_FAILING_ACTIVITY_ID + number)
+                for number in range(WEBHOOKS)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        await strava_client.client_session.close()
+        await server.close()
+
+    percentiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{WEBHOOKS} webhooks, {CONCURRENCY} at a time, {EFFORTS} efforts per "
+        f"activity: p50 {percentiles[49] * 1000:.1f} ms, "
+        f"p95 {percentiles[94] * 1000:.1f} ms, "
+        f"{WEBHOOKS / elapsed:.0f} webhooks/s"
+    )
+    print(
+        f"Strava: {server.requests} requests, {server.errors} server errors, "
+        f"{server.throttled} throttled"
+    )
+    for name, value in metrics.snapshot().items():
+        print(f"  {name} = {value:g}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
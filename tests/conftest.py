@@ -2,6 +2,7 @@ import os
 import uuid
 from typing import List, Tuple
 
+import aiohttp
 import pytest_asyncio
 import respx
 from databases import Database
@@ -15,32 +16,50 @@ from app.dependencies import (
     get_strava_client,
     get_strava_repo,
     get_users_repo,
+    get_webhook_manager_service,
 )
 from app.infrastructure.db.repos.challenges import ChallengesRepo
+from app.infrastructure.db.repos.checkpoints import CheckpointsRepo
+from app.infrastructure.db.repos.onchain_challenges import OnchainChallengesRepo
 from app.infrastructure.db.repos.strava import StravaRepo
 from app.infrastructure.db.repos.users import UsersRepo
+from app.infrastructure.db.repos.webhook_events import WebhookEventsRepo
 from app.infrastructure.web.setup import setup_app
+from app.libraries.cache import LRUCache
+from app.libraries.concurrency import ConcurrencyLimits
+from app.libraries.single_flight import SingleFlight
 from app.usecases.interfaces.clients.ethereum import IEthereumClient
 from app.usecases.interfaces.clients.strava import IStravaClient
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
 from app.usecases.interfaces.repos.strava import IStravaRepo
 from app.usecases.interfaces.repos.users import IUsersRepo
+from app.usecases.interfaces.repos.webhook_events import IWebhookEventsRepo
+from app.usecases.interfaces.services.backfill_manager import IBackfillManager
 from app.usecases.interfaces.services.challange_manager import IChallengeManager
 from app.usecases.interfaces.services.challange_validation import IChallengeValidation
+from app.usecases.interfaces.services.challenge_indexer import IChallengeIndexer
 from app.usecases.interfaces.services.conversion_manager import IConversionManager
 from app.usecases.interfaces.services.email_manager import IEmailManager
 from app.usecases.interfaces.services.signature_manager import ISignatureManager
+from app.usecases.interfaces.services.token_manager import ITokenManager
+from app.usecases.interfaces.services.webhook_manager import IWebhookManager
 from app.usecases.schemas.challenges import (
     ChallengeJoinPaymentAndUsers,
     CreateChallengeRepoAdapter,
 )
 from app.usecases.schemas.strava import CreateStravaAccessAdapter, StravaAccessInDb
 from app.usecases.schemas.users import UserBase, UserInDb
+from app.usecases.services.backfill_manager import BackfillManager
+from app.usecases.services.challenge_indexer import ChallengeIndexer
 from app.usecases.services.challenge_manager import ChallengeManager
 from app.usecases.services.challenge_validation import ChallengeValidation
 from app.usecases.services.conversion_manager import ConversionManager
 from app.usecases.services.email_manager import EmailManager
 from app.usecases.services.signature_manager import SignatureManager
+from app.usecases.services.token_manager import TokenManager
+from app.usecases.services.webhook_manager import WebhookManager
 from tests.constants import (
     CHALLENGEE_ADDRESS,
     CHALLENGER_ADDRESS,
@@ -74,6 +93,9 @@ async def test_db(test_db_url) -> Database:
     await test_db.execute("TRUNCATE payments CASCADE")
     await test_db.execute("TRUNCATE users CASCADE")
     await test_db.execute("TRUNCATE strava_access CASCADE")
+    await test_db.execute("TRUNCATE webhook_events CASCADE")
+    await test_db.execute("TRUNCATE checkpoints CASCADE")
+    await test_db.execute("TRUNCATE onchain_challenges CASCADE")
     await test_db.disconnect()
 
 
@@ -93,7 +115,28 @@ async def challenges_repo(test_db: Database) -> IChallengesRepo:
     return ChallengesRepo(db=test_db)
 
 
+@pytest_asyncio.fixture
+async def webhook_events_repo(test_db: Database) -> IWebhookEventsRepo:
+    return WebhookEventsRepo(db=test_db)
+
+
+@pytest_asyncio.fixture
+async def checkpoints_repo(test_db: Database) -> ICheckpointsRepo:
+    return CheckpointsRepo(db=test_db)
+
+
+@pytest_asyncio.fixture
+async def onchain_challenges_repo(test_db: Database) -> IOnchainChallengesRepo:
+    return OnchainChallengesRepo(db=test_db)
+
+
 # Clients
+@pytest_asyncio.fixture
+async def client_session() -> aiohttp.ClientSession:
+    async with aiohttp.ClientSession() as client_session:
+        yield client_session
+
+
 @pytest_asyncio.fixture
 async def strava_client() -> IStravaClient:
     return MockStravaClient()
@@ -116,8 +159,37 @@ async def conversion_manager_service() -> IConversionManager:
 
 
 @pytest_asyncio.fixture
-async def email_manager_service(strava_repo: IStravaRepo) -> IEmailManager:
-    return EmailManager(strava_repo=strava_repo)
+async def email_manager_service(
+    strava_repo: IStravaRepo, client_session: aiohttp.ClientSession
+) -> IEmailManager:
+    return EmailManager(strava_repo=strava_repo, client_session=client_session)
+
+
+@pytest_asyncio.fixture
+async def activity_cache() -> LRUCache:
+    return LRUCache(maxsize=100, ttl=60)
+
+
+@pytest_asyncio.fixture
+async def concurrency_limits() -> ConcurrencyLimits:
+    return ConcurrencyLimits(strava=5, email=5)
+
+
+@pytest_asyncio.fixture
+async def token_manager_service(
+    strava_client: IStravaClient,
+    strava_repo: IStravaRepo,
+    checkpoints_repo: ICheckpointsRepo,
+    concurrency_limits: ConcurrencyLimits,
+) -> ITokenManager:
+    return TokenManager(
+        strava_client=strava_client,
+        strava_repo=strava_repo,
+        checkpoints_repo=checkpoints_repo,
+        single_flight=SingleFlight(),
+        concurrency_limits=concurrency_limits,
+        refresh_margin=1800,
+    )
 
 
 @pytest_asyncio.fixture
@@ -128,6 +200,10 @@ async def challenge_validation_service(
     challenges_repo: IChallengesRepo,
     email_manager_service: IEmailManager,
     conversion_manager_service: IConversionManager,
+    token_manager_service: ITokenManager,
+    signature_manager_service: ISignatureManager,
+    activity_cache: LRUCache,
+    concurrency_limits: ConcurrencyLimits,
 ) -> IChallengeValidation:
 
     return ChallengeValidation(
@@ -137,6 +213,10 @@ async def challenge_validation_service(
         challenges_repo=challenges_repo,
         email_manager=email_manager_service,
         conversion_manager=conversion_manager_service,
+        token_manager=token_manager_service,
+        signature_manager=signature_manager_service,
+        activity_cache=activity_cache,
+        concurrency_limits=concurrency_limits,
     )
 
 
@@ -145,6 +225,7 @@ async def challenge_manager_service(
     ethereum_client: IEthereumClient,
     users_repo: IUsersRepo,
     challenges_repo: IChallengesRepo,
+    onchain_challenges_repo: IOnchainChallengesRepo,
     signature_manager_service: ISignatureManager,
     email_manager_service: IEmailManager,
     conversion_manager_service: IConversionManager,
@@ -155,9 +236,68 @@ async def challenge_manager_service(
         ethereum_client=ethereum_client,
         users_repo=users_repo,
         challenges_repo=challenges_repo,
+        onchain_challenges_repo=onchain_challenges_repo,
         signature_manager=signature_manager_service,
         email_manager=email_manager_service,
         conversion_manager=conversion_manager_service,
+        confirmation_timeout=0.1,
+        payment_confirmation_timeout=0.1,
+        confirmation_backoff=0.01,
+        confirmation_backoff_max=0.05,
+    )
+
+
+@pytest_asyncio.fixture
+async def backfill_manager_service(
+    strava_repo: IStravaRepo,
+    checkpoints_repo: ICheckpointsRepo,
+    challenge_validation_service: IChallengeValidation,
+) -> IBackfillManager:
+
+    return BackfillManager(
+        strava_repo=strava_repo,
+        checkpoints_repo=checkpoints_repo,
+        challenge_validation=challenge_validation_service,
+        concurrency=2,
+        batch_size=1,
+        per_page=2,
+    )
+
+
+@pytest_asyncio.fixture
+async def challenge_indexer_service(
+    ethereum_client: IEthereumClient,
+    onchain_challenges_repo: IOnchainChallengesRepo,
+    checkpoints_repo: ICheckpointsRepo,
+) -> IChallengeIndexer:
+
+    return ChallengeIndexer(
+        ethereum_client=ethereum_client,
+        onchain_challenges_repo=onchain_challenges_repo,
+        checkpoints_repo=checkpoints_repo,
+        start_block=0,
+        block_range=4,
+        finality_depth=10,
+    )
+
+
+@pytest_asyncio.fixture
+async def webhook_manager_service(
+    webhook_events_repo: IWebhookEventsRepo,
+    strava_repo: IStravaRepo,
+    challenge_validation_service: IChallengeValidation,
+    activity_cache: LRUCache,
+) -> IWebhookManager:
+
+    return WebhookManager(
+        webhook_events_repo=webhook_events_repo,
+        strava_repo=strava_repo,
+        challenge_validation=challenge_validation_service,
+        received_events=LRUCache(maxsize=100),
+        activity_cache=activity_cache,
+        visibility_timeout=300,
+        max_attempts=3,
+        retry_delay=0,
     )
 
 
@@ -317,6 +457,7 @@ def test_app(
     challenges_repo: IChallengesRepo,
     challenge_manager_service: IChallengeManager,
     challenge_validation_service: IChallengeValidation,
+    webhook_manager_service: IWebhookManager,
     users_repo: IUsersRepo,
 ) -> FastAPI:
     app = setup_app()
@@ -330,6 +471,9 @@ def test_app(
     app.dependency_overrides[
         get_challenge_validation_service
     ] = lambda: challenge_validation_service
+    app.dependency_overrides[
+        get_webhook_manager_service
+    ] = lambda: webhook_manager_service
     return app
 
 
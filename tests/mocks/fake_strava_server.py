@@ -0,0 +1,251 @@
+"""A local stand-in for Strava's API, served over HTTP so that the real
+StravaClient, connection pool and JSON decoding are exercised without network
+access. Latency, server errors, rate limiting and payload size are configurable.
+"""
+import asyncio
+import json
+import math
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from tests.constants import (
+    CHALLENGE_FAILING_DISTANCE,
+    CHALLENGE_PASSING_ACTIVITY_ID,
+    CHALLENGE_PASSING_DISTANCE,
+    TEST_ATHLETE_ID,
+)
+
+POLYLINE = "wuk}Ftz~tOED@FAI@@BGIICYQWOIMOCO@QAa@DOBc@DCTq@DEh@oALQXu@LOTu@r@{AJG" * 20
+
+
+def constant(seconds: float) -> Callable[[], float]:
+    """Latency distribution that always takes `seconds`."""
+
+    return lambda: seconds
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Callable[[], float]:
+    """Long-tailed latency distribution around `median` seconds."""
+
+    return lambda: random.lognormvariate(math.log(median), sigma)
+
+
+class FakeStravaServer:
+    """Serves POST /oauth/token, GET /activities/{id} and GET /athlete/activities.
+
+    - `latency` is sampled for every request.
+    - `error_rate` is the share of requests answered with a 503.
+    - Usage is counted against `short_term_limit` and `daily_limit` and
+      reported in X-RateLimit headers; requests beyond either get a 429.
+    - Detailed activities carry `efforts` segment efforts, and as many splits
+      and best efforts, to match the size of real responses.
+    """
+
+    def __init__(
+        self,
+        latency: Callable[[], float] = constant(0),
+        error_rate: float = 0,
+        short_term_limit: int = 100000,
+        daily_limit: int = 1000000,
+        efforts: int = 100,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.short_term_limit = short_term_limit
+        self.daily_limit = daily_limit
+        self.efforts = efforts
+        self.usage = 0
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.server: Optional[TestServer] = None
+
+        app = web.Application(middlewares=[self.__middleware])
+        app.router.add_post("/oauth/token", self.__token)
+        app.router.add_get("/activities/{id}", self.__activity)
+        app.router.add_get("/athlete/activities", self.__activities)
+        self.app = app
+
+    @property
+    def base_url(self) -> str:
+        return str(self.server.make_url("")).rstrip("/")
+
+    async def start(self) -> str:
+        """Starts serving on a free local port and returns the base url."""
+
+        self.server = TestServer(self.app)
+        await self.server.start_server()
+        return self.base_url
+
+    async def close(self) -> None:
+        await self.server.close()
+
+    def __rate_limit_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": f"{self.short_term_limit},{self.daily_limit}",
+            "X-RateLimit-Usage": f"{self.usage},{self.usage}",
+        }
+
+    @web.middleware
+    async def __middleware(self, request: web.Request, handler) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency())
+
+        if self.usage >= min(self.short_term_limit, self.daily_limit):
+            self.throttled += 1
+            return web.json_response(
+                {"message": "Rate Limit Exceeded"},
+                status=429,
+                headers=self.__rate_limit_headers(),
+            )
+
+        self.usage += 1
+
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response(
+                {"message": "Service Unavailable"},
+                status=503,
+                headers=self.__rate_limit_headers(),
+            )
+
+        response = await handler(request)
+        response.headers.update(self.__rate_limit_headers())
+        return response
+
+    async def __token(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "token_type": "Bearer",
+                "access_token": f"access-{random.getrandbits(64):x}",
+                "expires_at": int(time.time()) + 21600,
+                "expires_in": 21600,
+                "refresh_token": f"refresh-{random.getrandbits(64):x}",
+                "athlete": {"id": TEST_ATHLETE_ID},
+            }
+        )
+
+    async def __activity(self, request: web.Request) -> web.Response:
+        activity_id = int(request.match_info["id"])
+
+        return web.Response(
+            body=json.dumps(self.detailed_activity(activity_id=activity_id)),
+            content_type="application/json",
+        )
+
+    async def __activities(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("page", "1"))
+        per_page = int(request.query.get("per_page", "30"))
+        activities = (
+            [self.summary_activity(activity_id=CHALLENGE_PASSING_ACTIVITY_ID)]
+            if page == 1 and per_page > 0
+            else []
+        )
+
+        return web.json_response(activities)
+
+    def summary_activity(self, activity_id: int) -> Dict[str, Any]:
+        distance = (
+            CHALLENGE_PASSING_DISTANCE
+            if activity_id == CHALLENGE_PASSING_ACTIVITY_ID
+            else CHALLENGE_FAILING_DISTANCE
+        )
+        start_date = datetime.now(timezone.utc).replace(year=datetime.now().year + 1)
+
+        return {
+            "resource_state": 2,
+            "athlete": {"id": TEST_ATHLETE_ID, "resource_state": 1},
+            "name": "Morning Run",
+            "id": activity_id,
+            "type": "Run",
+            "sport_type": "Run",
+            "start_date": start_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "start_date_local": start_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "timezone": "(GMT-08:00) America/Los_Angeles",
+            "distance": distance,
+            "moving_time": int(distance / 2.997),
+            "elapsed_time": int(distance / 2.9),
+            "total_elevation_gain": 42.1,
+            "average_speed": 2.997,
+            "max_speed": 4.2,
+            "manual": False,
+            "map": {
+                "id": f"a{activity_id}",
+                "summary_polyline": POLYLINE,
+                "resource_state": 2,
+            },
+        }
+
+    def detailed_activity(self, activity_id: int) -> Dict[str, Any]:
+        activity = self.summary_activity(activity_id=activity_id)
+        activity["resource_state"] = 3
+        activity["map"]["polyline"] = POLYLINE * 4
+        activity["description"] = "Easy miles before work."
+        activity["segment_efforts"] = self.__efforts(activity_id=activity_id)
+        activity["splits_metric"] = self.__splits()
+        activity["splits_standard"] = self.__splits()
+        activity["laps"] = self.__splits()
+        activity["best_efforts"] = self.__efforts(activity_id=activity_id)
+        return activity
+
+    def __efforts(self, activity_id: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": activity_id * 1000 + number,
+                "resource_state": 2,
+                "name": f"Segment {number}",
+                "activity": {"id": activity_id, "resource_state": 1},
+                "athlete": {"id": TEST_ATHLETE_ID, "resource_state": 1},
+                "elapsed_time": 300 + number,
+                "moving_time": 295 + number,
+                "start_date": "2022-06-16T03:33:56Z",
+                "distance": 1000.0,
+                "start_index": number * 10,
+                "end_index": number * 10 + 9,
+                "average_heartrate": 151.2,
+                "max_heartrate": 170.0,
+                "segment": {
+                    "id": 229781 + number,
+                    "resource_state": 2,
+                    "name": f"Segment {number}",
+                    "activity_type": "Run",
+                    "distance": 1000.0,
+                    "average_grade": 0.4,
+                    "maximum_grade": 3.1,
+                    "elevation_high": 92.4,
+                    "elevation_low": 81.2,
+                    "start_latlng": [37.8331119, -122.4834356],
+                    "end_latlng": [37.8280722, -122.4981393],
+                    "climb_category": 0,
+                    "city": "San Francisco",
+                    "state": "CA",
+                    "country": "United States",
+                    "private": False,
+                },
+                "kom_rank": None,
+                "pr_rank": None,
+                "achievements": [],
+                "hidden": False,
+            }
+            for number in range(self.efforts)
+        ]
+
+    def __splits(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "distance": 1000.0,
+                "elapsed_time": 333,
+                "elevation_difference": 1.2,
+                "moving_time": 330,
+                "split": number + 1,
+                "average_speed": 3.03,
+                "average_heartrate": 150.4,
+                "pace_zone": 2,
+            }
+            for number in range(self.efforts)
+        ]
@@ -1,14 +1,43 @@
+from typing import Dict, List
+
 from app.usecases.interfaces.clients.ethereum import IEthereumClient
-from app.usecases.schemas.challenges import ChallengeOnChain
-from tests.constants import TEST_CHALLENGE_ID, TEST_CHALLENGE_ID_NOT_FOUND
+from app.usecases.schemas.challenges import ChallengeOnChain, IndexedChallenge
+from tests.constants import (
+    CHALLENGEE_ADDRESS,
+    CHALLENGER_ADDRESS,
+    TEST_CHALLENGE_ID,
+    TEST_CHALLENGE_ID_NOT_FOUND,
+)
+
+
+def indexed_challenge(
+    challenge_id: str, block_number: int, complete: bool = False
+) -> IndexedChallenge:
+    return IndexedChallenge(
+        challengeId=challenge_id,
+        challenger=CHALLENGER_ADDRESS,
+        challengee=CHALLENGEE_ADDRESS,
+        bounty=144000000000000000000,  # Beyond BigInteger
+        distance=10,
+        speed=3,
+        issuedAt=1657304490,
+        complete=complete,
+        block_number=block_number,
+    )
 
 
 class MockEthereumClient(IEthereumClient):
-    def get_challenge(self, challenge_id: str) -> ChallengeOnChain:
+    head = 100
+    # Block of the last event for each challenge
+    events = {TEST_CHALLENGE_ID: 10, TEST_CHALLENGE_ID_NOT_FOUND: 95}
+
+    async def get_challenge(
+        self, challenge_id: str, cached: bool = True
+    ) -> ChallengeOnChain:
         """Retrieves on-chain challenge by challenge_id."""
 
         onchain_challenge = ChallengeOnChain(
-            challengeId="4fbf9ee4-5aba-4b79-a62c-7f5ec1a4ecd1",
+            challengeId=challenge_id,
             challenger="0x3f9E4A6120aB7868485602241AbE9D85d6F9E382",
             challengee="0xDe076D651613C7bde3260B8B69C860D67Bc16f49",
             bounty=14400000000000000,
@@ -25,3 +54,29 @@ class MockEthereumClient(IEthereumClient):
             onchain_challenge.challenger = "0x0000000000000000000000000000000000000000"
 
         return onchain_challenge
+
+    async def get_challenges(
+        self, challenge_ids: List[str], cached: bool = True
+    ) -> List[ChallengeOnChain]:
+        """Retrieves on-chain challenges by challenge_id, in the same order."""
+
+        return [
+            await self.get_challenge(challenge_id=challenge_id)
+            for challenge_id in challenge_ids
+        ]
+
+    async def get_block_number(self) -> int:
+        """Returns the head block number."""
+
+        return self.head
+
+    async def get_challenge_events(
+        self, from_block: int, to_block: int
+    ) -> Dict[str, int]:
+        """Finds the challenges that contract events in a block range refer to."""
+
+        return {
+            challenge_id: block_number
+            for challenge_id, block_number in self.events.items()
+            if from_block <= block_number <= to_block
+        }
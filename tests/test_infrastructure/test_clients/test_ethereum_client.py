@@ -0,0 +1,324 @@
+import uuid
+from typing import Any, AsyncIterator, Dict
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eth_abi import decode_abi, encode_abi
+from eth_utils import encode_hex, event_abi_to_log_topic
+
+from app.infrastructure.clients.ethereum import EthereumClient
+from app.libraries.cache import LRUCache
+from app.libraries.metrics import MetricsRegistry
+from app.usecases.schemas.ethereum import EthereumException
+from tests.constants import (
+    CHALLENGEE_ADDRESS,
+    CHALLENGER_ADDRESS,
+    TEST_CHALLENGE_ID,
+    TEST_CHALLENGE_ID_NOT_FOUND,
+)
+
+CHALLENGE_TYPE = "(string,address,address,uint256,uint256,uint256,uint256,bool)"
+CONTRACT_ADDRESS = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+ABI = [
+    {
+        "name": "challengeLookup",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "", "type": "string"}],
+        "outputs": [
+            {
+                "name": "",
+                "type": "tuple",
+                "components": [
+                    {"name": "challengeId", "type": "string"},
+                    {"name": "challenger", "type": "address"},
+                    {"name": "challengee", "type": "address"},
+                    {"name": "bounty", "type": "uint256"},
+                    {"name": "distance", "type": "uint256"},
+                    {"name": "speed", "type": "uint256"},
+                    {"name": "issuedAt", "type": "uint256"},
+                    {"name": "complete", "type": "bool"},
+                ],
+            }
+        ],
+    },
+    {
+        "name": "ChallengeIssued",
+        "type": "event",
+        "anonymous": False,
+        "inputs": [
+            {"name": "challengeId", "type": "string", "indexed": False},
+            {"name": "challenger", "type": "address", "indexed": True},
+        ],
+    },
+]
+ISSUED_TOPIC = encode_hex(event_abi_to_log_topic(ABI[1]))
+
+
+def answer(app: web.Application, payload: Dict[str, Any]) -> Dict[str, Any]:
+    app["calls"].append(payload)
+
+    if payload["method"] == "eth_blockNumber":
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": hex(app["block"])}
+
+    if payload["method"] == "eth_getLogs":
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": app["logs"]}
+
+    (challenge_id,) = decode_abi(
+        ["string"], bytes.fromhex(payload["params"][0]["data"][10:])
+    )
+
+    if challenge_id == TEST_CHALLENGE_ID_NOT_FOUND:
+        return {
+            "jsonrpc": "2.0",
+            "id": payload["id"],
+            "error": {"code": -32000, "message": "execution reverted"},
+        }
+
+    result = encode_abi(
+        [CHALLENGE_TYPE],
+        [
+            (
+                challenge_id,
+                CHALLENGER_ADDRESS,
+                CHALLENGEE_ADDRESS,
+                14400000000000000,
+                10,
+                3,
+                1657304490,
+                app["complete"],
+            )
+        ],
+    )
+    return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x" + result.hex()}
+
+
+@pytest_asyncio.fixture
+async def rpc_server() -> AsyncIterator[TestServer]:
+    """Answers eth_blockNumber with `block`, and eth_call with an encoded
+    challenge, or with an RPC error for the challenge that is not found. Batch
+    requests are answered in reverse order, as nodes may."""
+
+    async def respond(request: web.Request) -> web.Response:
+        payload = await request.json()
+        request.app["requests"] += 1
+
+        if isinstance(payload, list):
+            return web.json_response(
+                [answer(request.app, call) for call in reversed(payload)]
+            )
+        return web.json_response(answer(request.app, payload))
+
+    app = web.Application()
+    app["calls"] = []
+    app["requests"] = 0
+    app["block"] = 100
+    app["complete"] = True
+    app["logs"] = []
+    app.router.add_post("/", respond)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def ethereum_client(rpc_server: TestServer) -> AsyncIterator[EthereumClient]:
+    async with aiohttp.ClientSession() as client_session:
+        yield EthereumClient(
+            client_session=client_session,
+            abi=ABI,
+            rpc_url=str(rpc_server.make_url("/")),
+            contract_address=CONTRACT_ADDRESS,
+            request_timeout=1,
+            batch_size=2,
+            challenge_cache=LRUCache(maxsize=10),
+            block_time=0,
+            finality_depth=2,
+            metrics=MetricsRegistry(),
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_challenge(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    onchain_challenge = await ethereum_client.get_challenge(
+        challenge_id=TEST_CHALLENGE_ID
+    )
+
+    call = rpc_server.app["calls"][-1]
+    assert call["method"] == "eth_call"
+    assert call["params"][0]["to"] == CONTRACT_ADDRESS
+    assert call["params"][1] == "latest"
+    assert onchain_challenge.challengeId == TEST_CHALLENGE_ID
+    assert onchain_challenge.challenger.lower() == CHALLENGER_ADDRESS.lower()
+    assert onchain_challenge.bounty == 14400000000000000
+    assert onchain_challenge.complete
+    assert ethereum_client.metrics.snapshot()["ethereum.rpc.eth_call.seconds.count"]
+
+
+@pytest.mark.asyncio
+async def test_get_challenge_rpc_error(ethereum_client: EthereumClient) -> None:
+
+    with pytest.raises(EthereumException):
+        await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID_NOT_FOUND)
+
+    assert ethereum_client.metrics.snapshot()["ethereum.rpc.errors"] == 1
+
+
+def eth_calls(server: TestServer) -> int:
+    return sum(call["method"] == "eth_call" for call in server.app["calls"])
+
+
+@pytest.mark.asyncio
+async def test_get_challenge_cached_within_block(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    rpc_server.app["complete"] = False
+
+    for _ in range(2):
+        await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+    assert eth_calls(rpc_server) == 1
+
+    # `complete` may have changed in the next block
+    rpc_server.app["block"] += 1
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+    assert eth_calls(rpc_server) == 2
+
+    snapshot = ethereum_client.metrics.snapshot()
+    assert snapshot["ethereum.challenge_cache.hits"] == 1
+    assert snapshot["ethereum.challenge_cache.misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_challenge_cached_once_final(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+
+    # Read again every block until a read confirms it once final, allowing a
+    # block for the head lagging the read
+    for expected_calls in range(2, 5):
+        rpc_server.app["block"] += 1
+        await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+        assert eth_calls(rpc_server) == expected_calls
+
+    # Confirmed complete and final, so served from the cache from now on
+    rpc_server.app["block"] += 100
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+    assert eth_calls(rpc_server) == 4
+
+
+@pytest.mark.asyncio
+async def test_get_challenge_not_final_after_reorg(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+
+    # The completing transaction is reorged out, and mined again later
+    rpc_server.app["complete"] = False
+    rpc_server.app["block"] += 1
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+    rpc_server.app["complete"] = True
+    rpc_server.app["block"] += 2
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+
+    # Final for the first read, but not for the read it was complete again at
+    rpc_server.app["block"] += 1
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+    assert eth_calls(rpc_server) == 4
+
+
+@pytest.mark.asyncio
+async def test_get_challenge_uncached(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID)
+    await ethereum_client.get_challenge(challenge_id=TEST_CHALLENGE_ID, cached=False)
+
+    assert eth_calls(rpc_server) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_challenges(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    challenge_ids = [str(uuid.uuid4()) for _ in range(5)]
+
+    onchain_challenges = await ethereum_client.get_challenges(
+        challenge_ids=challenge_ids
+    )
+
+    assert [challenge.challengeId for challenge in onchain_challenges] == challenge_ids
+    assert eth_calls(rpc_server) == 5
+    # One eth_blockNumber, then batches of two, two and one eth_calls
+    assert rpc_server.app["requests"] == 4
+
+
+@pytest.mark.asyncio
+async def test_get_challenges_partly_cached(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    challenge_ids = [str(uuid.uuid4()) for _ in range(3)]
+    await ethereum_client.get_challenge(challenge_id=challenge_ids[1])
+
+    onchain_challenges = await ethereum_client.get_challenges(
+        challenge_ids=challenge_ids
+    )
+
+    assert [challenge.challengeId for challenge in onchain_challenges] == challenge_ids
+    assert eth_calls(rpc_server) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_challenges_rpc_error(ethereum_client: EthereumClient) -> None:
+
+    with pytest.raises(EthereumException):
+        await ethereum_client.get_challenges(
+            challenge_ids=[TEST_CHALLENGE_ID, TEST_CHALLENGE_ID_NOT_FOUND]
+        )
+
+
+def issued_log(challenge_id: str, block_number: int, removed: bool = False) -> dict:
+    return {
+        "address": CONTRACT_ADDRESS,
+        "topics": [ISSUED_TOPIC, "0x" + "0" * 24 + CHALLENGER_ADDRESS[2:]],
+        "data": "0x" + encode_abi(["string"], [challenge_id]).hex(),
+        "blockNumber": hex(block_number),
+        "blockHash": "0x" + "1" * 64,
+        "transactionHash": "0x" + "2" * 64,
+        "transactionIndex": "0x0",
+        "logIndex": "0x0",
+        "removed": removed,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_challenge_events(
+    ethereum_client: EthereumClient, rpc_server: TestServer
+) -> None:
+
+    rpc_server.app["logs"] = [
+        issued_log(challenge_id=TEST_CHALLENGE_ID, block_number=10),
+        issued_log(challenge_id=TEST_CHALLENGE_ID, block_number=12),
+        issued_log(challenge_id=TEST_CHALLENGE_ID_NOT_FOUND, block_number=11),
+        issued_log(challenge_id="reorged", block_number=11, removed=True),
+    ]
+
+    events = await ethereum_client.get_challenge_events(from_block=10, to_block=20)
+
+    get_logs = rpc_server.app["calls"][-1]["params"][0]
+    assert get_logs["fromBlock"] == "0xa" and get_logs["toBlock"] == "0x14"
+    assert get_logs["topics"] == [[ISSUED_TOPIC]]
+    assert events == {TEST_CHALLENGE_ID: 12, TEST_CHALLENGE_ID_NOT_FOUND: 11}
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.clients.rate_limiter import StravaRateLimiter
+from app.libraries.metrics import MetricsRegistry
+from app.usecases.schemas.strava import StravaRateLimitException, StravaRequestPriority
+
+
+def build_rate_limiter(
+    metrics: MetricsRegistry, short_term_limit: int = 1, max_wait: float = 5
+) -> StravaRateLimiter:
+    return StravaRateLimiter(
+        short_term_limit=short_term_limit,
+        daily_limit=1000,
+        utilization=1,
+        max_wait=max_wait,
+        metrics=metrics,
+    )
+
+
+@pytest.mark.asyncio
+async def test_acquire_in_priority_order() -> None:
+
+    metrics = MetricsRegistry()
+    rate_limiter = build_rate_limiter(metrics=metrics)
+    await rate_limiter.acquire()
+
+    backfill = asyncio.create_task(
+        rate_limiter.acquire(priority=StravaRequestPriority.BACKFILL)
+    )
+    validation = asyncio.create_task(
+        rate_limiter.acquire(priority=StravaRequestPriority.VALIDATION)
+    )
+    await asyncio.sleep(0)
+    assert metrics.gauges["strava.rate_limit.queued"] == 2
+
+    # Strava grants one more request in the window
+    rate_limiter.record(
+        status=200,
+        headers={"X-RateLimit-Limit": "2,1000", "X-RateLimit-Usage": "1,1"},
+    )
+    await asyncio.sleep(0.01)
+
+    assert validation.done()
+    assert not backfill.done()
+    assert metrics.gauges["strava.rate_limit.short_term.usage"] == 2
+    assert metrics.gauges["strava.rate_limit.short_term.limit"] == 2
+
+    backfill.cancel()
+
+
+@pytest.mark.asyncio
+async def test_acquire_times_out() -> None:
+
+    metrics = MetricsRegistry()
+    rate_limiter = build_rate_limiter(metrics=metrics, max_wait=0.01)
+    await rate_limiter.acquire()
+
+    with pytest.raises(StravaRateLimitException):
+        await rate_limiter.acquire()
+
+    assert metrics.counters["strava.rate_limit.rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_record_usage() -> None:
+
+    metrics = MetricsRegistry()
+    rate_limiter = build_rate_limiter(metrics=metrics, short_term_limit=100)
+
+    rate_limiter.record(
+        status=200,
+        headers={"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "12,345"},
+    )
+
+    assert metrics.snapshot() == {
+        "strava.rate_limit.daily.limit": 2000,
+        "strava.rate_limit.daily.usage": 345,
+        "strava.rate_limit.queued": 0,
+        "strava.rate_limit.short_term.limit": 200,
+        "strava.rate_limit.short_term.usage": 12,
+        "strava.requests": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_record_throttled() -> None:
+
+    metrics = MetricsRegistry()
+    rate_limiter = build_rate_limiter(
+        metrics=metrics, short_term_limit=100, max_wait=0.01
+    )
+
+    # Quota was used up by another process
+    rate_limiter.record(status=429, headers={})
+
+    assert metrics.counters["strava.rate_limit.throttled"] == 1
+    assert metrics.gauges["strava.rate_limit.short_term.usage"] == 100
+    with pytest.raises(StravaRateLimitException):
+        await rate_limiter.acquire()
@@ -0,0 +1,268 @@
+from typing import AsyncIterator, List
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.infrastructure.clients.rate_limiter import StravaRateLimiter
+from app.infrastructure.clients.strava import StravaClient
+from app.libraries.circuit_breaker import CircuitBreaker
+from app.libraries.metrics import MetricsRegistry
+from app.usecases.schemas.strava import (
+    ActivitySummary,
+    StravaException,
+    StravaRateLimitException,
+    StravaServerException,
+    StravaUnavailableException,
+)
+from tests.constants import CHALLENGE_PASSING_ACTIVITY_ID, CHALLENGE_PASSING_DISTANCE
+from tests.mocks.fake_strava_server import POLYLINE, FakeStravaServer
+
+ACTIVITY_RESPONSE = {
+    "id": 7316374637,
+    "type": "Run",
+    "start_date": "2022-06-16T03:33:56Z",
+    "distance": 8046.7,
+    "average_speed": 2.997,
+    "manual": False,
+    "map": {"id": "a7316374637", "polyline": "wuk}Ftz~tOED@FAI", "resource_state": 3},
+    "splits_metric": [{"distance": 1000.0, "elapsed_time": 333}] * 8,
+    "laps": [{"distance": 8046.7, "elapsed_time": 2685}],
+    "best_efforts": [{"name": "1k", "elapsed_time": 320}],
+}
+
+
+def build_strava_client(
+    client_session: aiohttp.ClientSession, base_url: str
+) -> StravaClient:
+    return StravaClient(
+        client_session=client_session,
+        base_url=base_url,
+        rate_limiter=StravaRateLimiter(
+            short_term_limit=100,
+            daily_limit=1000,
+            utilization=1,
+            max_wait=1,
+            metrics=MetricsRegistry(),
+        ),
+        circuit_breaker=CircuitBreaker(
+            error_rate=0.5, window=4, minimum_calls=4, reset_timeout=60
+        ),
+        request_timeout=1,
+        max_retries=2,
+        retry_backoff=0,
+        retry_backoff_max=0,
+    )
+
+
+@pytest.fixture
+def strava_client() -> StravaClient:
+    return build_strava_client(
+        client_session=None, base_url="https://www.strava.com/api/v3"
+    )
+
+
+@pytest_asyncio.fixture
+async def flaky_strava_server() -> AsyncIterator[TestServer]:
+    """Serves `responses` in order, then keeps failing with a 503."""
+
+    async def respond(request: web.Request) -> web.Response:
+        request.app["calls"] += 1
+        status = request.app["responses"].pop(0) if request.app["responses"] else 503
+        if request.match_info["id"] == "0":
+            return web.Response(
+                body='{"id": 0, "type": "Ru', content_type="application/json"
+            )
+        return web.json_response(ACTIVITY_RESPONSE, status=status)
+
+    app = web.Application()
+    app["calls"] = 0
+    app["responses"] = []
+    app.router.add_route("*", "/activities/{id}", respond)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def flaky_strava_client(
+    flaky_strava_server: TestServer,
+) -> AsyncIterator[StravaClient]:
+    async with aiohttp.ClientSession() as client_session:
+        yield build_strava_client(
+            client_session=client_session,
+            base_url=str(flaky_strava_server.make_url("")),
+        )
+
+
+@pytest_asyncio.fixture
+async def fake_strava_server() -> AsyncIterator[FakeStravaServer]:
+    server = FakeStravaServer(short_term_limit=2, efforts=500)
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def fake_strava_client(
+    fake_strava_server: FakeStravaServer,
+) -> AsyncIterator[StravaClient]:
+    async with aiohttp.ClientSession() as client_session:
+        yield build_strava_client(
+            client_session=client_session, base_url=fake_strava_server.base_url
+        )
+
+
+def queue_responses(server: TestServer, responses: List[int]) -> None:
+    server.app["responses"].extend(responses)
+
+
+@pytest.mark.asyncio
+async def test_get_activity(strava_client: StravaClient) -> None:
+
+    with patch.object(
+        strava_client, "api_call", AsyncMock(return_value=ACTIVITY_RESPONSE)
+    ) as api_call:
+        activity = await strava_client.get_activity(
+            access_token="token", activity_id=7316374637
+        )
+
+    assert api_call.call_args.kwargs["params"] == {"include_all_efforts": "false"}
+    assert activity == ActivitySummary(
+        id=7316374637,
+        type="Run",
+        start_date="2022-06-16T03:33:56Z",
+        distance=8046.7,
+        average_speed=2.997,
+        manual=False,
+        polyline="wuk}Ftz~tOED@FAI",
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_activity_unexpected_response(strava_client: StravaClient) -> None:
+
+    with patch.object(
+        strava_client,
+        "api_call",
+        AsyncMock(return_value={"message": "Record Not Found", "errors": []}),
+    ):
+        with pytest.raises(StravaException):
+            await strava_client.get_activity(access_token="token", activity_id=1)
+
+
+@pytest.mark.asyncio
+async def test_get_retried_after_server_error(
+    flaky_strava_client: StravaClient, flaky_strava_server: TestServer
+) -> None:
+
+    queue_responses(flaky_strava_server, [500, 502, 200])
+
+    activity = await flaky_strava_client.get_activity(
+        access_token="token", activity_id=7316374637
+    )
+
+    assert activity.id == 7316374637
+    assert flaky_strava_server.app["calls"] == 3
+
+
+@pytest.mark.asyncio
+async def test_post_not_retried(
+    flaky_strava_client: StravaClient, flaky_strava_server: TestServer
+) -> None:
+
+    queue_responses(flaky_strava_server, [500, 200])
+
+    with pytest.raises(StravaServerException):
+        await flaky_strava_client.api_call(method="POST", endpoint="/activities/1")
+
+    assert flaky_strava_server.app["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast(
+    flaky_strava_client: StravaClient, flaky_strava_server: TestServer
+) -> None:
+
+    # Three failed attempts, then a fourth opens the circuit
+    with pytest.raises(StravaServerException):
+        await flaky_strava_client.get_activity(access_token="token", activity_id=1)
+    with pytest.raises(StravaUnavailableException):
+        await flaky_strava_client.get_activity(access_token="token", activity_id=1)
+
+    assert flaky_strava_server.app["calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_list_activities(strava_client: StravaClient) -> None:
+
+    summary_activity = {
+        **ACTIVITY_RESPONSE,
+        "map": {"id": "a7316374637", "summary_polyline": "wuk}Ftz~tOED@FAI"},
+    }
+
+    with patch.object(
+        strava_client, "api_call", AsyncMock(return_value=[summary_activity])
+    ) as api_call:
+        activities = await strava_client.list_activities(
+            access_token="token", after=1655410924, page=1, per_page=200
+        )
+
+    assert api_call.call_args.kwargs["endpoint"] == "/athlete/activities"
+    assert [activity.polyline for activity in activities] == ["wuk}Ftz~tOED@FAI"]
+
+
+@pytest.mark.asyncio
+async def test_get_activity_detailed_response(
+    fake_strava_client: StravaClient,
+) -> None:
+
+    activity = await fake_strava_client.get_activity(
+        access_token="token", activity_id=CHALLENGE_PASSING_ACTIVITY_ID
+    )
+
+    assert activity.id == CHALLENGE_PASSING_ACTIVITY_ID
+    assert activity.distance == CHALLENGE_PASSING_DISTANCE
+    assert activity.polyline == POLYLINE * 4
+
+
+@pytest.mark.asyncio
+async def test_list_activities_summary_response(
+    fake_strava_client: StravaClient,
+) -> None:
+
+    activities = await fake_strava_client.list_activities(
+        access_token="token", after=0, page=1, per_page=200
+    )
+
+    assert [activity.id for activity in activities] == [CHALLENGE_PASSING_ACTIVITY_ID]
+    assert activities[0].distance == CHALLENGE_PASSING_DISTANCE
+    assert activities[0].polyline == POLYLINE
+
+
+@pytest.mark.asyncio
+async def test_get_activity_invalid_json(flaky_strava_client: StravaClient) -> None:
+
+    with pytest.raises(StravaException):
+        await flaky_strava_client.get_activity(access_token="token", activity_id=0)
+
+
+@pytest.mark.asyncio
+async def test_reported_quota_honoured(
+    fake_strava_client: StravaClient, fake_strava_server: FakeStravaServer
+) -> None:
+
+    for _ in range(2):
+        await fake_strava_client.get_activity(access_token="token", activity_id=1)
+
+    # Strava reported the short term quota as used up, so the third request
+    # waits in the rate limiter instead of being sent
+    with pytest.raises(StravaRateLimitException):
+        await fake_strava_client.get_activity(access_token="token", activity_id=1)
+
+    assert fake_strava_server.requests == 2
+    assert fake_strava_server.throttled == 0
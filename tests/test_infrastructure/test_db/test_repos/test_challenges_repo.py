@@ -1,14 +1,22 @@
 from typing import List
+from unittest.mock import patch
 
 import pytest
+from databases import Database
 
+from app.infrastructure.db.repos.challenges import ChallengesRepo, OpenChallengesIndex
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
 from app.usecases.schemas.challenges import (
     ChallengeJoinPaymentAndUsers,
     CreateChallengeRepoAdapter,
     RetrieveChallengesAdapter,
 )
-from tests.constants import DEFAULT_NUMBER_OF_INSERTED_OBJECTS
+from app.usecases.schemas.ethereum import SignedMessage
+from tests.constants import (
+    CHALLENGEE_ADDRESS,
+    CHALLENGER_ADDRESS,
+    DEFAULT_NUMBER_OF_INSERTED_OBJECTS,
+)
 
 
 @pytest.mark.asyncio
@@ -29,6 +37,21 @@ async def test_create(
     assert test_challenge.payment_complete == False
 
 
+@pytest.mark.asyncio
+async def test_create_duplicate(
+    challenges_repo: IChallengesRepo,
+    inserted_challenge_object: ChallengeJoinPaymentAndUsers,
+    create_challenge_repo_adapter: CreateChallengeRepoAdapter,
+) -> None:
+
+    create_challenge_repo_adapter.id = inserted_challenge_object.id
+
+    assert not await challenges_repo.create(new_challenge=create_challenge_repo_adapter)
+    assert await challenges_repo.retrieve(id=inserted_challenge_object.id) == (
+        inserted_challenge_object
+    )
+
+
 @pytest.mark.asyncio
 async def test_retrieve(
     inserted_challenge_object: ChallengeJoinPaymentAndUsers,
@@ -58,19 +81,87 @@ async def test_retrieve_many(
 
 
 @pytest.mark.asyncio
-async def test_update_challenge(
+async def test_retrieve_many_by_address(
     inserted_challenge_object: ChallengeJoinPaymentAndUsers,
     challenges_repo: IChallengesRepo,
 ) -> None:
 
-    assert not inserted_challenge_object.complete
+    for query_params in (
+        RetrieveChallengesAdapter(challenger_address=CHALLENGER_ADDRESS),
+        RetrieveChallengesAdapter(
+            challengee_address=CHALLENGEE_ADDRESS, payment_complete=False
+        ),
+    ):
+        test_challenges = await challenges_repo.retrieve_many(query_params=query_params)
 
-    updated_test_challenge = await challenges_repo.update_challenge(
-        id=inserted_challenge_object.id
+        assert [challenge.id for challenge in test_challenges] == [
+            inserted_challenge_object.id
+        ]
+        assert test_challenges[0].challenger_address == CHALLENGER_ADDRESS
+        assert test_challenges[0].challengee_address == CHALLENGEE_ADDRESS
+
+
+@pytest.mark.asyncio
+async def test_save_signatures(
+    many_inserted_challenge_objects: List[ChallengeJoinPaymentAndUsers],
+    challenges_repo: IChallengesRepo,
+) -> None:
+
+    signed_challenge, *unsigned_challenges = many_inserted_challenge_objects
+    signed_message = SignedMessage(hashed_message="0x01", signature="0x02")
+
+    await challenges_repo.save_signatures(
+        signatures={signed_challenge.id: signed_message}
     )
 
-    assert isinstance(updated_test_challenge, ChallengeJoinPaymentAndUsers)
-    assert updated_test_challenge.complete
+    test_challenge = await challenges_repo.retrieve(id=signed_challenge.id)
+    assert test_challenge.hashed_message == signed_message.hashed_message
+    assert test_challenge.signature == signed_message.signature
+
+    test_challenges = await challenges_repo.retrieve_many(
+        query_params=RetrieveChallengesAdapter(payment_signed=False),
+        limit=len(unsigned_challenges) - 1,
+    )
+    assert [challenge.id for challenge in test_challenges] == sorted(
+        challenge.id for challenge in unsigned_challenges
+    )[:-1]
+
+
+@pytest.mark.asyncio
+async def test_complete_challenge(
+    inserted_challenge_object: ChallengeJoinPaymentAndUsers,
+    challenges_repo: IChallengesRepo,
+) -> None:
+
+    signed_message = SignedMessage(hashed_message="0x01", signature="0x02")
+
+    test_challenge = await challenges_repo.complete_challenge(
+        id=inserted_challenge_object.id, signed_message=signed_message
+    )
+
+    assert test_challenge.complete
+    assert test_challenge.hashed_message == signed_message.hashed_message
+    assert test_challenge.signature == signed_message.signature
+    assert test_challenge.dict(
+        exclude={"complete", "updated_at", "hashed_message", "signature"}
+    ) == inserted_challenge_object.dict(
+        exclude={"complete", "updated_at", "hashed_message", "signature"}
+    )
+    assert await challenges_repo.retrieve(id=inserted_challenge_object.id) == (
+        test_challenge
+    )
+
+    # Completing it again changes nothing, not even the signature
+    assert (
+        await challenges_repo.complete_challenge(
+            id=inserted_challenge_object.id,
+            signed_message=SignedMessage(hashed_message="0x03", signature="0x04"),
+        )
+        is None
+    )
+    assert await challenges_repo.retrieve(id=inserted_challenge_object.id) == (
+        test_challenge
+    )
 
 
 @pytest.mark.asyncio
@@ -88,3 +179,61 @@ async def test_update_payment(
     )
 
     assert updated_test_challenge.payment_complete
+
+
+@pytest.mark.asyncio
+async def test_has_open_challenges(
+    inserted_challenge_object: ChallengeJoinPaymentAndUsers,
+    challenges_repo: IChallengesRepo,
+) -> None:
+
+    assert await challenges_repo.has_open_challenges(
+        user_id=inserted_challenge_object.challengee
+    )
+    assert not await challenges_repo.has_open_challenges(
+        user_id=inserted_challenge_object.challenger
+    )
+
+    await challenges_repo.complete_challenge(
+        id=inserted_challenge_object.id,
+        signed_message=SignedMessage(hashed_message="0x01", signature="0x02"),
+    )
+
+    assert not await challenges_repo.has_open_challenges(
+        user_id=inserted_challenge_object.challengee
+    )
+
+
+@pytest.mark.asyncio
+async def test_has_open_challenges_from_index(test_db: Database) -> None:
+
+    index = OpenChallengesIndex()
+    challenges_repo = ChallengesRepo(db=test_db, open_challenges_index=index)
+    index.load(counts={1: 2})
+
+    with patch.object(test_db, "fetch_val") as fetch_val:
+        assert await challenges_repo.has_open_challenges(user_id=1)
+        assert not await challenges_repo.has_open_challenges(user_id=2)
+
+    fetch_val.assert_not_called()
+
+    # Until the index is loaded again, Postgres is asked instead
+    index.invalidate()
+
+    assert not await challenges_repo.has_open_challenges(user_id=1)
+
+
+@pytest.mark.asyncio
+async def test_count_open_challenges(
+    inserted_challenge_object: ChallengeJoinPaymentAndUsers,
+    challenges_repo: IChallengesRepo,
+) -> None:
+
+    challengee = inserted_challenge_object.challengee
+    challenger = inserted_challenge_object.challenger
+
+    assert await challenges_repo.count_open_challenges() == {challengee: 1}
+    assert await challenges_repo.count_open_challenges(user_ids=[challenger]) == {}
+    assert await challenges_repo.count_open_challenges(
+        user_ids=[challengee, challenger]
+    ) == {challengee: 1}
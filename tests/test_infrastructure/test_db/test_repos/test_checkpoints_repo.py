@@ -0,0 +1,45 @@
+import pytest
+from databases import Database
+
+from app.infrastructure.db.repos.checkpoints import CheckpointsRepo
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+
+
+@pytest.mark.asyncio
+async def test_save_and_retrieve(checkpoints_repo: ICheckpointsRepo) -> None:
+
+    assert await checkpoints_repo.retrieve(name="test") is None
+
+    await checkpoints_repo.save(name="test", position=1)
+    await checkpoints_repo.save(name="test", position=2)
+
+    assert await checkpoints_repo.retrieve(name="test") == 2
+
+
+@pytest.mark.asyncio
+async def test_delete(checkpoints_repo: ICheckpointsRepo) -> None:
+
+    await checkpoints_repo.save(name="test", position=1)
+    await checkpoints_repo.delete(name="test")
+
+    assert await checkpoints_repo.retrieve(name="test") is None
+
+
+@pytest.mark.asyncio
+async def test_lock(checkpoints_repo: ICheckpointsRepo, test_db_url: str) -> None:
+
+    other_process_db = Database(url=test_db_url)
+    await other_process_db.connect()
+    other_process_repo = CheckpointsRepo(db=other_process_db)
+
+    try:
+        async with checkpoints_repo.lock(name="test") as locked:
+            assert locked
+            async with other_process_repo.lock(name="test") as other_locked:
+                assert not other_locked
+
+        # Released when the context closes
+        async with other_process_repo.lock(name="test") as other_locked:
+            assert other_locked
+    finally:
+        await other_process_db.disconnect()
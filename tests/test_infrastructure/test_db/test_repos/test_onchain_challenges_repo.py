@@ -0,0 +1,62 @@
+import pytest
+
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
+from tests.constants import TEST_CHALLENGE_ID, TEST_CHALLENGE_ID_NOT_FOUND
+from tests.mocks.mock_ethereum_client import indexed_challenge
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_and_retrieve(
+    onchain_challenges_repo: IOnchainChallengesRepo,
+) -> None:
+
+    await onchain_challenges_repo.upsert_many(
+        challenges=[
+            indexed_challenge(challenge_id=TEST_CHALLENGE_ID, block_number=1),
+            indexed_challenge(challenge_id=TEST_CHALLENGE_ID_NOT_FOUND, block_number=2),
+        ]
+    )
+    await onchain_challenges_repo.upsert_many(
+        challenges=[
+            indexed_challenge(
+                challenge_id=TEST_CHALLENGE_ID, block_number=3, complete=True
+            )
+        ]
+    )
+
+    challenge = await onchain_challenges_repo.retrieve(challenge_id=TEST_CHALLENGE_ID)
+
+    assert challenge == indexed_challenge(
+        challenge_id=TEST_CHALLENGE_ID, block_number=3, complete=True
+    )
+    assert await onchain_challenges_repo.retrieve(challenge_id="unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_retrieve_since(onchain_challenges_repo: IOnchainChallengesRepo) -> None:
+
+    await onchain_challenges_repo.upsert_many(
+        challenges=[
+            indexed_challenge(challenge_id=TEST_CHALLENGE_ID, block_number=1),
+            indexed_challenge(challenge_id=TEST_CHALLENGE_ID_NOT_FOUND, block_number=2),
+        ]
+    )
+
+    challenges = await onchain_challenges_repo.retrieve_since(block_number=1)
+
+    assert [challenge.challengeId for challenge in challenges] == [
+        TEST_CHALLENGE_ID_NOT_FOUND
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delete_many(onchain_challenges_repo: IOnchainChallengesRepo) -> None:
+
+    await onchain_challenges_repo.upsert_many(
+        challenges=[indexed_challenge(challenge_id=TEST_CHALLENGE_ID, block_number=1)]
+    )
+    await onchain_challenges_repo.delete_many(challenge_ids=[TEST_CHALLENGE_ID])
+
+    assert (
+        await onchain_challenges_repo.retrieve(challenge_id=TEST_CHALLENGE_ID) is None
+    )
@@ -1,6 +1,11 @@
+from typing import Tuple
+
 import pytest
 
+from app.usecases.interfaces.repos.challenges import IChallengesRepo
 from app.usecases.interfaces.repos.strava import IStravaRepo
+from app.usecases.schemas.challenges import ChallengeJoinPaymentAndUsers
+from app.usecases.schemas.ethereum import SignedMessage
 from app.usecases.schemas.strava import (
     CreateStravaAccessAdapter,
     StravaAccessInDb,
@@ -69,3 +74,60 @@ async def test_update(
 
     assert isinstance(updated_test_strava_access_object, StravaAccessInDb)
     assert updated_test_strava_access_object.scope == []
+
+
+@pytest.mark.asyncio
+async def test_retrieve_expiring(
+    strava_repo: IStravaRepo, inserted_strava_access_object: StravaAccessInDb
+) -> None:
+
+    expiring_access = await strava_repo.retrieve_expiring(
+        expires_before=inserted_strava_access_object.expires_at + 1
+    )
+
+    assert [access.athlete_id for access in expiring_access] == [
+        inserted_strava_access_object.athlete_id
+    ]
+    assert not await strava_repo.retrieve_expiring(
+        expires_before=inserted_strava_access_object.expires_at
+    )
+
+    # Revoked access is never refreshed
+    await strava_repo.update(
+        athlete_id=inserted_strava_access_object.athlete_id,
+        updated_access=StravaAccessUpdateAdapter(scope=[]),
+    )
+
+    assert not await strava_repo.retrieve_expiring(
+        expires_before=inserted_strava_access_object.expires_at + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_retrieve_with_open_challenges(
+    strava_repo: IStravaRepo,
+    challenges_repo: IChallengesRepo,
+    linked_strava_access_and_challenge: Tuple[
+        StravaAccessInDb, ChallengeJoinPaymentAndUsers
+    ],
+) -> None:
+
+    strava_access, challenge = linked_strava_access_and_challenge
+    athletes = await strava_repo.retrieve_with_open_challenges(
+        after_athlete_id=0, limit=10
+    )
+
+    assert [access.athlete_id for access in athletes] == [strava_access.athlete_id]
+    assert not await strava_repo.retrieve_with_open_challenges(
+        after_athlete_id=strava_access.athlete_id, limit=10
+    )
+
+    # Athletes drop out once their challenges are complete
+    await challenges_repo.complete_challenge(
+        id=challenge.id,
+        signed_message=SignedMessage(hashed_message="0x01", signature="0x02"),
+    )
+
+    assert not await strava_repo.retrieve_with_open_challenges(
+        after_athlete_id=0, limit=10
+    )
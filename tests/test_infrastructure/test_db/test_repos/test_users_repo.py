@@ -47,3 +47,26 @@ async def test_update(users_repo: IUsersRepo, inserted_user_object: UserInDb) ->
 
     assert isinstance(test_user, UserInDb)
     assert test_user.address == updated_address
+
+
+@pytest.mark.asyncio
+async def test_upsert_many(
+    users_repo: IUsersRepo, inserted_user_object: UserInDb
+) -> None:
+
+    new_user = UserBase(email="new@example.com", name="Alice")
+    existing_user = UserBase(email=inserted_user_object.email, name="Not Bob")
+
+    test_users = await users_repo.upsert_many(
+        new_users=[new_user, existing_user, new_user]
+    )
+
+    assert [user.email for user in test_users] == [
+        new_user.email,
+        existing_user.email,
+        new_user.email,
+    ]
+    assert test_users[0] == test_users[2]
+    assert test_users[0].name == new_user.name
+    assert test_users[1] == inserted_user_object
+    assert await users_repo.retrieve(email=new_user.email) == test_users[0]
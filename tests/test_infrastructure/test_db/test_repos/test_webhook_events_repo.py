@@ -0,0 +1,154 @@
+import pytest
+import pytest_asyncio
+
+from app.usecases.interfaces.repos.webhook_events import IWebhookEventsRepo
+from app.usecases.schemas.strava import (
+    WebhookEvent,
+    WebhookEventInDb,
+    WebhookEventStatus,
+)
+from tests.constants import TEST_ATHLETE_ID
+
+
+@pytest_asyncio.fixture
+async def webhook_event() -> WebhookEvent:
+    return WebhookEvent(
+        aspect_type="create",
+        event_time=1655410924,
+        object_id=1,
+        object_type="activity",
+        owner_id=TEST_ATHLETE_ID,
+        subscription_id=218213,
+        updates={},
+    )
+
+
+@pytest_asyncio.fixture
+async def enqueued_event(
+    webhook_events_repo: IWebhookEventsRepo, webhook_event: WebhookEvent
+) -> WebhookEventInDb:
+    return await webhook_events_repo.enqueue(event=webhook_event)
+
+
+@pytest.mark.asyncio
+async def test_enqueue(
+    webhook_events_repo: IWebhookEventsRepo, webhook_event: WebhookEvent
+) -> None:
+
+    test_event = await webhook_events_repo.enqueue(event=webhook_event)
+
+    assert isinstance(test_event, WebhookEventInDb)
+    for key, value in webhook_event.dict().items():
+        assert value == test_event.dict()[key]
+    assert test_event.status == WebhookEventStatus.PENDING
+    assert test_event.attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_claim(
+    webhook_events_repo: IWebhookEventsRepo, enqueued_event: WebhookEventInDb
+) -> None:
+
+    claimed_events = await webhook_events_repo.claim(limit=10, visibility_timeout=300)
+
+    assert len(claimed_events) == 1
+    assert claimed_events[0].id == enqueued_event.id
+    assert claimed_events[0].status == WebhookEventStatus.PROCESSING
+    assert claimed_events[0].attempts == 1
+
+    # Claimed events are invisible to other workers until the visibility timeout lapses
+    assert not await webhook_events_repo.claim(limit=10, visibility_timeout=300)
+
+
+@pytest.mark.asyncio
+async def test_claim_expired_visibility_timeout(
+    webhook_events_repo: IWebhookEventsRepo, enqueued_event: WebhookEventInDb
+) -> None:
+
+    await webhook_events_repo.claim(limit=10, visibility_timeout=0)
+
+    reclaimed_events = await webhook_events_repo.claim(limit=10, visibility_timeout=0)
+
+    assert len(reclaimed_events) == 1
+    assert reclaimed_events[0].attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_complete(
+    webhook_events_repo: IWebhookEventsRepo, enqueued_event: WebhookEventInDb
+) -> None:
+
+    await webhook_events_repo.claim(limit=10, visibility_timeout=0)
+    await webhook_events_repo.complete(id=enqueued_event.id)
+
+    assert not await webhook_events_repo.claim(limit=10, visibility_timeout=0)
+
+
+@pytest.mark.asyncio
+async def test_retry(
+    webhook_events_repo: IWebhookEventsRepo, enqueued_event: WebhookEventInDb
+) -> None:
+
+    await webhook_events_repo.claim(limit=10, visibility_timeout=300)
+    await webhook_events_repo.retry(id=enqueued_event.id, error="Error", delay=0)
+
+    reclaimed_events = await webhook_events_repo.claim(limit=10, visibility_timeout=300)
+
+    assert len(reclaimed_events) == 1
+    assert reclaimed_events[0].last_error == "Error"
+
+
+@pytest.mark.asyncio
+async def test_defer(
+    webhook_events_repo: IWebhookEventsRepo, enqueued_event: WebhookEventInDb
+) -> None:
+
+    await webhook_events_repo.claim(limit=10, visibility_timeout=300)
+    await webhook_events_repo.defer(id=enqueued_event.id, error="Error", delay=0)
+
+    reclaimed_events = await webhook_events_repo.claim(limit=10, visibility_timeout=300)
+
+    assert len(reclaimed_events) == 1
+    assert reclaimed_events[0].attempts == 1
+    assert reclaimed_events[0].last_error == "Error"
+
+
+@pytest.mark.asyncio
+async def test_fail(
+    webhook_events_repo: IWebhookEventsRepo, enqueued_event: WebhookEventInDb
+) -> None:
+
+    await webhook_events_repo.claim(limit=10, visibility_timeout=0)
+    await webhook_events_repo.fail(id=enqueued_event.id, error="Error")
+
+    assert not await webhook_events_repo.claim(limit=10, visibility_timeout=0)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_duplicate(
+    webhook_events_repo: IWebhookEventsRepo,
+    webhook_event: WebhookEvent,
+    enqueued_event: WebhookEventInDb,
+) -> None:
+
+    assert await webhook_events_repo.enqueue(event=webhook_event) is None
+
+
+@pytest.mark.asyncio
+async def test_superseded(
+    webhook_events_repo: IWebhookEventsRepo,
+    webhook_event: WebhookEvent,
+    enqueued_event: WebhookEventInDb,
+) -> None:
+
+    newer_event = webhook_event.copy()
+    newer_event.event_time += 60
+    newer_event = await webhook_events_repo.enqueue(event=newer_event)
+
+    # The newer event has not been processed yet
+    assert not await webhook_events_repo.superseded(event=enqueued_event)
+
+    await webhook_events_repo.complete(id=newer_event.id)
+
+    assert await webhook_events_repo.superseded(event=enqueued_event)
+    assert not await webhook_events_repo.superseded(event=newer_event)
@@ -0,0 +1,59 @@
+from sqlalchemy import and_, bindparam
+
+from app.infrastructure.db.models.users import USERS
+from app.infrastructure.db.statements import DIALECT, StatementCache
+from app.libraries.cache import LRUCache
+
+
+def select_by(*names: str):
+    return USERS.select().where(
+        and_(*(USERS.c[name] == bindparam(name) for name in names))
+    )
+
+
+def test_get_compiles_each_shape_once() -> None:
+
+    statements = StatementCache(cache=LRUCache(maxsize=2))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return select_by("email")
+
+    first = statements.get("by_email", build, email="a@example.com")
+    second = statements.get("by_email", build, email="b@example.com")
+
+    assert len(builds) == 1
+    assert statements.cache.hits == 1
+    assert statements.cache.misses == 1
+    assert str(first.compile(dialect=DIALECT)) == str(second.compile(dialect=DIALECT))
+    assert first.compile(dialect=DIALECT).params == {"email": "a@example.com"}
+    assert second.compile(dialect=DIALECT).params == {"email": "b@example.com"}
+
+
+def test_get_keeps_shapes_apart() -> None:
+
+    statements = StatementCache(cache=LRUCache(maxsize=2))
+
+    by_email = statements.get(
+        frozenset(["email"]), lambda: select_by("email"), email="a@example.com"
+    )
+    by_both = statements.get(
+        frozenset(["email", "id"]),
+        lambda: select_by("email", "id"),
+        email="a@example.com",
+        id=1,
+    )
+
+    assert statements.cache.misses == 2
+    assert "users.id = " not in str(by_email.compile(dialect=DIALECT))
+    assert "users.id = " in str(by_both.compile(dialect=DIALECT))
+
+
+def test_compile_keeps_result_columns() -> None:
+
+    statement = StatementCache.compile(query=select_by("id"))
+
+    assert [column.name for column in statement.selected_columns] == [
+        column.name for column in USERS.c
+    ]
@@ -0,0 +1,16 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_stats(test_client: AsyncClient) -> None:
+
+    endpoint = "/metrics/stats"
+
+    response = await test_client.get(endpoint)
+    response_data = response.json()
+
+    # Assertions
+    assert response.status_code == 200
+    assert "strava.rate_limit.short_term.usage" in response_data
+    assert "strava.rate_limit.daily.limit" in response_data
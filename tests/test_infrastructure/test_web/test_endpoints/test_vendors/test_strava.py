@@ -7,6 +7,7 @@ import pytest_asyncio
 from databases import Database
 from httpx import AsyncClient
 
+from app.usecases.interfaces.services.webhook_manager import IWebhookManager
 from app.usecases.schemas.challenges import ChallengeJoinPaymentAndUsers
 from app.usecases.schemas.strava import StravaAccessInDb, WebhookVerificationResponse
 from app.usecases.schemas.users import UserInDb
@@ -48,6 +49,7 @@ async def webhook_athlete_event_json() -> Mapping[str, Any]:
 async def test_receive_webhook_challenge_pass(
     test_client: AsyncClient,
     webhook_activity_event_json: Mapping[str, Any],
+    webhook_manager_service: IWebhookManager,
     test_db: Database,
     linked_strava_access_and_challenge: Tuple[
         StravaAccessInDb, ChallengeJoinPaymentAndUsers
@@ -60,6 +62,8 @@ async def test_receive_webhook_challenge_pass(
     # NOTE: The Mocked Strava client conditionally returns distances based on activity ID.
     webhook_activity_event_json["object_id"] = CHALLENGE_PASSING_ACTIVITY_ID
     response = await test_client.post(endpoint, json=webhook_activity_event_json)
+    # Events are queued by the endpoint and validated by webhook workers
+    await webhook_manager_service.process_batch(batch_size=10)
 
     test_challenge = await test_db.fetch_one(
         "SELECT * FROM challenges WHERE id=:id",
@@ -75,6 +79,7 @@ async def test_receive_webhook_challenge_pass(
 async def test_receive_webhook_challenge_fail(
     test_client: AsyncClient,
     webhook_activity_event_json: Mapping[str, Any],
+    webhook_manager_service: IWebhookManager,
     test_db: Database,
     linked_strava_access_and_challenge: Tuple[
         StravaAccessInDb, ChallengeJoinPaymentAndUsers
@@ -87,6 +92,8 @@ async def test_receive_webhook_challenge_fail(
     # NOTE: The Mocked Strava client conditionally returns distances based on activity ID.
     webhook_activity_event_json["object_id"] = CHALLENGE_FAILING_ACTIVITY_ID
     response = await test_client.post(endpoint, json=webhook_activity_event_json)
+    # Events are queued by the endpoint and validated by webhook workers
+    await webhook_manager_service.process_batch(batch_size=10)
 
     test_challenge = await test_db.fetch_one(
         "SELECT * FROM challenges WHERE id=:id",
@@ -102,6 +109,7 @@ async def test_receive_webhook_challenge_fail(
 async def test_receive_webhook_revoked_access(
     test_client: AsyncClient,
     webhook_athlete_event_json: Mapping[str, Any],
+    webhook_manager_service: IWebhookManager,
     test_db: Database,
     linked_strava_access_and_challenge: Tuple[
         StravaAccessInDb, ChallengeJoinPaymentAndUsers
@@ -112,6 +120,7 @@ async def test_receive_webhook_revoked_access(
     endpoint = "/vendors/strava/webhook"
 
     response = await test_client.post(endpoint, json=webhook_athlete_event_json)
+    await webhook_manager_service.process_batch(batch_size=10)
 
     test_saved_strava_access_obj = await test_db.fetch_one(
         "SELECT * FROM strava_access WHERE athlete_id=:athlete_id",
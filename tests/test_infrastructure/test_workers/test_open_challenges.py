@@ -0,0 +1,94 @@
+import asyncio
+from typing import AsyncIterator, Callable
+
+import pytest
+import pytest_asyncio
+
+from app.infrastructure.db.repos.challenges import OpenChallengesIndex
+from app.infrastructure.workers.open_challenges import OpenChallengesListener
+from app.usecases.interfaces.repos.challenges import IChallengesRepo
+from app.usecases.schemas.challenges import CreateChallengeRepoAdapter
+from app.usecases.schemas.ethereum import SignedMessage
+
+
+async def eventually(condition: Callable[[], bool], timeout: float = 5) -> None:
+    """Waits for a notification to be applied."""
+
+    async def wait() -> None:
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(wait(), timeout=timeout)
+
+
+@pytest_asyncio.fixture
+async def open_challenges_listener(
+    test_db_url: str, challenges_repo: IChallengesRepo
+) -> AsyncIterator[OpenChallengesListener]:
+    listener = OpenChallengesListener(
+        db_url=test_db_url,
+        challenges_repo=challenges_repo,
+        open_challenges_index=OpenChallengesIndex(),
+        retry_interval=0.1,
+    )
+    await listener.start()
+    await eventually(lambda: listener.open_challenges_index.ready)
+    yield listener
+    await listener.stop()
+
+
+@pytest.mark.asyncio
+async def test_listener_follows_challenges(
+    open_challenges_listener: OpenChallengesListener,
+    challenges_repo: IChallengesRepo,
+    create_challenge_repo_adapter: CreateChallengeRepoAdapter,
+) -> None:
+
+    index = open_challenges_listener.open_challenges_index
+    challengee = create_challenge_repo_adapter.challengee
+
+    assert challengee not in index
+
+    # Issued through a repo that does not touch this index, as if elsewhere
+    await challenges_repo.create(new_challenge=create_challenge_repo_adapter)
+    await eventually(lambda: challengee in index)
+
+    await challenges_repo.complete_challenge(
+        id=create_challenge_repo_adapter.id,
+        signed_message=SignedMessage(hashed_message="0x01", signature="0x02"),
+    )
+    await eventually(lambda: challengee not in index)
+
+    assert index.ready
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects(
+    open_challenges_listener: OpenChallengesListener,
+    challenges_repo: IChallengesRepo,
+    create_challenge_repo_adapter: CreateChallengeRepoAdapter,
+) -> None:
+
+    index = open_challenges_listener.open_challenges_index
+
+    # Postgres drops the listening connection
+    await challenges_repo.db.execute(
+        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+        "WHERE query LIKE 'LISTEN%'"
+    )
+    await eventually(lambda: not index.ready)
+
+    await challenges_repo.create(new_challenge=create_challenge_repo_adapter)
+    await eventually(lambda: index.ready)
+
+    assert create_challenge_repo_adapter.challengee in index
+
+
+@pytest.mark.asyncio
+async def test_listener_stopped(
+    open_challenges_listener: OpenChallengesListener,
+) -> None:
+
+    await open_challenges_listener.stop()
+
+    assert not open_challenges_listener.open_challenges_index.ready
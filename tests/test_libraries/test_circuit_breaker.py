@@ -0,0 +1,37 @@
+from app.libraries.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def test_circuit_breaker_opens() -> None:
+
+    breaker = CircuitBreaker(
+        error_rate=0.5, window=4, minimum_calls=4, reset_timeout=60
+    )
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.opened == 1
+    assert breaker.rejected == 1
+
+
+def test_circuit_breaker_half_open() -> None:
+
+    breaker = CircuitBreaker(error_rate=0.5, window=2, minimum_calls=1, reset_timeout=0)
+
+    breaker.record_failure()
+
+    # The reset timeout elapsed, so a probe is let through
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.opened == 2
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
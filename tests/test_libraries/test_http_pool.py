@@ -0,0 +1,46 @@
+import ssl
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.libraries.http_pool import create_client_session
+from app.libraries.metrics import MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_client_session_instrumentation() -> None:
+    async def respond(request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/", respond)
+    server = TestServer(app)
+    await server.start_server()
+
+    metrics = MetricsRegistry()
+    client_session = create_client_session(
+        name="test",
+        limit=1,
+        limit_per_host=1,
+        keepalive_timeout=30,
+        dns_cache_ttl=300,
+        timeout=5,
+        ssl_context=ssl.create_default_context(),
+        metrics=metrics,
+    )
+
+    async with client_session:
+        for _ in range(3):
+            async with client_session.get(server.make_url("/")) as response:
+                await response.json()
+
+    await server.close()
+    snapshot = metrics.snapshot()
+
+    # One connection is opened and then kept alive for the other requests
+    assert snapshot["http.test.connections.created"] == 1
+    assert snapshot["http.test.connections.reused"] == 2
+    assert snapshot["http.test.connections.reuse_ratio"] == pytest.approx(2 / 3)
+    assert snapshot["http.test.in_flight"] == 0
+    assert snapshot["http.test.saturation"] == 0
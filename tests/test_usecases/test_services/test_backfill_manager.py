@@ -0,0 +1,77 @@
+from typing import Tuple
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.usecases.interfaces.repos.challenges import IChallengesRepo
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.services.backfill_manager import IBackfillManager
+from app.usecases.schemas.challenges import ChallengeJoinPaymentAndUsers
+from app.usecases.schemas.strava import StravaAccessInDb, StravaRateLimitException
+from app.usecases.services.backfill_manager import CHECKPOINT
+
+
+@pytest.mark.asyncio
+async def test_run(
+    backfill_manager_service: IBackfillManager,
+    linked_strava_access_and_challenge: Tuple[
+        StravaAccessInDb, ChallengeJoinPaymentAndUsers
+    ],
+    challenges_repo: IChallengesRepo,
+    checkpoints_repo: ICheckpointsRepo,
+) -> None:
+
+    report = await backfill_manager_service.run()
+
+    test_challenge = await challenges_repo.retrieve(
+        id=linked_strava_access_and_challenge[1].id
+    )
+
+    assert report.finished
+    assert report.athletes == 1
+    assert report.completed_challenges == 1
+    assert test_challenge.complete
+    # A finished run starts over next time
+    assert await checkpoints_repo.retrieve(name=CHECKPOINT) is None
+
+
+@pytest.mark.asyncio
+async def test_run_resumes_from_checkpoint(
+    backfill_manager_service: IBackfillManager,
+    linked_strava_access_and_challenge: Tuple[
+        StravaAccessInDb, ChallengeJoinPaymentAndUsers
+    ],
+    checkpoints_repo: ICheckpointsRepo,
+) -> None:
+
+    await checkpoints_repo.save(
+        name=CHECKPOINT, position=linked_strava_access_and_challenge[0].athlete_id
+    )
+
+    assert (await backfill_manager_service.run()).athletes == 0
+    assert (await backfill_manager_service.run(restart=True)).athletes == 1
+
+
+@pytest.mark.asyncio
+async def test_run_stops_when_rate_limited(
+    backfill_manager_service: IBackfillManager,
+    linked_strava_access_and_challenge: Tuple[
+        StravaAccessInDb, ChallengeJoinPaymentAndUsers
+    ],
+    challenges_repo: IChallengesRepo,
+    checkpoints_repo: ICheckpointsRepo,
+) -> None:
+
+    with patch.object(
+        backfill_manager_service.challenge_validation,
+        "revalidate",
+        AsyncMock(side_effect=StravaRateLimitException("Rate limit exceeded")),
+    ):
+        report = await backfill_manager_service.run()
+
+    assert not report.finished
+    assert not report.failed_athletes
+    assert await checkpoints_repo.retrieve(name=CHECKPOINT) is None
+
+    # The next run picks the athlete up again
+    assert (await backfill_manager_service.run()).completed_challenges == 1
@@ -0,0 +1,100 @@
+import pytest
+from databases import Database
+
+from app.infrastructure.db.repos.checkpoints import CheckpointsRepo
+from app.usecases.interfaces.clients.ethereum import IEthereumClient
+from app.usecases.interfaces.repos.checkpoints import ICheckpointsRepo
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
+from app.usecases.interfaces.services.challenge_indexer import IChallengeIndexer
+from app.usecases.services.challenge_indexer import CHECKPOINT
+from tests.constants import TEST_CHALLENGE_ID, TEST_CHALLENGE_ID_NOT_FOUND
+from tests.mocks.mock_ethereum_client import indexed_challenge
+
+UNFINAL_CHALLENGE_ID = "4fbf9ee4-5aba-4b79-a62c-7f5ec1a4ecd1"
+
+
+@pytest.mark.asyncio
+async def test_index(
+    challenge_indexer_service: IChallengeIndexer,
+    ethereum_client: IEthereumClient,
+    onchain_challenges_repo: IOnchainChallengesRepo,
+    checkpoints_repo: ICheckpointsRepo,
+) -> None:
+
+    ethereum_client.events = {TEST_CHALLENGE_ID: 10, UNFINAL_CHALLENGE_ID: 95}
+
+    indexed = await challenge_indexer_service.index()
+
+    final_challenge = await onchain_challenges_repo.retrieve(
+        challenge_id=TEST_CHALLENGE_ID
+    )
+    unfinal_challenge = await onchain_challenges_repo.retrieve(
+        challenge_id=UNFINAL_CHALLENGE_ID
+    )
+
+    assert indexed == 2
+    assert final_challenge.complete and final_challenge.block_number == 10
+    assert not unfinal_challenge.complete and unfinal_challenge.block_number == 95
+    # Head is at 100 and blocks are final 10 blocks deep
+    assert await checkpoints_repo.retrieve(name=CHECKPOINT) == 90
+
+
+@pytest.mark.asyncio
+async def test_index_follows_head(
+    challenge_indexer_service: IChallengeIndexer,
+    ethereum_client: IEthereumClient,
+    checkpoints_repo: ICheckpointsRepo,
+) -> None:
+
+    await challenge_indexer_service.index()
+    ethereum_client.head = 104
+    ethereum_client.events = {UNFINAL_CHALLENGE_ID: 102}
+
+    # Only blocks from the checkpoint on are read again
+    assert await challenge_indexer_service.index() == 1
+    assert await checkpoints_repo.retrieve(name=CHECKPOINT) == 94
+
+
+@pytest.mark.asyncio
+async def test_index_drops_reorged_challenges(
+    challenge_indexer_service: IChallengeIndexer,
+    ethereum_client: IEthereumClient,
+    onchain_challenges_repo: IOnchainChallengesRepo,
+    checkpoints_repo: ICheckpointsRepo,
+) -> None:
+
+    # Indexed from a block that has since been reorged out of the chain
+    await checkpoints_repo.save(name=CHECKPOINT, position=90)
+    await onchain_challenges_repo.upsert_many(
+        challenges=[
+            indexed_challenge(challenge_id=TEST_CHALLENGE_ID_NOT_FOUND, block_number=95)
+        ]
+    )
+    ethereum_client.events = {}
+
+    await challenge_indexer_service.index()
+
+    assert (
+        await onchain_challenges_repo.retrieve(challenge_id=TEST_CHALLENGE_ID_NOT_FOUND)
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_index_locked(
+    challenge_indexer_service: IChallengeIndexer,
+    checkpoints_repo: ICheckpointsRepo,
+    test_db_url: str,
+) -> None:
+
+    other_process_db = Database(url=test_db_url)
+    await other_process_db.connect()
+
+    try:
+        # Another process is indexing
+        async with CheckpointsRepo(db=other_process_db).lock(name=CHECKPOINT):
+            assert await challenge_indexer_service.index() == 0
+    finally:
+        await other_process_db.disconnect()
+
+    assert await checkpoints_repo.retrieve(name=CHECKPOINT) is None
@@ -1,18 +1,23 @@
+import asyncio
 import uuid
+from unittest.mock import AsyncMock, patch
 
 import pytest
 import pytest_asyncio
 from databases import Database
 
+from app.usecases.interfaces.repos.onchain_challenges import IOnchainChallengesRepo
 from app.usecases.interfaces.services.challange_manager import IChallengeManager
 from app.usecases.schemas.challenges import (
     BountyVerification,
+    ChallengeException,
     ChallengeJoinPaymentAndUsers,
     ChallengeNotFound,
     ChallengeUnauthorizedAction,
+    IndexedChallenge,
     IssueChallengeBody,
 )
-from tests.constants import TEST_CHALLENGE_ID_NOT_FOUND
+from tests.constants import CHALLENGER_ADDRESS, TEST_CHALLENGE_ID_NOT_FOUND
 
 
 @pytest_asyncio.fixture
@@ -50,6 +55,55 @@ async def test_handle_challenge_issuance(
     # TODO: test explicit values once converstion is decided upon
 
 
+@pytest.mark.asyncio
+async def test_handle_challenge_issuance_duplicate(
+    challenge_manager_service: IChallengeManager,
+    issue_challenge_body: IssueChallengeBody,
+    test_db: Database,
+) -> None:
+
+    results = await asyncio.gather(
+        *(
+            challenge_manager_service.handle_challenge_issuance(
+                payload=issue_challenge_body
+            )
+            for _ in range(2)
+        ),
+        return_exceptions=True,
+    )
+
+    # Exactly one of two concurrent issuances is persisted
+    assert None in results
+    assert any(isinstance(result, ChallengeException) for result in results)
+    assert (
+        await test_db.fetch_val(
+            "SELECT count(*) FROM payments WHERE challenge_id=:id",
+            {"id": issue_challenge_body.challenge_id},
+        )
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_users_concurrently(
+    challenge_manager_service: IChallengeManager,
+    issue_challenge_body: IssueChallengeBody,
+) -> None:
+
+    participants = await asyncio.gather(
+        *(
+            challenge_manager_service.handle_users(
+                payload=issue_challenge_body, challenger_address=CHALLENGER_ADDRESS
+            )
+            for _ in range(2)
+        )
+    )
+
+    assert participants[0] == participants[1]
+    assert participants[0].challenger.email == issue_challenge_body.challenger_email
+    assert participants[0].challengee.email == issue_challenge_body.challengee_email
+
+
 @pytest.mark.asyncio
 async def test_claim_bounty(
     challenge_manager_service: IChallengeManager,
@@ -96,6 +150,65 @@ async def test_claim_bounty(
     assert verified_bounties[0].challenge.id == inserted_challenge_object.id
 
 
+@pytest.mark.asyncio
+async def test_claim_bounty_joins_challenger(
+    challenge_manager_service: IChallengeManager,
+    inserted_challenge_object: ChallengeJoinPaymentAndUsers,
+    test_db: Database,
+) -> None:
+
+    await test_db.execute(
+        "UPDATE challenges SET complete = True WHERE id=:id",
+        {"id": inserted_challenge_object.id},
+    )
+
+    with patch.object(
+        challenge_manager_service.users_repo, "retrieve"
+    ) as retrieve_user:
+        verified_bounties = await challenge_manager_service.claim_bounty(
+            address=inserted_challenge_object.challengee_address
+        )
+
+    retrieve_user.assert_not_called()
+    assert verified_bounties[0].challenge.challenger_address == (
+        inserted_challenge_object.challenger_address
+    )
+
+
+@pytest.mark.asyncio
+async def test_sign_completed_challenges(
+    challenge_manager_service: IChallengeManager,
+    inserted_challenge_object: ChallengeJoinPaymentAndUsers,
+    test_db: Database,
+) -> None:
+
+    await test_db.execute(
+        "UPDATE challenges SET complete = True WHERE id=:id",
+        {"id": inserted_challenge_object.id},
+    )
+
+    assert await challenge_manager_service.sign_completed_challenges(batch_size=1) == 1
+    assert await challenge_manager_service.sign_completed_challenges(batch_size=1) == 0
+
+    # Claiming is a read once signatures are stored
+    with patch.object(
+        challenge_manager_service.signature_manager, "sign_many"
+    ) as sign_many:
+        verified_bounties = await challenge_manager_service.claim_bounty(
+            address=inserted_challenge_object.challengee_address
+        )
+
+    sign_many.assert_not_called()
+    assert (
+        verified_bounties[0].signature
+        == (
+            await challenge_manager_service.signature_manager.sign(
+                challenge_id=inserted_challenge_object.id
+            )
+        ).signature
+    )
+
+
 @pytest.mark.asyncio
 async def test_handle_bounty_payment(
     challenge_manager_service: IChallengeManager,
@@ -115,6 +228,68 @@ async def test_handle_bounty_payment(
     assert payment["complete"]
 
 
+@pytest.mark.asyncio
+async def test_handle_bounty_payment_awaits_confirmation(
+    challenge_manager_service: IChallengeManager,
+    inserted_challenge_for_payment_test: ChallengeJoinPaymentAndUsers,
+    test_db: Database,
+) -> None:
+
+    ethereum_client = challenge_manager_service.ethereum_client
+    confirmed = await ethereum_client.get_challenge(
+        challenge_id=inserted_challenge_for_payment_test.id
+    )
+    pending = confirmed.copy(update={"complete": False})
+
+    # The payment transaction is mined after the second read
+    with patch.object(
+        ethereum_client,
+        "get_challenge",
+        AsyncMock(side_effect=[pending, pending, confirmed]),
+    ) as get_challenge:
+        await challenge_manager_service.handle_bounty_payment(
+            challenge_id=inserted_challenge_for_payment_test.id
+        )
+
+    payment = await test_db.fetch_one(
+        "SELECT * FROM payments WHERE payments.challenge_id = :challenge_id",
+        {"challenge_id": inserted_challenge_for_payment_test.id},
+    )
+
+    assert get_challenge.call_count == 3
+    assert payment["complete"]
+
+
+@pytest.mark.asyncio
+async def test_handle_bounty_payment_indexed(
+    challenge_manager_service: IChallengeManager,
+    inserted_challenge_for_payment_test: ChallengeJoinPaymentAndUsers,
+    onchain_challenges_repo: IOnchainChallengesRepo,
+    test_db: Database,
+) -> None:
+
+    ethereum_client = challenge_manager_service.ethereum_client
+    confirmed = await ethereum_client.get_challenge(
+        challenge_id=inserted_challenge_for_payment_test.id
+    )
+    await onchain_challenges_repo.upsert_many(
+        challenges=[IndexedChallenge(**confirmed.dict(), block_number=1)]
+    )
+
+    with patch.object(ethereum_client, "get_challenge") as get_challenge:
+        await challenge_manager_service.handle_bounty_payment(
+            challenge_id=inserted_challenge_for_payment_test.id
+        )
+
+    payment = await test_db.fetch_one(
+        "SELECT * FROM payments WHERE payments.challenge_id = :challenge_id",
+        {"challenge_id": inserted_challenge_for_payment_test.id},
+    )
+
+    get_challenge.assert_not_called()
+    assert payment["complete"]
+
+
 @pytest.mark.asyncio
 async def test_handle_bounty_payment_unauthorized(
     challenge_manager_service: IChallengeManager,
@@ -135,6 +310,23 @@ async def test_handle_bounty_payment_unauthorized(
     assert not payment["complete"]
 
 
+@pytest.mark.asyncio
+async def test_handle_bounty_payment_unauthorized_fails_fast(
+    challenge_manager_service: IChallengeManager,
+    inserted_challenge_object: ChallengeJoinPaymentAndUsers,
+) -> None:
+
+    # Only issuance waits the full confirmation timeout
+    with patch.object(challenge_manager_service, "confirmation_timeout", 60):
+        with pytest.raises(ChallengeUnauthorizedAction):
+            await asyncio.wait_for(
+                challenge_manager_service.handle_bounty_payment(
+                    challenge_id=inserted_challenge_object.id
+                ),
+                timeout=5,
+            )
+
+
 @pytest.mark.asyncio
 async def test_handle_bounty_payment_not_found(
     challenge_manager_service: IChallengeManager,
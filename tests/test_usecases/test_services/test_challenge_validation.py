@@ -1,8 +1,10 @@
 from typing import List, Tuple
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
 
+from app.usecases.interfaces.clients.strava import IStravaClient
 from app.usecases.interfaces.repos.challenges import IChallengesRepo
 from app.usecases.interfaces.services.challange_validation import IChallengeValidation
 from app.usecases.schemas.challenges import ChallengeJoinPaymentAndUsers
@@ -51,6 +53,7 @@ async def test_validate_pass(
     )
 
     assert test_challenge.complete
+    assert test_challenge.signature
 
 
 @pytest.mark.asyncio
@@ -75,3 +78,70 @@ async def test_validate_fail(
     )
 
     assert not test_challenge.complete
+
+
+@pytest.mark.asyncio
+async def test_validate_no_open_challenges(
+    challenge_validation_service: IChallengeValidation,
+    inserted_strava_access_object: StravaAccessInDb,
+    test_webhook_activity: WebhookEvent,
+    strava_client: IStravaClient,
+) -> None:
+    """Test Case 3: Athlete without open challenges is never looked up on Strava."""
+
+    with patch.object(
+        strava_client, "get_activity", wraps=strava_client.get_activity
+    ) as get_activity:
+        await challenge_validation_service.validate(event=test_webhook_activity)
+
+    get_activity.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_validate_cached_activity(
+    challenge_validation_service: IChallengeValidation,
+    linked_strava_access_and_challenge: Tuple[
+        StravaAccessInDb, ChallengeJoinPaymentAndUsers
+    ],
+    test_webhook_activity: WebhookEvent,
+    strava_client: IStravaClient,
+) -> None:
+    """Test Case 4: Revalidating an activity is served from the activity cache."""
+
+    test_webhook_activity.object_id = CHALLENGE_FAILING_ACTIVITY_ID
+
+    with patch.object(
+        strava_client, "get_activity", wraps=strava_client.get_activity
+    ) as get_activity:
+        await challenge_validation_service.validate(event=test_webhook_activity)
+        await challenge_validation_service.validate(event=test_webhook_activity)
+
+    get_activity.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_revalidate(
+    challenge_validation_service: IChallengeValidation,
+    linked_strava_access_and_challenge: Tuple[
+        StravaAccessInDb, ChallengeJoinPaymentAndUsers
+    ],
+    challenges_repo: IChallengesRepo,
+) -> None:
+    """Test Case 5: A page of activities completes the challenge once."""
+
+    strava_access, challenge = linked_strava_access_and_challenge
+
+    completed = await challenge_validation_service.revalidate(
+        athlete_access=strava_access, per_page=10
+    )
+
+    test_challenge = await challenges_repo.retrieve(id=challenge.id)
+
+    assert completed == 1
+    assert test_challenge.complete
+    assert (
+        await challenge_validation_service.revalidate(
+            athlete_access=strava_access, per_page=10
+        )
+        == 0
+    )
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 import pytest
 from web3.auto import w3
@@ -6,6 +7,7 @@ from web3.auto import w3
 from app.usecases.interfaces.services.signature_manager import ISignatureManager
 from app.usecases.schemas.challenges import ChallengeJoinPaymentAndUsers
 from app.usecases.schemas.ethereum import SignedMessage
+from app.usecases.services.signature_manager import SignatureManager
 
 
 @pytest.mark.asyncio
@@ -26,3 +28,19 @@ async def test_sign(
     # Assertions
     assert isinstance(signed_message, SignedMessage)
     assert signer_address == confirmed_signer_address
+
+
+@pytest.mark.asyncio
+async def test_sign_many(signature_manager_service: ISignatureManager) -> None:
+
+    challenge_ids = [f"challenge-{number}" for number in range(5)]
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        signed_messages = await SignatureManager(
+            executor=executor, chunk_size=2
+        ).sign_many(challenge_ids=challenge_ids)
+
+    assert signed_messages == [
+        await signature_manager_service.sign(challenge_id=challenge_id)
+        for challenge_id in challenge_ids
+    ]
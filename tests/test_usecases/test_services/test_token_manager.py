@@ -0,0 +1,93 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from databases import Database
+
+from app.infrastructure.db.repos.checkpoints import CheckpointsRepo
+from app.usecases.interfaces.clients.strava import IStravaClient
+from app.usecases.interfaces.services.token_manager import ITokenManager
+from app.usecases.schemas.strava import StravaAccessInDb
+from app.usecases.services.token_manager import REFRESH_LOCK
+
+
+@pytest.mark.asyncio
+async def test_obtain_coalesces_refreshes(
+    token_manager_service: ITokenManager,
+    inserted_strava_access_object: StravaAccessInDb,
+    strava_client: IStravaClient,
+) -> None:
+    """A burst of callers holding the same stale access object refreshes once."""
+
+    with patch.object(
+        strava_client, "refresh_token", wraps=strava_client.refresh_token
+    ) as refresh_token:
+        access_objects = await asyncio.gather(
+            *(
+                token_manager_service.obtain(
+                    current_access=inserted_strava_access_object
+                )
+                for _ in range(5)
+            )
+        )
+
+    refresh_token.assert_called_once()
+    for access in access_objects:
+        assert access.access_token != inserted_strava_access_object.access_token
+
+
+@pytest.mark.asyncio
+async def test_obtain_fresh_access(
+    token_manager_service: ITokenManager,
+    inserted_strava_access_object: StravaAccessInDb,
+    strava_client: IStravaClient,
+) -> None:
+
+    fresh_access = inserted_strava_access_object.copy()
+    fresh_access.expires_at = 4102444800  # 2100-01-01
+
+    with patch.object(strava_client, "refresh_token") as refresh_token:
+        access = await token_manager_service.obtain(current_access=fresh_access)
+
+    refresh_token.assert_not_called()
+    assert access == fresh_access
+
+
+@pytest.mark.asyncio
+async def test_refresh_expiring(
+    token_manager_service: ITokenManager,
+    inserted_strava_access_object: StravaAccessInDb,
+    strava_client: IStravaClient,
+) -> None:
+
+    with patch.object(
+        strava_client, "refresh_token", wraps=strava_client.refresh_token
+    ) as refresh_token:
+        refreshed = await token_manager_service.refresh_expiring()
+
+    assert refreshed == 1
+    refresh_token.assert_called_once_with(
+        refresh_token=inserted_strava_access_object.refresh_token
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_expiring_locked(
+    token_manager_service: ITokenManager,
+    inserted_strava_access_object: StravaAccessInDb,
+    strava_client: IStravaClient,
+    test_db_url: str,
+) -> None:
+
+    other_process_db = Database(url=test_db_url)
+    await other_process_db.connect()
+
+    try:
+        # Another process is refreshing
+        with patch.object(strava_client, "refresh_token") as refresh_token:
+            async with CheckpointsRepo(db=other_process_db).lock(name=REFRESH_LOCK):
+                assert await token_manager_service.refresh_expiring() == 0
+    finally:
+        await other_process_db.disconnect()
+
+    refresh_token.assert_not_called()
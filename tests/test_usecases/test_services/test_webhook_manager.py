@@ -0,0 +1,154 @@
+from typing import Tuple
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from databases import Database
+
+from app.usecases.interfaces.repos.challenges import IChallengesRepo
+from app.usecases.interfaces.services.webhook_manager import IWebhookManager
+from app.usecases.schemas.challenges import ChallengeJoinPaymentAndUsers
+from app.usecases.schemas.strava import (
+    StravaAccessInDb,
+    StravaUnavailableException,
+    WebhookEvent,
+    WebhookEventStatus,
+)
+from tests.constants import CHALLENGE_PASSING_ACTIVITY_ID, TEST_ATHLETE_ID
+
+
+@pytest_asyncio.fixture
+async def test_webhook_activity() -> WebhookEvent:
+    test_webhook_json = {
+        "aspect_type": "create",
+        "event_time": 1655410924,
+        "object_id": CHALLENGE_PASSING_ACTIVITY_ID,
+        "object_type": "activity",
+        "owner_id": TEST_ATHLETE_ID,
+        "subscription_id": 218213,
+        "updates": {},
+    }
+
+    return WebhookEvent(**test_webhook_json)
+
+
+@pytest.mark.asyncio
+async def test_enqueue(
+    webhook_manager_service: IWebhookManager,
+    test_webhook_activity: WebhookEvent,
+    test_db: Database,
+) -> None:
+
+    await webhook_manager_service.enqueue(event=test_webhook_activity)
+
+    queued_event = await test_db.fetch_one("SELECT * FROM webhook_events")
+
+    assert queued_event["status"] == WebhookEventStatus.PENDING
+    assert queued_event["object_id"] == test_webhook_activity.object_id
+
+
+@pytest.mark.asyncio
+async def test_enqueue_redelivered(
+    webhook_manager_service: IWebhookManager,
+    test_webhook_activity: WebhookEvent,
+    test_db: Database,
+) -> None:
+
+    await webhook_manager_service.enqueue(event=test_webhook_activity)
+    await webhook_manager_service.enqueue(event=test_webhook_activity)
+
+    # The in-process cache is bypassed, so the database constraint drops the event
+    webhook_manager_service.received_events.clear()
+    await webhook_manager_service.enqueue(event=test_webhook_activity)
+
+    queued_events = await test_db.fetch_all("SELECT * FROM webhook_events")
+
+    assert len(queued_events) == 1
+
+
+@pytest.mark.asyncio
+async def test_handle_activity_update(
+    webhook_manager_service: IWebhookManager,
+    test_webhook_activity: WebhookEvent,
+) -> None:
+
+    key = (test_webhook_activity.owner_id, test_webhook_activity.object_id)
+    webhook_manager_service.activity_cache.set(key, "cached activity summary")
+
+    test_webhook_activity.aspect_type = "update"
+    test_webhook_activity.updates = {"title": "Morning Run"}
+    await webhook_manager_service.handle(event=test_webhook_activity)
+
+    assert webhook_manager_service.activity_cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_process_batch(
+    webhook_manager_service: IWebhookManager,
+    linked_strava_access_and_challenge: Tuple[
+        StravaAccessInDb, ChallengeJoinPaymentAndUsers
+    ],
+    test_webhook_activity: WebhookEvent,
+    challenges_repo: IChallengesRepo,
+    test_db: Database,
+) -> None:
+
+    await webhook_manager_service.enqueue(event=test_webhook_activity)
+
+    claimed = await webhook_manager_service.process_batch(batch_size=10)
+
+    test_challenge = await challenges_repo.retrieve(
+        id=linked_strava_access_and_challenge[1].id
+    )
+    processed_event = await test_db.fetch_one("SELECT * FROM webhook_events")
+
+    assert claimed == 1
+    assert test_challenge.complete
+    assert processed_event["status"] == WebhookEventStatus.COMPLETE
+    assert await webhook_manager_service.process_batch(batch_size=10) == 0
+
+
+@pytest.mark.asyncio
+async def test_process_batch_failure(
+    webhook_manager_service: IWebhookManager,
+    test_webhook_activity: WebhookEvent,
+    test_db: Database,
+) -> None:
+    """Validation fails without a Strava access object, so the event is retried
+    until its attempts are exhausted."""
+
+    await webhook_manager_service.enqueue(event=test_webhook_activity)
+
+    for _ in range(webhook_manager_service.max_attempts):
+        assert await webhook_manager_service.process_batch(batch_size=10) == 1
+
+    failed_event = await test_db.fetch_one("SELECT * FROM webhook_events")
+
+    assert failed_event["status"] == WebhookEventStatus.FAILED
+    assert failed_event["last_error"]
+    assert await webhook_manager_service.process_batch(batch_size=10) == 0
+
+
+@pytest.mark.asyncio
+async def test_process_batch_strava_unavailable(
+    webhook_manager_service: IWebhookManager,
+    test_webhook_activity: WebhookEvent,
+    test_db: Database,
+) -> None:
+    """Events are deferred without using up attempts while Strava is down."""
+
+    await webhook_manager_service.enqueue(event=test_webhook_activity)
+
+    with patch.object(
+        webhook_manager_service.challenge_validation,
+        "validate",
+        AsyncMock(side_effect=StravaUnavailableException("Circuit breaker is open.")),
+    ):
+        for _ in range(webhook_manager_service.max_attempts + 1):
+            await webhook_manager_service.process_batch(batch_size=10)
+
+    deferred_event = await test_db.fetch_one("SELECT * FROM webhook_events")
+
+    assert deferred_event["status"] == WebhookEventStatus.PENDING
+    assert deferred_event["attempts"] == 0
+    assert deferred_event["last_error"] == "Circuit breaker is open."